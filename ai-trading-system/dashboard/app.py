@@ -39,6 +39,7 @@ import plotly.express as px
 import pytz
 
 from src.backtesting.backtester import run_backtest_mtm
+from src.execution.trading_engine import load_equity_records
 from src.monitoring.structured_logger import get_logger
 from dashboard.trade_feed import TradeFeedViewer, render_trade_feed_sidebar
 
@@ -78,6 +79,32 @@ def load_jsonl(path: Path) -> List[Dict[str, Any]]:
     return records
 
 
+_EQUITY_UPDATE_TYPES = {0: "INIT", 1: "TICK", 2: "TRADE"}
+
+
+def load_live_equity_frame(jsonl_path: Path) -> pd.DataFrame:
+    """Live equity snapshots indexed by timestamp.
+
+    Reads the engine's binary sidecar (same name, `.bin`) when present: it
+    holds every update, while the JSONL log keeps only every Nth TICK.
+    Falls back to the JSONL log.
+    """
+    records = load_equity_records(jsonl_path.with_suffix(".bin"))
+    if len(records):
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime(records["ts_ns"], unit="ns", utc=True),
+            "portfolio_value": records["pv"],
+            "update_type": [_EQUITY_UPDATE_TYPES.get(c, "UNKNOWN") for c in records["code"].tolist()],
+        })
+    else:
+        rows = load_jsonl(jsonl_path) if jsonl_path.exists() else []
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows)
+        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    return df.set_index("timestamp")
+
+
 def fetch_yahoo_finance_data(symbol: str = "SPY", days: int = 60) -> pd.DataFrame:
     """Fetch accurate real-time market data from Yahoo Finance.
     Filters to regular market hours and renames columns.
@@ -857,13 +884,6 @@ with tab3:
 
     live_trading_equity_path = Path(live_trading_equity_log)
 
-    # Load live trading data without caching for real-time updates
-    def load_live_trading_data():
-        """Load live trading equity log with real-time updates."""
-        if live_trading_equity_path.exists():
-            return load_jsonl(live_trading_equity_path)
-        return []
-    
     def load_live_trading_trades():
         """Load executed trades with real-time updates."""
         trades_path = Path("data/live_trading_trades.jsonl")
@@ -871,14 +891,11 @@ with tab3:
             return load_jsonl(trades_path)
         return []
     
-    live_equity_records = load_live_trading_data()
+    # Load live trading data without caching for real-time updates
+    lt_df = load_live_equity_frame(live_trading_equity_path)
     live_trades = load_live_trading_trades()
     
-    if live_equity_records:
-        lt_df = pd.DataFrame(live_equity_records)
-        lt_df["timestamp"] = pd.to_datetime(lt_df["timestamp"], errors="coerce")
-        lt_df = lt_df.set_index("timestamp")
-        
+    if not lt_df.empty:
         # Calculate metrics
         initial_pv = lt_df["portfolio_value"].iloc[0]
         current_pv = lt_df["portfolio_value"].iloc[-1]
@@ -966,7 +983,7 @@ with tab3:
             st.caption(f"Total trades executed: {len(live_trades)}")
         
         # Update frequency indicator
-        st.info(f"🔄 Auto-refreshing | {len(live_equity_records)} snapshots | Last: {latest_update.get('update_type', 'TICK')}")
+        st.info(f"🔄 Auto-refreshing | {len(lt_df)} snapshots | Last: {latest_update.get('update_type', 'TICK')}")
     
     else:
         st.warning("⚠️ Live trading not started or no data yet.")
@@ -1034,14 +1051,11 @@ with tab4:
     st.markdown("### 📋 Backtest vs Live Trading Comparison")
     
     # Load live trading data for comparison
-    live_trading_equity_path = Path("data/live_trading_equity.jsonl")
-    live_equity_records = load_jsonl(live_trading_equity_path) if live_trading_equity_path.exists() else []
+    lt_df = load_live_equity_frame(Path("data/live_trading_equity.jsonl"))
     live_trades_path = Path("data/live_trading_trades.jsonl")
     live_trades = load_jsonl(live_trades_path) if live_trades_path.exists() else []
     
-    if "bt" in locals() and bt and live_equity_records:
-        lt_df = pd.DataFrame(live_equity_records)
-        lt_df["timestamp"] = pd.to_datetime(lt_df["timestamp"], errors="coerce")
+    if "bt" in locals() and bt and not lt_df.empty:
         initial_pv = lt_df["portfolio_value"].iloc[0]
         current_pv = lt_df["portfolio_value"].iloc[-1]
         live_pnl = current_pv - initial_pv
@@ -1069,7 +1083,7 @@ with tab4:
             st.metric("Live Trades", len(live_trades))
             diff_reason = "Slippage/fills" if diff < 0 else "Better execution"
             st.metric("Reason", diff_reason)
-    elif live_equity_records:
+    elif not lt_df.empty:
         st.info("💡 Run backtest first to see comparison. Live trading data is available.")
     elif "bt" in locals() and bt:
         st.info("💡 Live trading not started yet. Once running, comparison will appear here.")
@@ -1189,7 +1203,7 @@ with st.expander("📊 View Detailed Trade Feed", expanded=False):
                 st.dataframe(df, use_container_width=True, height=400)
 
 # Auto-refresh the dashboard every 2 seconds when live trading is active
-if live_equity_records:
+if not lt_df.empty:
     import time
     time.sleep(2)
     st.rerun()
@@ -4,18 +4,44 @@ Provides a minimal immutable JSONL trade logger used by backtests and live
 simulations. Each `log_trade` call appends a single JSON line to a run
 specific file. Files are created under `logs/` and named with the
 `run_id` (timestamp) to keep logs immutable per run.
+
+Records may carry an integer `timestamp_ns` (epoch nanoseconds) instead of
+a formatted `timestamp`; it is rendered as a UTC ISO-8601 `timestamp`
+only when the line is written.
 """
 
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
 def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def _format_record(trade: Dict) -> Dict:
+    """Replace a `timestamp_ns` field with its ISO-8601 `timestamp`."""
+    if "timestamp_ns" not in trade:
+        return trade
+    out = {"timestamp": (_EPOCH + timedelta(microseconds=trade["timestamp_ns"] // 1000)).isoformat()}
+    out.update(trade)
+    del out["timestamp_ns"]
+    return out
+
+
+def resolve_log_path(run_id: Optional[str] = None, path: Optional[str] = None) -> str:
+    """Return the file `log_trade` writes to for `run_id` / `path`."""
+    if path is not None:
+        return path
+    if run_id is None:
+        run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
+    return os.path.join("logs", f"trades-{run_id}.jsonl")
+
+
 def log_trade(
     trade: Dict, run_id: Optional[str] = None, path: Optional[str] = None
 ) -> str:
@@ -23,12 +49,9 @@ def log_trade(
 
     Returns the path written to.
     """
-    if run_id is None:
-        run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
-    if path is None:
-        path = os.path.join("logs", f"trades-{run_id}.jsonl")
+    path = resolve_log_path(run_id, path)
     _ensure_dir(os.path.dirname(path) or ".")
-    line = json.dumps(trade, default=str, separators=(",", ":"))
+    line = json.dumps(_format_record(trade), default=str, separators=(",", ":"))
     # Open in append mode and flush+fsync for durability in backtests/live
     with open(path, "a", encoding="utf-8") as fh:
         fh.write(line + "\n")
@@ -51,4 +74,4 @@ def read_trades(path: str):
             yield json.loads(line)
 
 
-__all__ = ["log_trade", "read_trades"]
+__all__ = ["log_trade", "read_trades", "resolve_log_path"]
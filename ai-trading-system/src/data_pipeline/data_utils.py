@@ -3,13 +3,44 @@ Helper utilities for the data pipeline.
 
 Lightweight, dependency-free helpers for validating simple record sets
 (list of dicts) used by the pipeline. These are intentionally minimal
-so unit tests do not require pandas; they can be extended later to
-accept `pandas.DataFrame` inputs.
+so unit tests do not require pandas.
+
+Each helper also accepts columnar batches: a NumPy structured array (one
+named field per column, e.g. the OHLCV arrays produced by
+`MarketFetcher`) or a `pandas.DataFrame`. Those are detected by duck
+typing so this module stays import-free, and are checked with
+whole-column operations instead of per-record loops.
 """
 
 from typing import Iterable, Dict, List, Tuple
 
 
+def _is_frame(records) -> bool:
+    return hasattr(records, "columns") and hasattr(records, "to_dict")
+
+
+def is_columnar(records) -> bool:
+    """Return True if `records` is a DataFrame or a structured array."""
+    if _is_frame(records):
+        return True
+    dtype = getattr(records, "dtype", None)
+    return dtype is not None and bool(dtype.names)
+
+
+def to_dicts(records) -> List[Dict]:
+    """Materialize a columnar batch as a list of plain-Python dicts.
+
+    This is the serialization boundary for columnar batches; list inputs
+    are returned as-is.
+    """
+    if _is_frame(records):
+        return records.to_dict(orient="records")
+    if not is_columnar(records):
+        return list(records)
+    names = records.dtype.names
+    return [dict(zip(names, row)) for row in records.tolist()]
+
+
 def validate_schema(
     records: Iterable[dict],
     required_fields: Iterable[str],
@@ -19,6 +50,13 @@ def validate_schema(
     Returns (all_ok, missing_field_list).
     """
     required = set(required_fields)
+    if _is_frame(records):
+        missing = required - set(records.columns)
+        return len(records) > 0 and not missing, sorted(missing)
+    if is_columnar(records):
+        missing = required - set(records.dtype.names)
+        return len(records) > 0 and not missing, sorted(missing)
+
     missing = set()
     count = 0
     for r in records:
@@ -30,7 +68,22 @@ def validate_schema(
 
 
 def missing_value_report(records: Iterable[Dict]) -> Dict[str, int]:
-    """Return count of missing (None) values per field across records."""
+    """Return count of missing (None) values per field across records.
+
+    For columnar batches, NaN/NaT entries count as missing.
+    """
+    if _is_frame(records):
+        return {k: int(v) for k, v in records.isna().sum().items()}
+    if is_columnar(records):
+        counts = {}
+        for k in records.dtype.names:
+            col = records[k]
+            if col.dtype.kind in "fcmM":
+                counts[k] = int((col != col).sum())
+            else:
+                counts[k] = 0
+        return counts
+
     counts = {}
     for r in records:
         for k, v in r.items():
@@ -48,9 +101,25 @@ def deduplicate(
     """Return records deduplicated by `key_fields` preserving first seen
     order.
     """
+    keys = list(key_fields)
+    if is_columnar(records):
+        # Absent key fields behave like a constant None column, as below.
+        names = records.columns if _is_frame(records) else records.dtype.names
+        keys = [k for k in keys if k in names]
+        if not keys:
+            return records[:1]
+    if _is_frame(records):
+        return records.drop_duplicates(subset=keys, keep="first")
+    if is_columnar(records):
+        import numpy as np
+
+        if len(records) == 0:
+            return records
+        _, first = np.unique(records[keys], return_index=True)
+        return records[np.sort(first)]
+
     seen = set()
     out = []
-    keys = list(key_fields)
     for r in records:
         key = tuple(r.get(k) for k in keys)
         if key in seen:
@@ -68,6 +137,38 @@ def basic_range_check(
 
     `ranges` is a dict field -> (min, max).
     """
+    if is_columnar(records):
+        import numpy as np
+
+        # Stack the checked columns into one (rows x fields) float matrix and
+        # compare against broadcast bound vectors in a single pass.
+        violations = {k: 0 for k in ranges.keys()}
+        if _is_frame(records):
+            import pandas as pd
+
+            cols = [k for k in ranges if k in records.columns]
+            if not cols:
+                return violations
+            raw = records[cols]
+            numeric = raw.apply(pd.to_numeric, errors="coerce")
+            # Non-numeric entries count as violations, like the TypeError
+            # branch of the record-wise check.
+            invalid = (numeric.isna() & raw.notna()).to_numpy().sum(axis=0)
+            mat = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            from numpy.lib import recfunctions
+
+            cols = [k for k in ranges if k in records.dtype.names]
+            if not cols:
+                return violations
+            mat = recfunctions.structured_to_unstructured(records[cols], dtype=np.float64)
+            invalid = 0
+        lo = np.array([ranges[k][0] for k in cols], dtype=np.float64)
+        hi = np.array([ranges[k][1] for k in cols], dtype=np.float64)
+        counts = ((mat < lo) | (mat > hi)).sum(axis=0) + invalid
+        violations.update({k: int(c) for k, c in zip(cols, counts)})
+        return violations
+
     violations = {k: 0 for k in ranges.keys()}
     for r in records:
         for k, (lo, hi) in ranges.items():
@@ -83,6 +184,8 @@ def basic_range_check(
 
 
 __all__ = [
+    "is_columnar",
+    "to_dicts",
     "validate_schema",
     "missing_value_report",
     "deduplicate",
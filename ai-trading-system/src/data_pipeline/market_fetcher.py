@@ -9,6 +9,7 @@ real-time market data.
 import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+import numpy as np
 import pandas as pd
 
 try:
@@ -17,12 +18,60 @@ except ImportError:
     yf = None
 
 from dotenv import load_dotenv
+from src.data_pipeline.data_utils import to_dicts
 from src.monitoring.structured_logger import get_logger
 
 load_dotenv()
 
 logger = get_logger()
 
+# Columnar (struct-of-arrays) layout for normalized OHLCV bars. Each field
+# is a contiguous NumPy column, so range/outlier checks run as vector ops
+# instead of touching one boxed Python float per record.
+# The symbol field fits OCC option symbols (21 chars padded); longer
+# symbols are rejected rather than silently truncated.
+_SYMBOL_WIDTH = 24
+
+OHLCV_DTYPE = np.dtype([
+    ("timestamp", "U32"),
+    ("symbol", f"U{_SYMBOL_WIDTH}"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "i8"),
+])
+
+_PRICE_FIELDS = ("open", "high", "low", "close")
+
+
+def _isoformat_index(index: pd.Index) -> np.ndarray:
+    """Format a DatetimeIndex like `Timestamp.isoformat()`, without a per-row loop.
+
+    Wall-clock times and UTC offsets are rendered with NumPy string kernels,
+    so mixed offsets (e.g. across a DST change) are preserved per element.
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        return np.array([ts.isoformat() for ts in index], dtype=str)
+
+    local = index.tz_localize(None) if index.tz is not None else index
+    wall = local.values.astype("datetime64[us]")
+    stamps = np.datetime_as_string(wall, unit="s")
+    has_fraction = wall != wall.astype("datetime64[s]")
+    if has_fraction.any():
+        stamps = np.where(has_fraction, np.datetime_as_string(wall, unit="us"), stamps)
+
+    if index.tz is None:
+        return stamps
+
+    utc = index.tz_convert("UTC").tz_localize(None).values.astype("datetime64[us]")
+    offset_min = (wall - utc).astype("timedelta64[m]").astype(np.int64)
+    sign = np.where(offset_min < 0, "-", "+")
+    hours = np.char.zfill((np.abs(offset_min) // 60).astype(str), 2)
+    minutes = np.char.zfill((np.abs(offset_min) % 60).astype(str), 2)
+    offsets = np.char.add(np.char.add(np.char.add(sign, hours), ":"), minutes)
+    return np.char.add(stamps, offsets)
+
 
 class MarketFetcher:
     """Fetch market data using Yahoo Finance API (free, no credentials required)."""
@@ -46,7 +95,14 @@ class MarketFetcher:
         self.base_url = "Yahoo Finance (free API)"
         logger.info("MarketFetcher initialized", backend="Yahoo Finance", credentials_required=False)
 
-    def fetch_intraday(self, symbol: str, start: str, end: str, interval: str = "1Min") -> Optional[List[Dict]]:
+    def fetch_intraday(
+        self,
+        symbol: str,
+        start: str,
+        end: str,
+        interval: str = "1Min",
+        as_array: bool = False,
+    ) -> Optional[List[Dict]]:
         """
         Fetch intraday market data for a given symbol using Yahoo Finance.
 
@@ -54,7 +110,9 @@ class MarketFetcher:
         :param start: Start time in ISO8601 format (e.g., '2023-01-01T09:30:00').
         :param end: End time in ISO8601 format.
         :param interval: Granularity of data ('1m', '2m', '5m', '15m', '30m', '60m', '1h', '1d').
-        :return: List of normalized records or None on failure.
+        :param as_array: Return the `OHLCV_DTYPE` structured array instead of
+                         a list of dicts (accepted directly by `validate_and_store`).
+        :return: List of normalized records (or structured array) or None on failure.
         
         Supported intervals:
         - Intraday: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h
@@ -96,7 +154,7 @@ class MarketFetcher:
             # Normalize data to match expected output format
             normalized_data = self._normalize_data(df, symbol)
             logger.info("intraday_fetch_success", symbol=symbol, record_count=len(normalized_data), interval=yf_interval)
-            return normalized_data
+            return normalized_data if as_array else to_dicts(normalized_data)
 
         except ValueError as e:
             logger.error("intraday_fetch_validation_error", symbol=symbol, error=str(e))
@@ -105,14 +163,18 @@ class MarketFetcher:
             logger.error("intraday_fetch_error", symbol=symbol, error=str(e), exc_info=True)
             return None
 
-    def _normalize_data(self, df: pd.DataFrame, symbol: str) -> List[Dict]:
+    def _normalize_data(self, df: pd.DataFrame, symbol: str) -> np.ndarray:
         """
         Normalize Yahoo Finance data to pipeline-compatible format.
 
         :param df: DataFrame from yfinance with OHLCV data
         :param symbol: Ticker symbol
-        :return: List of normalized records
+        :return: Structured array with `OHLCV_DTYPE` (missing values become 0)
+        :raises ValueError: If `symbol` does not fit the dtype's symbol field
         """
+        if len(symbol) > _SYMBOL_WIDTH:
+            raise ValueError(f"symbol {symbol!r} longer than {_SYMBOL_WIDTH} characters")
+
         # Rename columns to lowercase if needed
         df = df.rename(columns={
             'Open': 'open',
@@ -121,32 +183,18 @@ class MarketFetcher:
             'Close': 'close',
             'Volume': 'volume'
         })
-        
-        normalized_records = []
-        error_count = 0
-        
-        for timestamp, row in df.iterrows():
-            try:
-                record = {
-                    "timestamp": timestamp.isoformat(),
-                    "symbol": symbol,
-                    "open": float(row["open"]) if pd.notna(row["open"]) else 0.0,
-                    "high": float(row["high"]) if pd.notna(row["high"]) else 0.0,
-                    "low": float(row["low"]) if pd.notna(row["low"]) else 0.0,
-                    "close": float(row["close"]) if pd.notna(row["close"]) else 0.0,
-                    "volume": int(row["volume"]) if pd.notna(row["volume"]) else 0,
-                }
-                normalized_records.append(record)
-            except (KeyError, ValueError, TypeError) as e:
-                error_count += 1
-                logger.warning(
-                    "normalization_error",
-                    symbol=symbol,
-                    timestamp=str(timestamp),
-                    error=str(e)
-                )
-        
-        if error_count > 0:
-            logger.info("normalize_completed_with_errors", symbol=symbol, error_count=error_count, total=len(df))
-        
-        return normalized_records
\ No newline at end of file
+
+        records = np.empty(len(df), dtype=OHLCV_DTYPE)
+        try:
+            for col in _PRICE_FIELDS:
+                values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+                records[col] = np.nan_to_num(values, nan=0.0)
+            records["volume"] = pd.to_numeric(df["volume"], errors="coerce").fillna(0).to_numpy(dtype="int64")
+        except (KeyError, ValueError, TypeError) as e:
+            logger.warning("normalization_error", symbol=symbol, error=str(e))
+            logger.info("normalize_completed_with_errors", symbol=symbol, error_count=len(df), total=len(df))
+            return np.empty(0, dtype=OHLCV_DTYPE)
+
+        records["timestamp"] = _isoformat_index(df.index)
+        records["symbol"] = symbol
+        return records
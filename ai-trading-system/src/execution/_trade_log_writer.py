@@ -0,0 +1,141 @@
+"""Background writer for the JSONL trade audit log.
+
+`execute_order` hands trade records to `trade_log_writer` instead of
+calling `log_trade` inline, so a fill never waits on disk. A single
+daemon thread drains the queue in batches (up to `_MAX_BATCH` records or
+`_MAX_WAIT_SEC` after the first one) and appends each file's lines with
+one write and one fsync. Lines are identical to those of `log_trade`.
+
+Records can also be queued as a `(fields, row)` pair with `enqueue_row`;
+the dict is then built on the writer thread rather than by the caller.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.backtesting.trade_log import _ensure_dir, _format_record, resolve_log_path
+from src.monitoring.structured_logger import get_logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = get_logger()
+
+_MAX_BATCH = 100
+_MAX_WAIT_SEC = 0.05
+
+
+if orjson is not None:
+    def _encode(trade: Dict) -> bytes:
+        return orjson.dumps(_format_record(trade), default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+else:
+    def _encode(trade: Dict) -> bytes:
+        return json.dumps(_format_record(trade), default=str, separators=(",", ":")).encode("utf-8")
+
+
+class AsyncTradeLogger:
+    """Queue of trade records written to JSONL by one daemon thread."""
+
+    def __init__(self):
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def enqueue(self, trade: Dict, run_id: Optional[str] = None, path: Optional[str] = None) -> str:
+        """Queue `trade` for appending; returns the path it will be written to."""
+        path = resolve_log_path(run_id, path)
+        self._ensure_started()
+        self._queue.put((path, trade))
+        return path
+
+    def enqueue_row(
+        self,
+        fields: Tuple[str, ...],
+        row: Sequence,
+        run_id: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> str:
+        """Queue the record `dict(zip(fields, row))` without building it here.
+
+        `row` must not be mutated after the call; a tuple is expected.
+        """
+        path = resolve_log_path(run_id, path)
+        self._ensure_started()
+        self._queue.put((path, (fields, row)))
+        return path
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every record queued so far has been written."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="trade-log-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List = []
+            waiters: List[threading.Event] = []
+            deadline = time.monotonic() + _MAX_WAIT_SEC
+            while True:
+                if isinstance(item, threading.Event):
+                    # Flush markers end the batch so the caller is not kept waiting
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= _MAX_BATCH:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_batch(batch)
+            for done in waiters:
+                done.set()
+
+    @staticmethod
+    def _write_batch(batch: List) -> None:
+        by_path: Dict[str, List[bytes]] = {}
+        for path, trade in batch:
+            try:
+                if isinstance(trade, tuple):
+                    trade = dict(zip(*trade))
+                by_path.setdefault(path, []).append(_encode(trade) + b"\n")
+            except Exception as e:
+                logger.error("trade_log_encode_error", path=path, error=str(e))
+        for path, lines in by_path.items():
+            try:
+                _ensure_dir(os.path.dirname(path) or ".")
+                fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, b"".join(lines))
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                logger.error("trade_log_write_error", path=path, records=len(lines), error=str(e))
+
+
+trade_log_writer = AsyncTradeLogger()
+atexit.register(trade_log_writer.flush)
@@ -4,23 +4,94 @@ Saves and restores trading account state between sessions to track
 performance over time instead of resetting to initial capital.
 """
 
+import atexit
+import copy
 import json
+import os
+import threading
+import weakref
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
+_UTC = timezone.utc
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(state: Dict[str, Any]) -> bytes:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+    _loads = orjson.loads
+else:
+    # Reused across saves instead of configuring a new encoder per json.dump
+    _ENCODE = json.JSONEncoder(indent=2).encode
+
+    def _dumps(state: Dict[str, Any]) -> bytes:
+        return _ENCODE(state).encode("utf-8")
+
+    _loads = json.loads
+
+# Debounced managers; one exit hook flushes whatever they still hold,
+# without keeping them alive
+_debounced_managers: "weakref.WeakSet[AccountStateManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_states() -> None:
+    for mgr in list(_debounced_managers):
+        mgr.flush()
+
 
 class AccountStateManager:
     """Manages persistent account state across trading sessions."""
     
-    def __init__(self, state_file: Path = Path("data/account_state.json")):
+    __slots__ = (
+        "state_file",
+        "flush_interval",
+        "durable",
+        "_state_file_str",
+        "_tmp_file_str",
+        "_pending_state",
+        "_flush_timer",
+        "_lock",
+        "_cache",
+        "__weakref__",
+    )
+    
+    def __init__(
+        self,
+        state_file: Path = Path("data/account_state.json"),
+        flush_interval: float = 0.0,
+        durable: bool = False,
+    ):
         """Initialize account state manager.
         
         Args:
             state_file: Path to persistent state file
+            flush_interval: If > 0, save_state() calls are coalesced and
+                written at most once per this many seconds (and on flush(),
+                close() or interpreter exit). 0 writes every save immediately.
+            durable: fsync each write before it replaces the state file.
+                Off by default; the replace is atomic either way.
         """
-        self.state_file = Path(state_file)
+        self.state_file = state_file if isinstance(state_file, Path) else Path(state_file)
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        # Plain-str paths for the I/O calls, converted once
+        self._state_file_str = os.fspath(self.state_file)
+        self._tmp_file_str = self._state_file_str + ".tmp"
+        self.flush_interval = flush_interval
+        self.durable = durable
+        self._pending_state: Optional[Dict[str, Any]] = None
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # ((mtime_ns, size), state) of the last file read or written
+        self._cache: Optional[tuple] = None
+        if flush_interval > 0:
+            _debounced_managers.add(self)
     
     def save_state(
         self,
@@ -40,7 +111,7 @@ class AccountStateManager:
             session_count: Number of trading sessions completed
         """
         state = {
-            "last_updated": datetime.now(timezone.utc).isoformat(),
+            "last_updated": datetime.now(_UTC).isoformat(),
             "cash": cash,
             "portfolio_value": portfolio_value,
             "positions": positions,
@@ -48,24 +119,79 @@ class AccountStateManager:
             "session_count": session_count,
         }
         
-        with open(self.state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        if self.flush_interval <= 0:
+            self._write_state(state)
+            return
+        
+        # Debounced: keep only the latest state; the first save in a window
+        # schedules the write, later ones just replace what gets written.
+        with self._lock:
+            self._pending_state = state
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self) -> None:
+        """Write any pending debounced state to disk now."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            state, self._pending_state = self._pending_state, None
+            if state is not None:
+                self._write_state(state)
+    
+    def close(self) -> None:
+        """Flush pending state and drop this manager from the exit hook."""
+        self.flush()
+        _debounced_managers.discard(self)
+    
+    def _write_state(self, state: Dict[str, Any]) -> None:
+        # Write a sibling temp file and swap it in, so a crash mid-write
+        # leaves the previous state intact instead of a truncated file.
+        tmp_file = self._tmp_file_str
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps(state))
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self._state_file_str)
+        st = os.stat(self._state_file_str)
+        self._cache = ((st.st_mtime_ns, st.st_size), state)
     
     def load_state(self) -> Optional[Dict[str, Any]]:
         """Load account state from disk.
         
+        The parsed dict is cached until the file's mtime or size changes,
+        so treat the result as read-only.
+        
         Returns:
             Dict with account state, or None if no saved state exists
         """
-        if not self.state_file.exists():
+        pending = self._pending_state
+        if pending is not None:
+            # A copy, so callers cannot edit the state waiting to be written
+            return copy.deepcopy(pending)
+        
+        try:
+            st = os.stat(self._state_file_str)
+        except FileNotFoundError:
             return None
         
+        stamp = (st.st_mtime_ns, st.st_size)
+        cache = self._cache
+        if cache is not None and cache[0] == stamp:
+            return cache[1]
+        
         try:
-            with open(self.state_file, 'r') as f:
-                return json.load(f)
+            with open(self._state_file_str, 'rb') as f:
+                state = _loads(f.read())
         except (json.JSONDecodeError, IOError) as e:
             print(f"⚠️  Failed to load account state: {e}")
             return None
+        self._cache = (stamp, state)
+        return state
     
     def get_initial_cash(self, default: float = 100000.0) -> float:
         """Get initial cash for new session.
@@ -115,6 +241,7 @@ class AccountStateManager:
             trades_count=0,
             session_count=0
         )
+        self.flush()
         print(f"✅ Account reset to ${initial_cash:,.2f}")
     
     def get_session_count(self) -> int:
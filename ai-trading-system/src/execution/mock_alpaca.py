@@ -11,15 +11,69 @@ Usage:
     filled_order = client.get_order(order.id)
 """
 
+import atexit
+import heapq
 import json
-import random
 import time
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+import weakref
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import MappingProxyType
+from typing import Deque, Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from uuid import uuid4
 
+import numpy as np
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Starting quotes for a fresh client (symbol -> last_price)
+_DEFAULT_PRICES = MappingProxyType({
+    "AAPL": 150.00,
+    "MSFT": 380.00,
+    "GOOGL": 140.00,
+    "TSLA": 250.00,
+    "SPY": 450.00,
+    "QQQ": 380.00,
+    "IWM": 200.00,
+})
+
+# Trades buffered before one append-write to `trade_log_path`
+_TRADE_SPILL_BATCH = 1000
+
+# Clients with a trade log; one exit hook flushes their partial batches
+# without keeping the clients alive
+_trade_log_clients: "weakref.WeakSet[MockAlpacaClient]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_trade_logs() -> None:
+    for client in list(_trade_log_clients):
+        client.flush_trade_log()
+
+# Uniform draws are pre-generated in blocks and consumed by index
+_RAND_BUFFER_SIZE = 4096
+
+
+def _iso_from_ns(ns: int, suffix: str = "Z") -> str:
+    """Format a `time.time_ns()` stamp as a UTC ISO-8601 string.
+
+    Records keep the raw integer and are only formatted when read, so the
+    fill path never pays for datetime construction and isoformat().
+    """
+    return (_EPOCH + timedelta(microseconds=ns // 1000)).isoformat() + suffix
+
+
+def _export_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of an internal trade/equity record with a formatted timestamp."""
+    out = {"timestamp": _iso_from_ns(record["timestamp_ns"])}
+    out.update(record)
+    del out["timestamp_ns"]
+    return out
+
 
 class OrderStatus(Enum):
     """Order status enum."""
@@ -31,7 +85,7 @@ class OrderStatus(Enum):
     REJECTED = "rejected"
 
 
-@dataclass
+@dataclass(slots=True)
 class MockOrder:
     """Simulated order object."""
     id: str
@@ -43,15 +97,25 @@ class MockOrder:
     time_in_force: str
     status: str
     filled_avg_price: Optional[float] = None
-    created_at: str = None
-    filled_at: Optional[str] = None
+    created_at_ns: int = 0
+    filled_at_ns: Optional[int] = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now(timezone.utc).isoformat()
+        if not self.created_at_ns:
+            self.created_at_ns = time.time_ns()
+    
+    @property
+    def created_at(self) -> str:
+        return _iso_from_ns(self.created_at_ns, "+00:00")
+    
+    @property
+    def filled_at(self) -> Optional[str]:
+        if self.filled_at_ns is None:
+            return None
+        return _iso_from_ns(self.filled_at_ns, "+00:00")
 
 
-@dataclass
+@dataclass(slots=True)
 class MockPosition:
     """Simulated position object."""
     symbol: str
@@ -60,9 +124,9 @@ class MockPosition:
     side: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MockAccount:
-    """Simulated account object."""
+    """Simulated account object (a read-only snapshot)."""
     id: str
     cash: float
     portfolio_value: float
@@ -72,7 +136,7 @@ class MockAccount:
     
     def __post_init__(self):
         if self.account_number is None:
-            self.account_number = self.id
+            object.__setattr__(self, "account_number", self.id)
 
 
 class MockAlpacaClient:
@@ -86,12 +150,28 @@ class MockAlpacaClient:
     - Trade logging
     """
     
-    def __init__(self, initial_cash: float = 100000.0, fill_delay_sec: float = 2.0):
+    def __init__(
+        self,
+        initial_cash: float = 100000.0,
+        fill_delay_sec: float = 2.0,
+        max_history: int = 100_000,
+        trade_log_path: Optional[Path] = None,
+        instant_fill: bool = False,
+        stable_ids: bool = True,
+    ):
         """Initialize mock Alpaca client.
         
         Args:
             initial_cash: Starting cash balance
             fill_delay_sec: Simulated delay before order fills (seconds)
+            max_history: Most recent trades / equity snapshots kept in memory
+            trade_log_path: Optional JSONL file receiving every trade in
+                batches, so history beyond `max_history` is not lost; a
+                partial batch is written by flush_trade_log() or at exit
+            instant_fill: Fill (or reject) orders inside submit_order,
+                ignoring `fill_delay_sec`; for deterministic simulations
+            stable_ids: Number orders "<account_id>-<n>" with a per-client
+                counter; False uses a random uuid4 per order instead
         """
         self.account_id = "mock_" + str(uuid4())[:8]
         self.cash = initial_cash
@@ -99,32 +179,35 @@ class MockAlpacaClient:
         self.portfolio_value = initial_cash
         self.buying_power = initial_cash
         self.fill_delay_sec = fill_delay_sec
-        self.orders = {}
-        self.positions = {}
-        self._order_fill_times = {}
-        self.market_prices = {}  # Dict of {symbol: price} for accurate fills
-        self.trades = []  # Log of all trades executed
-        self.equity_snapshots = []  # Time-series of equity values
+        self.instant_fill = instant_fill
+        self.stable_ids = stable_ids
+        self._order_seq = 0
         self.multiplier = 1.0
-        self.fill_delay_sec = fill_delay_sec
         
         self.orders: Dict[str, MockOrder] = {}
         self.positions: Dict[str, MockPosition] = {}
-        self.trades: List[Dict[str, Any]] = []
-        self.equity_history: List[Dict[str, Any]] = []
-        
-        # Mock market prices (symbol -> last_price)
-        self.market_prices: Dict[str, float] = {
-            "AAPL": 150.00,
-            "MSFT": 380.00,
-            "GOOGL": 140.00,
-            "TSLA": 250.00,
-            "SPY": 450.00,
-            "QQQ": 380.00,
-            "IWM": 200.00,
-        }
-        
-        self._order_fill_times: Dict[str, float] = {}
+        self.trades: Deque[Dict[str, Any]] = deque(maxlen=max_history)
+        self.equity_history: Deque[Dict[str, Any]] = deque(maxlen=max_history)
+        self.trade_log_path = Path(trade_log_path) if trade_log_path is not None else None
+        self._trade_batch: List[Dict[str, Any]] = []
+        if self.trade_log_path is not None:
+            _trade_log_clients.add(self)
+        
+        # Mock market prices (symbol -> last_price), replaced by set_market_prices()
+        self.market_prices: Dict[str, float] = dict(_DEFAULT_PRICES)
+        
+        # Struct-of-arrays view of position quantities for valuation: one
+        # slot per symbol ever held (qty 0 once flat), grown by doubling.
+        self._slots: Dict[str, int] = {}
+        self._slot_symbols: List[str] = []
+        self._qty = np.zeros(8, dtype=np.float64)
+        
+        self._rng = np.random.default_rng()
+        self._rand_buf = self._rng.random(_RAND_BUFFER_SIZE)
+        self._rand_idx = 0
+        
+        # (fill deadline, order id) min-heap of submitted orders
+        self._pending_heap: List[Tuple[float, str]] = []
         self._record_equity_snapshot()
     
     def set_market_prices(self, prices_dict: dict) -> None:
@@ -135,36 +218,74 @@ class MockAlpacaClient:
         """
         self.market_prices = prices_dict.copy()
     
-    def _get_market_price(self, symbol: str) -> float:
-        """Get current market price for symbol (with realistic noise).
+    def _get_mark_price(self, symbol: str) -> float:
+        """Get the mark price used to value a position (no noise).
         
         Args:
             symbol: Stock ticker
         
         Returns:
-            Current simulated market price
+            Last price from the market data feed
         """
-        base_price = self.market_prices.get(symbol, 100.0)
-        # Add small random walk (±0.5% volatility)
-        noise = base_price * random.uniform(-0.005, 0.005)
-        return max(1.0, base_price + noise)
+        return self.market_prices.get(symbol, 100.0)
     
-    def _simulate_fill(self, order: MockOrder) -> None:
-        """Simulate order fill after delay.
+    def _get_execution_price(self, symbol: str, side: str) -> float:
+        """Get the simulated fill price for an order (with slippage).
         
         Args:
-            order: Order to fill
+            symbol: Stock ticker
+            side: 'buy' or 'sell'
+        
+        Returns:
+            Market price moved adversely by 0-2 basis points
         """
-        if order.id not in self._order_fill_times:
-            self._order_fill_times[order.id] = time.time()
+        market_price = self._get_mark_price(symbol)
+        # Add minimal realistic slippage (0-2 basis points) - not 50bps
+        slippage_bps = 0.0002 * self._next_rand()  # Realistic market maker spread
+        slippage = market_price * slippage_bps
+        if side == "buy":
+            return market_price + slippage  # Adverse: higher on buy
+        return market_price - slippage  # Adverse: lower on sell
+    
+    def _next_rand(self) -> float:
+        """Return the next uniform [0, 1) draw from the pre-filled buffer."""
+        if self._rand_idx == len(self._rand_buf):
+            self._rand_buf = self._rng.random(_RAND_BUFFER_SIZE)
+            self._rand_idx = 0
+        value = self._rand_buf[self._rand_idx]
+        self._rand_idx += 1
+        return float(value)
+    
+    def process_ready_fills(self, now: Optional[float] = None) -> int:
+        """Fill every pending order whose fill delay has elapsed.
+        
+        Args:
+            now: Current time in epoch seconds (default: time.time())
         
-        # Check if fill delay has elapsed
-        elapsed = time.time() - self._order_fill_times[order.id]
-        if elapsed < self.fill_delay_sec:
-            return  # Not ready to fill yet
+        Returns:
+            Number of orders filled or rejected
+        """
+        if now is None:
+            now = time.time()
+        heap = self._pending_heap
+        processed = 0
+        while heap and heap[0][0] <= now:
+            _, order_id = heapq.heappop(heap)
+            order = self.orders.get(order_id)
+            # Canceled orders stay in the heap and are dropped here
+            if order is not None and order.status == OrderStatus.PENDING.value:
+                self._simulate_fill(order)
+                processed += 1
+        return processed
+    
+    def _simulate_fill(self, order: MockOrder) -> None:
+        """Simulate the fill of an order whose delay has elapsed.
         
+        Args:
+            order: Order to fill
+        """
         # Simulate fill with 95% success rate
-        if random.random() > 0.95:
+        if self._next_rand() > 0.95:
             order.status = OrderStatus.REJECTED.value
             order.filled_qty = 0
             order.filled_avg_price = None
@@ -172,28 +293,48 @@ class MockAlpacaClient:
         
         # Fill the order at actual market price from market data (not regenerated random price)
         # This uses the price passed via set_market_prices() which comes from live market data
-        market_price = self.market_prices.get(order.symbol, 100.0)
-        
-        # Add minimal realistic slippage (0-2 basis points) - not 50bps
-        slippage_bps = random.uniform(0.00, 0.0002)  # Realistic market maker spread
-        slippage = market_price * slippage_bps
-        if order.side.lower() == "buy":
-            fill_price = market_price + slippage  # Adverse: higher on buy
-        else:  # sell
-            fill_price = market_price - slippage  # Adverse: lower on sell
+        fill_price = self._get_execution_price(order.symbol, order.side.lower())
         
         order.filled_qty = order.qty
         order.filled_avg_price = round(fill_price, 2)
         order.status = OrderStatus.FILLED.value
-        order.filled_at = datetime.now(timezone.utc).isoformat()
+        order.filled_at_ns = time.time_ns()
+        
+        self._commit_fill(order)
+    
+    def _commit_fill(self, order: MockOrder) -> None:
+        """Apply a filled order: positions, cash, one revaluation, records.
+        
+        The trade record and the equity snapshot share the portfolio value
+        and timestamp computed here.
         
-        # Update positions and cash
+        Args:
+            order: Filled order
+        """
         self._update_position(order)
-        self._record_trade(order)
-        self._record_equity_snapshot()
+        self._update_portfolio_value()
+        
+        ts_ns = order.filled_at_ns
+        price = order.filled_avg_price
+        qty = order.filled_qty
+        trade = {
+            "timestamp_ns": ts_ns,
+            "order_id": order.id,
+            "symbol": order.symbol,
+            "side": order.side.upper(),
+            "qty": qty,
+            "filled_price": price,
+            "cost": qty * price,
+        }
+        self.trades.append(trade)
+        if self.trade_log_path is not None:
+            self._trade_batch.append(trade)
+            if len(self._trade_batch) >= _TRADE_SPILL_BATCH:
+                self.flush_trade_log()
+        self._append_equity_snapshot(ts_ns)
     
     def _update_position(self, order: MockOrder) -> None:
-        """Update position after order fill.
+        """Update position and cash after order fill (no revaluation).
         
         Args:
             order: Filled order
@@ -234,40 +375,57 @@ class MockAlpacaClient:
                 else:
                     pos.avg_fill_price = pos.avg_fill_price  # Keep average
         
-        # Update portfolio value
-        self._update_portfolio_value()
+        pos = self.positions.get(symbol)
+        slot = self._slot_for(symbol)
+        self._qty[slot] = pos.qty if pos is not None else 0.0
+    
+    def _slot_for(self, symbol: str) -> int:
+        """Return the SoA slot index for `symbol`, allocating one if new."""
+        slot = self._slots.get(symbol)
+        if slot is None:
+            slot = len(self._slot_symbols)
+            if slot == len(self._qty):
+                self._qty = np.concatenate([self._qty, np.zeros(slot, dtype=np.float64)])
+            self._slots[symbol] = slot
+            self._slot_symbols.append(symbol)
+        return slot
     
     def _update_portfolio_value(self) -> None:
         """Update total portfolio value (cash + positions)."""
-        position_value = sum(
-            pos.qty * self._get_market_price(pos.symbol)
-            for pos in self.positions.values()
-        )
+        n = len(self._slot_symbols)
+        if n:
+            # Inlined _get_mark_price: positions are valued at the feed price,
+            # so snapshots are deterministic given set_market_prices().
+            prices = self.market_prices
+            marks = np.fromiter(
+                (prices.get(s, 100.0) for s in self._slot_symbols),
+                dtype=np.float64,
+                count=n,
+            )
+            position_value = float(self._qty[:n] @ marks)
+        else:
+            position_value = 0.0
         self.portfolio_value = self.cash + position_value
         self.buying_power = self.portfolio_value
     
-    def _record_trade(self, order: MockOrder) -> None:
-        """Record executed trade.
-        
-        Args:
-            order: Filled order
-        """
-        trade = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "order_id": order.id,
-            "symbol": order.symbol,
-            "side": order.side.upper(),
-            "qty": order.filled_qty,
-            "filled_price": order.filled_avg_price,
-            "cost": order.filled_qty * order.filled_avg_price,
-        }
-        self.trades.append(trade)
+    def flush_trade_log(self) -> None:
+        """Append buffered trades to `trade_log_path` in a single write."""
+        if self.trade_log_path is None or not self._trade_batch:
+            return
+        payload = "".join(json.dumps(_export_record(t)) + "\n" for t in self._trade_batch)
+        with self.trade_log_path.open("a", encoding="utf-8") as f:
+            f.write(payload)
+        self._trade_batch.clear()
     
     def _record_equity_snapshot(self) -> None:
-        """Record current account equity snapshot."""
+        """Revalue the portfolio and record an equity snapshot."""
         self._update_portfolio_value()
+        self._append_equity_snapshot(time.time_ns())
+    
+    def _append_equity_snapshot(self, ts_ns: int) -> None:
+        """Record an equity snapshot of the current (already computed) values."""
         snapshot = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp_ns": ts_ns,
             "cash": round(self.cash, 2),
             "portfolio_value": round(self.portfolio_value, 2),
             "buying_power": round(self.buying_power, 2),
@@ -311,7 +469,11 @@ class MockAlpacaClient:
         Returns:
             MockOrder with unique ID
         """
-        order_id = str(uuid4())
+        if self.stable_ids:
+            self._order_seq += 1
+            order_id = f"{self.account_id}-{self._order_seq}"
+        else:
+            order_id = str(uuid4())
         order = MockOrder(
             id=order_id,
             symbol=symbol.upper(),
@@ -323,6 +485,10 @@ class MockAlpacaClient:
             status=OrderStatus.PENDING.value
         )
         self.orders[order_id] = order
+        if self.instant_fill:
+            self._simulate_fill(order)
+            return order
+        heapq.heappush(self._pending_heap, (time.time() + self.fill_delay_sec, order_id))
         return order
     
     def get_order(self, order_id: str) -> Optional[MockOrder]:
@@ -339,9 +505,9 @@ class MockAlpacaClient:
         
         order = self.orders[order_id]
         
-        # Simulate fill if not yet filled
+        # Simulate fills that have come due if this one is still open
         if order.status == OrderStatus.PENDING.value:
-            self._simulate_fill(order)
+            self.process_ready_fills()
         
         return order
     
@@ -359,7 +525,7 @@ class MockAlpacaClient:
         Returns:
             List of trade records
         """
-        return self.trades
+        return [_export_record(t) for t in self.trades]
     
     def get_equity_history(self) -> List[Dict[str, Any]]:
         """Get account equity history.
@@ -367,7 +533,7 @@ class MockAlpacaClient:
         Returns:
             List of equity snapshots with timestamps
         """
-        return self.equity_history
+        return [_export_record(s) for s in self.equity_history]
     
     def close_position(self, symbol: str) -> Optional[MockOrder]:
         """Close a position by selling all shares.
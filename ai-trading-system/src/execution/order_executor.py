@@ -1,19 +1,63 @@
 """Order execution logic.
 
 Executes orders through broker APIs and logs all trades to immutable
-JSONL logs for compliance and analysis.
+JSONL logs for compliance and analysis. The JSONL audit log is written by
+a background thread (see `_trade_log_writer`); call
+`trade_log_writer.flush()` before reading it back.
 """
 
-from typing import Dict, Optional
-from datetime import datetime, timezone
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
+from ._trade_log_writer import trade_log_writer
 from .broker_api import place_order
-from src.backtesting.trade_log import log_trade
 from src.monitoring.structured_logger import get_logger
 from src.risk.exposure_limits import check_exposure
 
 logger = get_logger()
 
+# Column order of the trade records queued for the JSONL audit log
+_TRADE_FIELDS = (
+    "timestamp_ns",
+    "symbol",
+    "side",
+    "qty",
+    "limit_price",
+    "filled_qty",
+    "executed_price",
+    "status",
+    "order_id",
+    "notional",
+    "commission",
+    "slippage",
+)
+
+# LRU of check_exposure results keyed on the portfolio's contents. A fill
+# changes cash/positions and therefore the key, so stale entries are never
+# hit and simply age out.
+_EXPOSURE_CACHE_SIZE = 128
+_exposure_cache: "OrderedDict[tuple, Tuple[bool, List[str]]]" = OrderedDict()
+
+
+def _cached_check_exposure(portfolio: Dict) -> Tuple[bool, List[str]]:
+    """`check_exposure` memoized for repeated calls on the same snapshot."""
+    try:
+        key = (portfolio.get("cash"), tuple(sorted(portfolio.get("positions", {}).items())))
+        hash(key)
+    except TypeError:
+        return check_exposure(portfolio)
+    hit = _exposure_cache.get(key)
+    if hit is not None:
+        _exposure_cache.move_to_end(key)
+        return hit[0], list(hit[1])
+    ok, violations = check_exposure(portfolio)
+    _exposure_cache[key] = (ok, list(violations))
+    if len(_exposure_cache) > _EXPOSURE_CACHE_SIZE:
+        _exposure_cache.popitem(last=False)
+    return ok, violations
+
 
 def execute_order(
     order: Dict,
@@ -35,9 +79,10 @@ def execute_order(
     try:
         # Validate exposure limits if requested
         if check_exposure_limits and portfolio:
-            ok, violations = check_exposure(portfolio)
+            ok, violations = _cached_check_exposure(portfolio)
             if not ok:
-                logger.error("order_rejected_exposure_limits", order=order, violations=violations)
+                if logger.is_enabled_for(logging.ERROR):
+                    logger.error("order_rejected_exposure_limits", order=order, violations=violations)
                 return {
                     "status": "rejected",
                     "reason": "Exposure limits exceeded",
@@ -47,37 +92,48 @@ def execute_order(
         # Place the order through broker
         execution_result = place_order(order)
         
-        # Build trade record for logging
-        trade_record = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "symbol": order.get("symbol"),
-            "side": order.get("side", "buy"),
-            "qty": order.get("qty"),
-            "limit_price": order.get("price"),
-            "filled_qty": execution_result.get("filled_qty", 0),
-            "executed_price": execution_result.get("executed_price", order.get("price")),
-            "status": execution_result.get("status", "unknown"),
-            "order_id": execution_result.get("order_id"),
-            "notional": execution_result.get("notional", 0),
-            "commission": execution_result.get("commission", 0),
-            "slippage": execution_result.get("slippage", 0),
-        }
-        
-        # Log the trade immutably
-        log_trade(trade_record, run_id=run_id, path=log_path)
-        logger.info(
-            "order_executed",
-            symbol=trade_record["symbol"],
-            side=trade_record["side"],
-            filled_qty=trade_record["filled_qty"],
-            executed_price=trade_record["executed_price"],
-            status=trade_record["status"],
+        # Trade record fields for logging, as a tuple in _TRADE_FIELDS order;
+        # the writer thread builds the dict and formats the timestamp
+        symbol = order.get("symbol")
+        side = order.get("side", "buy")
+        limit_price = order.get("price")
+        result = execution_result.get
+        filled_qty = result("filled_qty", 0)
+        executed_price = result("executed_price", limit_price)
+        status = result("status", "unknown")
+        trade_row = (
+            time.time_ns(),
+            symbol,
+            side,
+            order.get("qty"),
+            limit_price,
+            filled_qty,
+            executed_price,
+            status,
+            result("order_id"),
+            result("notional", 0),
+            result("commission", 0),
+            result("slippage", 0),
         )
         
+        # Log the trade immutably (queued; written off the fill path)
+        trade_log_writer.enqueue_row(_TRADE_FIELDS, trade_row, run_id=run_id, path=log_path)
+        # Checked per call (not cached at import) so level changes apply
+        if logger.is_enabled_for(logging.INFO):
+            logger.info(
+                "order_executed",
+                symbol=symbol,
+                side=side,
+                filled_qty=filled_qty,
+                executed_price=executed_price,
+                status=status,
+            )
+        
         return execution_result
         
     except Exception as e:
-        logger.error("order_execution_error", order=order, error=str(e))
+        if logger.is_enabled_for(logging.ERROR):
+            logger.error("order_execution_error", order=order, error=str(e))
         return {
             "status": "error",
             "reason": str(e),
@@ -8,19 +8,84 @@ Implements sophisticated filters to push trading systems toward profitability:
 5. Win-rate tracking for signal quality feedback
 """
 
+import bisect
+import functools
 import json
+import math
+import time
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, asdict
-from datetime import datetime
-import statistics
+from typing import Dict, Any, Iterator, List, Mapping, Optional, Tuple, Union
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timezone
+
+import numpy as np
 
 from src.monitoring.structured_logger import get_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger("profit_optimizer")
 
+_NAN = float("nan")
+_UTC = timezone.utc
+
+# Exit codes returned by the exit kernel, mapped to should_exit's result
+_EXIT_RESULTS: Tuple[Tuple[bool, Optional[str]], ...] = (
+    (False, None),
+    (True, "stop_loss"),
+    (True, "take_profit"),
+    (True, "trailing_stop"),
+)
+
+
+# Win-rate bands for the adaptive thresholds: below 0.45 (poor), below 0.50
+# (below breakeven), below 0.55 (slightly below), else good. Band i adds
+# _CONF_ADJ[i] / _BP_ADJ[i] to the base confidence / profit-bp thresholds.
+_WIN_RATE_EDGES = (0.45, 0.50, 0.55)
+_CONF_ADJ = (0.15, 0.10, 0.05, 0.0)
+_BP_ADJ = (3.0, 2.0, 1.0, 0.0)
+
+
+def _exit_code_py(side_sign, entry, price, sl, tp, trail_frac, max_profit, qty):
+    """Exit rule for one position.
+    
+    Returns (code, pnl) with code 0 hold, 1 stop-loss, 2 take-profit,
+    3 trailing stop. Unset stops/targets are passed as NaN. The trailing
+    stop arms once the position has been in profit and fires when P&L
+    falls `trail_frac` below its high-water mark (`max_profit`, including
+    this tick).
+    """
+    pnl = (price - entry) * side_sign * qty
+    if not math.isnan(sl) and side_sign * (price - sl) <= 0.0:
+        return 1, pnl
+    if not math.isnan(tp) and side_sign * (price - tp) >= 0.0:
+        return 2, pnl
+    if not math.isnan(trail_frac):
+        peak = max(max_profit, pnl)
+        if peak > 0.0 and pnl <= peak * (1.0 - trail_frac):
+            return 3, pnl
+    return 0, pnl
+
+
+@functools.lru_cache(maxsize=1)
+def _exit_kernel():
+    # numba is imported and the kernel compiled (or loaded from the on-disk
+    # cache) on the first exit check rather than at import, so processes
+    # that never manage positions do not pay for it
+    try:
+        from numba import njit
+    except ImportError:
+        return _exit_code_py
+    return njit(
+        "Tuple((int32, float64))(int64, float64, float64, float64, float64, float64, float64, float64)",
+        cache=True,
+    )(_exit_code_py)
 
-@dataclass
+
+@dataclass(slots=True)
 class Position:
     """Track an open position for exit management."""
     symbol: str
@@ -39,42 +104,222 @@ class Position:
     max_profit: float = 0.0
     max_loss: float = 0.0
     
+    # +1 for BUY, -1 for SELL; derived from `side` once at construction
+    side_sign: int = field(init=False, repr=False, compare=False)
+    # trailing_stop / 100 (NaN if unset); change it with set_trailing_stop()
+    _trail_frac: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.side_sign = 1 if self.side == "BUY" else -1
+        self.set_trailing_stop(self.trailing_stop)
+    
+    def set_trailing_stop(self, trailing_stop: Optional[float]) -> None:
+        """Set the trailing stop as a percentage giveback of peak profit."""
+        self.trailing_stop = trailing_stop
+        self._trail_frac = _NAN if trailing_stop is None else trailing_stop / 100.0
+    
     def calculate_pnl(self, current_price: float) -> float:
         """Calculate unrealized P&L."""
-        if self.side == "BUY":
-            return (current_price - self.entry_price) * self.qty
-        else:  # SELL
-            return (self.entry_price - current_price) * self.qty
+        return (current_price - self.entry_price) * self.side_sign * self.qty
     
     def should_exit(self, current_price: float) -> Tuple[bool, Optional[str]]:
         """Check if position should be closed based on exit rules.
         
+        Also updates the `max_profit` / `max_loss` watermarks.
+        
         Returns:
             (should_exit, reason)
         """
-        pnl = self.calculate_pnl(current_price)
-        
-        # Check stop-loss
-        if self.stop_loss_price is not None:
-            if self.side == "BUY" and current_price <= self.stop_loss_price:
-                return True, "stop_loss"
-            elif self.side == "SELL" and current_price >= self.stop_loss_price:
-                return True, "stop_loss"
-        
-        # Check take-profit
-        if self.take_profit_price is not None:
-            if self.side == "BUY" and current_price >= self.take_profit_price:
-                return True, "take_profit"
-            elif self.side == "SELL" and current_price <= self.take_profit_price:
-                return True, "take_profit"
-        
-        # Check trailing stop
-        if self.trailing_stop is not None and pnl > 0:
-            trailing_loss = pnl * (self.trailing_stop / 100.0)
-            if pnl - (pnl - trailing_loss) >= trailing_loss:
-                return True, "trailing_stop"
+        sl = self.stop_loss_price
+        tp = self.take_profit_price
+        code, pnl = _exit_kernel()(
+            self.side_sign,
+            self.entry_price,
+            current_price,
+            _NAN if sl is None else sl,
+            _NAN if tp is None else tp,
+            self._trail_frac,
+            self.max_profit,
+            self.qty,
+        )
+        if pnl > self.max_profit:
+            self.max_profit = pnl
+        elif pnl < self.max_loss:
+            self.max_loss = pnl
+        return _EXIT_RESULTS[code]
+
+
+@dataclass(slots=True)
+class Trade:
+    """A completed trade in the win-rate lookback window."""
+    symbol: str
+    side: str
+    qty: int
+    price: float
+    confidence: float
+    expected_profit_bp: float
+    pnl: float
+    ts: float  # time.time() when recorded
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict with the timestamp as UTC ISO-8601."""
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "qty": self.qty,
+            "price": self.price,
+            "confidence": self.confidence,
+            "expected_profit_bp": self.expected_profit_bp,
+            "pnl": self.pnl,
+            "timestamp": datetime.fromtimestamp(self.ts, _UTC).isoformat(),
+        }
+
+
+class PositionBook:
+    """Open positions stored column-wise for vectorized exit checks.
+    
+    Entry price, stop-loss, take-profit, side sign (+1 BUY / -1 SELL) and
+    quantity live in parallel NumPy arrays, one row per symbol; missing
+    stops are NaN so they never trigger. The `Position` objects are kept
+    alongside as the per-symbol view, so the book reads like the
+    `Dict[str, Position]` it replaces. Change a position's targets through
+    `set_targets` so the arrays stay in sync.
+    """
+    
+    def __init__(self, capacity: int = 16):
+        self.symbols: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._positions: List[Position] = []
+        self.entry_price = np.empty(capacity, dtype=np.float64)
+        self.stop = np.empty(capacity, dtype=np.float64)
+        self.tp = np.empty(capacity, dtype=np.float64)
+        self.side = np.empty(capacity, dtype=np.int8)
+        self.qty = np.empty(capacity, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.symbols))
+    
+    def __getitem__(self, symbol: str) -> Position:
+        return self._positions[self._rows[symbol]]
+    
+    def __setitem__(self, symbol: str, position: Position) -> None:
+        if symbol != position.symbol:
+            raise ValueError(f"Position for {position.symbol} stored under {symbol}")
+        self.add(position)
+    
+    def __delitem__(self, symbol: str) -> None:
+        self.remove(symbol)
+    
+    def get(self, symbol: str, default: Optional[Position] = None) -> Optional[Position]:
+        row = self._rows.get(symbol)
+        return default if row is None else self._positions[row]
+    
+    def keys(self) -> List[str]:
+        return list(self.symbols)
+    
+    def values(self) -> List[Position]:
+        return list(self._positions)
+    
+    def items(self) -> List[Tuple[str, Position]]:
+        return list(zip(self.symbols, self._positions))
+    
+    def add(self, position: Position) -> None:
+        """Add `position`, replacing any existing one for its symbol."""
+        row = self._rows.get(position.symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row == len(self.entry_price):
+                self._grow()
+            self._rows[position.symbol] = row
+            self.symbols.append(position.symbol)
+            self._positions.append(position)
+        else:
+            self._positions[row] = position
+        self.entry_price[row] = position.entry_price
+        self.side[row] = position.side_sign
+        self.qty[row] = position.qty
+        self._write_targets(row, position)
+    
+    def remove(self, symbol: str) -> Position:
+        """Remove and return the position for `symbol` (KeyError if absent)."""
+        row = self._rows.pop(symbol)
+        last = len(self.symbols) - 1
+        position = self._positions[row]
+        if row != last:
+            # Move the last row into the hole to keep the arrays dense
+            moved = self.symbols[last]
+            self.symbols[row] = moved
+            self._positions[row] = self._positions[last]
+            self._rows[moved] = row
+            for col in (self.entry_price, self.stop, self.tp, self.side, self.qty):
+                col[row] = col[last]
+        self.symbols.pop()
+        self._positions.pop()
+        return position
+    
+    def set_targets(
+        self,
+        symbol: str,
+        stop_loss_price: Optional[float] = None,
+        take_profit_price: Optional[float] = None,
+    ) -> None:
+        """Update a position's stop-loss / take-profit prices."""
+        row = self._rows[symbol]
+        position = self._positions[row]
+        position.stop_loss_price = stop_loss_price
+        position.take_profit_price = take_profit_price
+        self._write_targets(row, position)
+    
+    def calculate_pnl(self, prices: Union[np.ndarray, Mapping[str, float]]) -> np.ndarray:
+        """Unrealized P&L per row for `prices` (aligned with `symbols`)."""
+        n = len(self.symbols)
+        prices = self._price_vector(prices)
+        return (prices - self.entry_price[:n]) * self.side[:n] * self.qty[:n]
+    
+    def check_exits(self, prices: Union[np.ndarray, Mapping[str, float]]) -> np.ndarray:
+        """Bool mask (aligned with `symbols`) of stop-loss/take-profit hits.
         
-        return False, None
+        `prices` is an array aligned with `symbols` or a symbol -> price
+        mapping (symbols without a price never exit). Trailing stops depend
+        on each position's running high-water mark and are checked by
+        `Position.should_exit`.
+        """
+        n = len(self.symbols)
+        prices = self._price_vector(prices)
+        side = self.side[:n]
+        hit_sl = side * (prices - self.stop[:n]) <= 0
+        hit_tp = side * (prices - self.tp[:n]) >= 0
+        return hit_sl | hit_tp
+    
+    def _price_vector(self, prices: Union[np.ndarray, Mapping[str, float]]) -> np.ndarray:
+        if isinstance(prices, Mapping):
+            nan = float("nan")
+            return np.fromiter(
+                (prices.get(s, nan) for s in self.symbols),
+                dtype=np.float64,
+                count=len(self.symbols),
+            )
+        return np.asarray(prices, dtype=np.float64)
+    
+    def _write_targets(self, row: int, position: Position) -> None:
+        nan = float("nan")
+        sl, tp = position.stop_loss_price, position.take_profit_price
+        self.stop[row] = nan if sl is None else sl
+        self.tp[row] = nan if tp is None else tp
+    
+    def _grow(self) -> None:
+        cap = max(2 * len(self.entry_price), 16)
+        for name in ("entry_price", "stop", "tp", "side", "qty"):
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
 
 
 class ProfitOptimizer:
@@ -82,50 +327,106 @@ class ProfitOptimizer:
     
     def __init__(self, lookback_trades: int = 100):
         self.lookback_trades = lookback_trades
-        self.recent_trades: List[Dict[str, Any]] = []
-        self.open_positions: Dict[str, Position] = {}
+        # Lookback window as a ring buffer of columns: row `_idx` is written
+        # next, and once `_count` reaches lookback_trades it overwrites the
+        # oldest trade. Rows [:_count] are always the live window.
+        self._pnl = np.zeros(lookback_trades, dtype=np.float64)
+        self._price = np.zeros(lookback_trades, dtype=np.float64)
+        self._conf = np.zeros(lookback_trades, dtype=np.float64)
+        self._profit_bp = np.zeros(lookback_trades, dtype=np.float64)
+        self._qty = np.zeros(lookback_trades, dtype=np.int64)
+        self._ts = np.zeros(lookback_trades, dtype=np.float64)
+        self._symbols: List[Optional[str]] = [None] * lookback_trades
+        self._sides: List[Optional[str]] = [None] * lookback_trades
+        self._idx = 0
+        self._count = 0
+        self.open_positions = PositionBook()
+        # Derived from the window; cleared whenever a trade is recorded
+        self._thresholds_cache: Optional[Dict[str, float]] = None
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        # Running win count and P&L sum over the window for the O(1)
+        # win-rate / average used by the adaptive thresholds
+        self._wins = 0
+        self._pnl_sum = 0.0
         
         logger.info(
             "Profit Optimizer initialized",
             extra={"lookback_trades": lookback_trades}
         )
     
+    def _window_rows(self):
+        """Ring-buffer row indices of the window, oldest first."""
+        n = self._count
+        if n < self.lookback_trades:
+            return range(n)
+        return [*range(self._idx, n), *range(self._idx)]
+    
+    @property
+    def recent_trades(self) -> List[Trade]:
+        """Trades in the lookback window, oldest first (built on access)."""
+        rows = self._window_rows()
+        return [
+            Trade(
+                self._symbols[i],
+                self._sides[i],
+                int(self._qty[i]),
+                float(self._price[i]),
+                float(self._conf[i]),
+                float(self._profit_bp[i]),
+                float(self._pnl[i]),
+                float(self._ts[i]),
+            )
+            for i in rows
+        ]
+    
     def record_trade(self, symbol: str, side: str, qty: int, price: float,
                      confidence: float = 0.5, expected_profit_bp: float = 0.0,
                      pnl: Optional[float] = None):
         """Record a completed trade for win-rate calculation."""
-        trade = {
-            "symbol": symbol,
-            "side": side,
-            "qty": qty,
-            "price": price,
-            "confidence": confidence,
-            "expected_profit_bp": expected_profit_bp,
-            "pnl": pnl if pnl is not None else 0.0,
-            "timestamp": datetime.now().isoformat(),
-        }
+        if self.lookback_trades <= 0:
+            return
+        pnl = pnl if pnl is not None else 0.0
+        i = self._idx
+        if self._count == self.lookback_trades:
+            self._count -= 1
+            self._remove_pnl(float(self._pnl[i]))
         
-        self.recent_trades.append(trade)
+        self._pnl[i] = pnl
+        self._price[i] = price
+        self._conf[i] = confidence
+        self._profit_bp[i] = expected_profit_bp
+        self._qty[i] = qty
+        self._ts[i] = time.time()
+        self._symbols[i] = symbol
+        self._sides[i] = side
         
-        # Keep only lookback window
-        if len(self.recent_trades) > self.lookback_trades:
-            self.recent_trades.pop(0)
+        self._count += 1
+        self._add_pnl(pnl)
+        self._idx = (i + 1) % self.lookback_trades
+        self._thresholds_cache = None
+        self._summary_cache = None
+    
+    def _add_pnl(self, pnl: float) -> None:
+        self._wins += pnl > 0
+        self._pnl_sum += pnl
+    
+    def _remove_pnl(self, pnl: float) -> None:
+        self._wins -= pnl > 0
+        self._pnl_sum -= pnl
     
     def get_win_rate(self) -> float:
         """Calculate win rate from recent trades."""
-        if not self.recent_trades:
+        if not self._count:
             return 0.5
         
-        winning = sum(1 for t in self.recent_trades if t["pnl"] > 0)
-        return winning / len(self.recent_trades)
+        return self._wins / self._count
     
     def get_average_pnl_per_trade(self) -> float:
         """Calculate average P&L per trade."""
-        if not self.recent_trades:
+        if not self._count:
             return 0.0
         
-        total_pnl = sum(t["pnl"] for t in self.recent_trades)
-        return total_pnl / len(self.recent_trades)
+        return self._pnl_sum / self._count
     
     def calculate_adaptive_thresholds(self) -> Dict[str, float]:
         """Calculate adaptive confidence/profit thresholds based on recent performance.
@@ -133,6 +434,13 @@ class ProfitOptimizer:
         Returns:
             Dict with adjusted thresholds
         """
+        return dict(self._thresholds())
+    
+    def _thresholds(self) -> Dict[str, float]:
+        """Cached thresholds dict shared by callers; do not mutate."""
+        if self._thresholds_cache is not None:
+            return self._thresholds_cache
+        
         win_rate = self.get_win_rate()
         avg_pnl = self.get_average_pnl_per_trade()
         
@@ -140,25 +448,17 @@ class ProfitOptimizer:
         base_confidence = 0.60
         base_profit_bp = 3.0
         
-        if win_rate < 0.45:  # Poor performance
-            confidence_threshold = base_confidence + 0.15
-            profit_bp_threshold = base_profit_bp + 3.0
-        elif win_rate < 0.50:  # Below breakeven
-            confidence_threshold = base_confidence + 0.10
-            profit_bp_threshold = base_profit_bp + 2.0
-        elif win_rate < 0.55:  # Slightly below breakeven
-            confidence_threshold = base_confidence + 0.05
-            profit_bp_threshold = base_profit_bp + 1.0
-        else:  # Good or breakeven performance
-            confidence_threshold = base_confidence
-            profit_bp_threshold = base_profit_bp
+        band = bisect.bisect_right(_WIN_RATE_EDGES, win_rate)
+        confidence_threshold = base_confidence + _CONF_ADJ[band]
+        profit_bp_threshold = base_profit_bp + _BP_ADJ[band]
         
-        return {
+        self._thresholds_cache = {
             "confidence_threshold": min(confidence_threshold, 0.90),
             "profit_bp_threshold": profit_bp_threshold,
             "win_rate": win_rate,
             "avg_pnl_per_trade": avg_pnl,
         }
+        return self._thresholds_cache
     
     def calculate_position_stops(
         self,
@@ -168,6 +468,9 @@ class ProfitOptimizer:
         qty: int,
         risk_percent: float = 2.0,  # 2% max loss per trade
         profit_target_bp: float = 5.0,  # Target 5bp profit
+        *,
+        risk_frac: Optional[float] = None,
+        profit_frac: Optional[float] = None,
     ) -> Tuple[float, float]:
         """Calculate stop-loss and take-profit prices for a position.
         
@@ -178,13 +481,21 @@ class ProfitOptimizer:
             qty: Quantity
             risk_percent: Max risk as % of portfolio (2% = 0.02)
             profit_target_bp: Target profit in basis points
+            risk_frac: `risk_percent` already divided by 100 (e.g.
+                StrategyConfig.risk_frac); overrides `risk_percent`
+            profit_frac: `profit_target_bp` already divided by 10000 (e.g.
+                StrategyConfig.profit_frac); overrides `profit_target_bp`
         
         Returns:
             (stop_loss_price, take_profit_price)
         """
-        # Convert basis points to absolute dollar amount
-        profit_target_dollars = (profit_target_bp / 10000.0) * entry_price
-        risk_dollars = (risk_percent / 100.0) * entry_price
+        if risk_frac is None:
+            risk_frac = risk_percent / 100.0
+        if profit_frac is None:
+            profit_frac = profit_target_bp / 10000.0
+        # Convert fractions to absolute dollar amounts
+        profit_target_dollars = profit_frac * entry_price
+        risk_dollars = risk_frac * entry_price
         
         if side == "BUY":
             stop_loss = entry_price - risk_dollars
@@ -195,6 +506,30 @@ class ProfitOptimizer:
         
         return stop_loss, take_profit
     
+    def calculate_position_stops_batch(
+        self,
+        entry_prices: np.ndarray,
+        side_signs: np.ndarray,
+        risk_percent: float = 2.0,
+        profit_target_bp: float = 5.0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized `calculate_position_stops` for a basket of entries.
+        
+        Args:
+            entry_prices: Entry price per position
+            side_signs: +1 for BUY, -1 for SELL (e.g. Position.side_sign)
+            risk_percent: Max risk as % of entry price
+            profit_target_bp: Target profit in basis points
+        
+        Returns:
+            (stop_loss_prices, take_profit_prices) arrays
+        """
+        entry = np.asarray(entry_prices, dtype=np.float64)
+        sign = np.asarray(side_signs, dtype=np.float64)
+        risk = (risk_percent / 100.0) * entry
+        profit = (profit_target_bp / 10000.0) * entry
+        return entry - sign * risk, entry + sign * profit
+    
     def should_take_trade(
         self,
         symbol: str,
@@ -206,7 +541,14 @@ class ProfitOptimizer:
         Returns:
             (should_trade, reason_if_not)
         """
-        thresholds = self.calculate_adaptive_thresholds()
+        # Cheap floors below every adaptive threshold: reject without
+        # touching trade history
+        if expected_profit_bp <= 0.0:
+            return False, "non_positive_profit"
+        if confidence < 0.50:
+            return False, "below_floor_confidence"
+        
+        thresholds = self._thresholds()
         
         if confidence < thresholds["confidence_threshold"]:
             return False, f"low_confidence (need {thresholds['confidence_threshold']:.2f}, got {confidence:.2f})"
@@ -218,7 +560,12 @@ class ProfitOptimizer:
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get summary statistics of recent trading."""
-        if not self.recent_trades:
+        if self._summary_cache is None:
+            self._summary_cache = self._compute_performance_summary()
+        return dict(self._summary_cache)
+    
+    def _compute_performance_summary(self) -> Dict[str, Any]:
+        if not self._count:
             return {
                 "total_trades": 0,
                 "win_rate": 0.0,
@@ -228,30 +575,67 @@ class ProfitOptimizer:
                 "worst_trade": 0.0,
             }
         
-        pnls = [t["pnl"] for t in self.recent_trades]
-        winning = sum(1 for p in pnls if p > 0)
+        # Exact reductions over the live P&L column (order is irrelevant),
+        # rather than the running counters used on the signal path
+        n = self._count
+        pnls = self._pnl[:n]
+        wins = int(np.count_nonzero(pnls > 0))
         
         return {
-            "total_trades": len(self.recent_trades),
-            "win_rate": winning / len(self.recent_trades),
-            "avg_pnl": statistics.mean(pnls),
-            "total_pnl": sum(pnls),
-            "best_trade": max(pnls),
-            "worst_trade": min(pnls),
-            "std_dev_pnl": statistics.stdev(pnls) if len(pnls) > 1 else 0.0,
+            "total_trades": n,
+            "win_rate": wins / n,
+            "avg_pnl": float(pnls.mean()),
+            "total_pnl": float(pnls.sum()),
+            "best_trade": float(pnls.max()),
+            "worst_trade": float(pnls.min()),
+            "std_dev_pnl": float(pnls.std(ddof=1)) if n > 1 else 0.0,
         }
     
+    def _trade_records(self) -> List[Dict[str, Any]]:
+        """Window as Trade.to_dict() records, built straight from the columns.
+        
+        Timestamps are only formatted here, at serialization time.
+        """
+        rows = list(self._window_rows())
+        if not rows:
+            return []
+        qty = self._qty[rows].tolist()
+        price = self._price[rows].tolist()
+        conf = self._conf[rows].tolist()
+        profit_bp = self._profit_bp[rows].tolist()
+        pnl = self._pnl[rows].tolist()
+        ts = self._ts[rows].tolist()
+        fromtimestamp = datetime.fromtimestamp
+        return [
+            {
+                "symbol": self._symbols[r],
+                "side": self._sides[r],
+                "qty": qty[k],
+                "price": price[k],
+                "confidence": conf[k],
+                "expected_profit_bp": profit_bp[k],
+                "pnl": pnl[k],
+                "timestamp": fromtimestamp(ts[k], _UTC).isoformat(),
+            }
+            for k, r in enumerate(rows)
+        ]
+    
     def save_performance_log(self, output_path: Path):
         """Save performance metrics to disk."""
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         summary = self.get_performance_summary()
-        summary["trades"] = self.recent_trades
+        summary["trades"] = self._trade_records()
         
-        with open(output_path, "w") as f:
-            json.dump(summary, f, indent=2)
+        if orjson is not None:
+            output_path.write_bytes(
+                orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            )
+        else:
+            with open(output_path, "w") as f:
+                json.dump(summary, f, indent=2)
         
         logger.info(
             "Performance log saved",
-            extra={"path": str(output_path), "trades": len(self.recent_trades)}
+            extra={"path": str(output_path), "trades": self._count}
         )
@@ -5,13 +5,40 @@ a unified interface for accessing strategy parameters across different
 timeframes (intraday, swing, weekly, monthly).
 """
 
+import functools
 from pathlib import Path
 from typing import Dict, Any, Optional
-import yaml
 
 
 class StrategyConfig:
-    """Trading strategy configuration."""
+    """Trading strategy configuration.
+    
+    Read-only once constructed: StrategyManager hands the same instance to
+    every caller, so attribute assignment raises AttributeError.
+    """
+    
+    __slots__ = (
+        "name",
+        "description",
+        "data_interval",
+        "lookback_days",
+        "ma_fast_period",
+        "ma_slow_period",
+        "min_cooldown_minutes",
+        "max_holding_hours",
+        "position_exit_before_close",
+        "min_cooldown_seconds",
+        "max_holding_seconds",
+        "min_confidence",
+        "min_profit_bp",
+        "risk_percent",
+        "max_positions",
+        "risk_frac",
+        "profit_frac",
+        "description_detail",
+        "_dict_cache",
+        "_frozen",
+    )
     
     def __init__(self, config_dict: Dict[str, Any]):
         """Initialize strategy config from dictionary.
@@ -34,6 +61,9 @@ class StrategyConfig:
         self.min_cooldown_minutes = execution.get("min_cooldown_minutes", 5)
         self.max_holding_hours = execution.get("max_holding_hours", 6)
         self.position_exit_before_close = execution.get("position_exit_before_close", 30)
+        # Derived once; the config is read-only after construction
+        self.min_cooldown_seconds = self.min_cooldown_minutes * 60.0
+        self.max_holding_seconds = self.max_holding_hours * 3600.0
         
         # Risk settings
         risk = config_dict.get("risk", {})
@@ -41,21 +71,37 @@ class StrategyConfig:
         self.min_profit_bp = risk.get("min_profit_bp", 3.0)
         self.risk_percent = risk.get("risk_percent", 1.0)
         self.max_positions = risk.get("max_positions", 3)
+        # Normalized forms for ProfitOptimizer.calculate_position_stops
+        self.risk_frac = self.risk_percent / 100.0
+        self.profit_frac = self.min_profit_bp / 10000.0
         
         self.description_detail = config_dict.get("description_detail", "")
+        self._dict_cache = self._build_dict()
+        self._frozen = True
     
-    @property
-    def min_cooldown_seconds(self) -> float:
-        """Get minimum cooldown in seconds."""
-        return self.min_cooldown_minutes * 60.0
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"StrategyConfig is read-only (cannot set {name!r})")
+        object.__setattr__(self, name, value)
     
-    @property
-    def max_holding_seconds(self) -> float:
-        """Get maximum holding time in seconds."""
-        return self.max_holding_hours * 3600.0
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"StrategyConfig is read-only (cannot delete {name!r})")
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert strategy config to dictionary."""
+        """Convert strategy config to dictionary.
+        
+        Returns a fresh copy of the dict rendered at construction, so
+        callers may modify it.
+        """
+        cache = self._dict_cache
+        return {
+            **cache,
+            "timeframe": dict(cache["timeframe"]),
+            "execution": dict(cache["execution"]),
+            "risk": dict(cache["risk"]),
+        }
+    
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "name": self.name,
             "description": self.description,
@@ -105,11 +151,20 @@ class StrategyManager:
     
     def _load_strategies(self):
         """Load strategies from YAML file."""
+        # PyYAML is only needed here; importing it lazily keeps it off the
+        # import path of modules that just reference StrategyConfig.
+        import yaml
+        try:
+            # libyaml-backed loader, much faster when PyYAML was built with it
+            from yaml import CSafeLoader as _Loader
+        except ImportError:
+            from yaml import SafeLoader as _Loader
+        
         if not self.config_path.exists():
             raise FileNotFoundError(f"Strategy config not found: {self.config_path}")
         
         with open(self.config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_Loader)
         
         # Load each strategy
         strategies_config = config.get("strategies", {})
@@ -126,6 +181,12 @@ class StrategyManager:
             # Fallback to first strategy if default not found
             self.default_strategy = list(self.strategies.keys())[0]
     
+    def reload(self) -> None:
+        """Re-read the config file and drop managers cached by load_strategy."""
+        self.strategies = {}
+        self._load_strategies()
+        _get_manager.cache_clear()
+    
     def get_strategy(self, name: Optional[str] = None) -> StrategyConfig:
         """Get strategy configuration by name.
         
@@ -167,6 +228,12 @@ class StrategyManager:
         return self.get_strategy(self.default_strategy)
 
 
+@functools.lru_cache(maxsize=8)
+def _get_manager(path_str: str) -> StrategyManager:
+    """Shared StrategyManager per resolved config path ("" = default)."""
+    return StrategyManager(path_str or None)
+
+
 def load_strategy(strategy_name: Optional[str] = None,
                  config_path: Optional[str] = None) -> StrategyConfig:
     """Convenience function to load a strategy.
@@ -176,6 +243,9 @@ def load_strategy(strategy_name: Optional[str] = None,
                       If None, uses default.
         config_path: Path to config file. If None, uses default.
     
+    The parsed config is cached per path; call `StrategyManager.reload()`
+    to pick up edits to the file.
+    
     Returns:
         StrategyConfig object
     
@@ -184,7 +254,7 @@ def load_strategy(strategy_name: Optional[str] = None,
         >>> print(strategy.data_interval)  # "1h"
         >>> print(strategy.ma_fast_period)  # 10
     """
-    manager = StrategyManager(config_path)
+    manager = _get_manager(str(Path(config_path).resolve()) if config_path else "")
     return manager.get_strategy(strategy_name)
 
 
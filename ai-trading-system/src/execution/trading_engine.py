@@ -20,12 +20,20 @@ Or use the runner:
     python scripts/run_live_trading.py --market-data data/market_data.jsonl --signals data/signals.jsonl
 """
 
+import atexit
+import itertools
 import json
+import logging
+import os
+import struct
 import time
-from datetime import datetime
+import weakref
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Iterator, List, Optional, Callable
+from dataclasses import dataclass
+
+import numpy as np
 
 from src.execution.mock_alpaca import MockAlpacaClient
 from src.execution.account_persistence import AccountStateManager
@@ -37,10 +45,69 @@ except ImportError:
     # Strategy config is optional for backward compatibility
     StrategyConfig = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger("trading_engine")
 
+# JSONL log lines are buffered in memory and written out after this many
+# records or this many seconds, whichever comes first.
+_FLUSH_EVERY = 64
+_FLUSH_INTERVAL_SEC = 1.0
+
+# Mark-to-market is recomputed at most once a second unless a price has
+# moved by more than this fraction since it was last marked.
+_MTM_INTERVAL_SEC = 1.0
+_MTM_MIN_MOVE = 0.0005
+
+# Every equity update is appended to a binary sidecar as one fixed-size
+# (time_ns, portfolio_value, update code) record; the JSONL logs keep every
+# INIT/TRADE snapshot but only every Nth TICK.
+_FULL_SNAPSHOT_INTERVAL = 10
+_UPDATE_CODES = {"INIT": 0, "TICK": 1, "TRADE": 2}
+_EQUITY_RECORD = struct.Struct("<qdB")
+EQUITY_RECORD_DTYPE = np.dtype([("ts_ns", "<i8"), ("pv", "<f8"), ("code", "u1")])
+
+# During a replay, runs of bars without signals are marked to market at
+# most once per this many bars (always before a signal and at the end)
+_REPLAY_MARK_EVERY = 256
+
+# Sentinel (timestamp, signal) pair for an exhausted signal stream; the
+# timestamp sorts after any ISO-8601 string so the merge never consumes it
+_NO_SIGNAL = ("\uffff", None)
+
+# Cached position states are resynced with the broker this often (signals)
+_RECONCILE_EVERY = 100
 
-@dataclass
+# Live engines; one exit hook writes out and closes their logs without
+# keeping the engines alive
+_open_engines: "weakref.WeakSet[LiveTradingEngine]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_engine_logs() -> None:
+    for engine in list(_open_engines):
+        engine.close_logs()
+
+
+if orjson is not None:
+    def _jsonl(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    def _jsonl(record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record) + "\n").encode("utf-8")
+
+
+def _position_state(position) -> str:
+    """Map a broker position (or None) to "FLAT", "LONG" or "SHORT"."""
+    if position is None or position.qty == 0:
+        return "FLAT"
+    return "LONG" if position.qty > 0 else "SHORT"
+
+
+@dataclass(slots=True, frozen=True)
 class MarketTick:
     """Single market data point."""
     timestamp: str
@@ -77,7 +144,8 @@ class LiveTradingEngine:
         min_confidence: float = 0.6,
         min_profit_bp: float = 3.0,
         risk_percent: float = 1.0,
-        strategy: Optional[Any] = None  # StrategyConfig or None (using Any for type compatibility)
+        strategy: Optional[Any] = None,  # StrategyConfig or None (using Any for type compatibility)
+        sync_fills: bool = True,
     ):
         """Initialize trading engine with profit optimization.
         
@@ -89,6 +157,8 @@ class LiveTradingEngine:
             min_profit_bp: Minimum expected profit in basis points. Default 3bp
             risk_percent: Risk per trade as % of portfolio. Default 1.0%
             strategy: Optional StrategyConfig object. If provided, overrides individual params.
+            sync_fills: Fill simulated orders inside submit_order (no fill delay or
+                polling). False keeps the 0.1s simulated delay and waits for the fill.
         """
         self.initial_cash = initial_cash
         self.output_dir = Path(output_dir)
@@ -110,17 +180,9 @@ class LiveTradingEngine:
             self.risk_percent = risk_percent
             self.min_cooldown_seconds = 300.0  # Default 5 minutes
         
-        # Profit optimization parameters (use strategy values if provided, otherwise use args)
-        if strategy:
-            self.min_confidence = strategy.min_confidence
-            self.min_profit_bp = strategy.min_profit_bp
-            self.risk_percent = strategy.risk_percent
-            self.min_cooldown_seconds = strategy.min_cooldown_seconds
-        else:
-            self.min_confidence = min_confidence
-            self.min_profit_bp = min_profit_bp
-            self.risk_percent = risk_percent
-            self.min_cooldown_seconds = 300.0  # Default 5 minutes
+        # Per-signal sizing uses these as fractions; fixed for the engine's lifetime
+        self._risk_frac = self.risk_percent / 100.0
+        self._min_profit_frac = self.min_profit_bp / 10000.0
         
         # Account persistence - load saved state first
         self.account_state_manager = AccountStateManager(output_dir / "account_state.json")
@@ -144,21 +206,46 @@ class LiveTradingEngine:
         self.session_start_trades = self.account_state_manager.get_lifetime_trades()
         
         # Trading state - use persisted cash
-        self.client = MockAlpacaClient(initial_cash=actual_cash, fill_delay_sec=0.1)
+        self.sync_fills = sync_fills
+        if sync_fills:
+            self.client = MockAlpacaClient(initial_cash=actual_cash, fill_delay_sec=0.0, instant_fill=True)
+        else:
+            self.client = MockAlpacaClient(initial_cash=actual_cash, fill_delay_sec=0.1)
         self.account = self.client.get_account()
         
         # Output files
         self.equity_log = self.output_dir / "live_trading_equity.jsonl"
         self.trades_log = self.output_dir / "live_trading_trades.jsonl"
         self.updates_log = self.output_dir / "live_trading_updates.jsonl"
+        self.equity_bin = self.output_dir / "live_trading_equity.bin"
+        # Append-only fds plus per-file pending lines; each flush is one
+        # os.write per file, and O_APPEND keeps concurrent readers line-aligned
+        self._log_paths = (self.equity_log, self.trades_log, self.updates_log, self.equity_bin)
+        self._log_buffers: List[List[bytes]] = [[] for _ in self._log_paths]
+        self._log_fds: List[int] = []
+        self._equity_lines = self._log_buffers[0]
+        self._trades_lines = self._log_buffers[1]
+        self._updates_lines = self._log_buffers[2]
+        self._equity_records = self._log_buffers[3]
+        self._tick_updates = 0
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+        self._iso_sec = -1
+        self._iso_prefix = ""
+        self._open_logs()
         
         # State
         self.current_prices: Dict[str, float] = {}
         self.last_update_time = 0.0
+        self._marked_prices: Dict[str, float] = {}
+        self._last_mtm_time = 0.0
         self.update_count = 0
         self.trades_count = 0
         self.last_trade_time = {}  # Track last trade time per symbol
         self.position_state: Dict[str, str] = {}  # Track position state per symbol: "FLAT", "LONG", "SHORT"
+        self._signals_seen = 0
+        self._pos_by_sym: Dict[str, Any] = {}
+        self._positions_key: Optional[int] = None  # trades_count when _pos_by_sym was built
         
         # Record initial state
         self._record_equity_update("INIT")
@@ -194,20 +281,12 @@ class LiveTradingEngine:
                 return False
             
             # CRITICAL: Position-aware filtering - prevent churning
-            # Get current position state from broker
-            positions = self.client.get_positions()
-            current_position = next((p for p in positions if p.symbol == symbol), None)
-            
-            # Determine current state: FLAT, LONG, or SHORT
-            if current_position and current_position.qty > 0:
-                current_state = "LONG"
-            elif current_position and current_position.qty < 0:
-                current_state = "SHORT"
-            else:
-                current_state = "FLAT"
-            
-            # Cache the state
-            self.position_state[symbol] = current_state
+            # State is cached per symbol, set from the broker after each fill and
+            # reconciled against the broker every _RECONCILE_EVERY signals
+            self._signals_seen += 1
+            if self._signals_seen % _RECONCILE_EVERY == 0:
+                self._reconcile_positions()
+            current_state = self.position_state.get(symbol, "FLAT")
             
             # FILTER 0: Position State Machine - only trade on position transitions
             # LONG state: ignore BUY signals (already long), only accept SELL to exit
@@ -215,30 +294,33 @@ class LiveTradingEngine:
             # FLAT state: accept both BUY (enter long) and SELL (enter short)
             
             if current_state == "LONG" and action == "BUY":
-                logger.debug("Signal filtered - already LONG, ignoring BUY signal", extra={
-                    "symbol": symbol,
-                    "current_state": current_state,
-                    "signal_action": action
-                })
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug("Signal filtered - already LONG, ignoring BUY signal", extra={
+                        "symbol": symbol,
+                        "current_state": current_state,
+                        "signal_action": action
+                    })
                 return False
             
             if current_state == "SHORT" and action == "SELL":
-                logger.debug("Signal filtered - already SHORT, ignoring SELL signal", extra={
-                    "symbol": symbol,
-                    "current_state": current_state,
-                    "signal_action": action
-                })
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug("Signal filtered - already SHORT, ignoring SELL signal", extra={
+                        "symbol": symbol,
+                        "current_state": current_state,
+                        "signal_action": action
+                    })
                 return False
             
             # FILTER 1: Signal Confidence Check (optional field, defaults to 0.5)
             confidence = signal.get("confidence", 0.50)
             # Only skip if confidence is explicitly provided AND below threshold
             if "confidence" in signal and confidence < self.min_confidence:
-                logger.debug("Signal filtered - low confidence", extra={
-                    "symbol": symbol,
-                    "confidence": confidence,
-                    "min_required": self.min_confidence
-                })
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug("Signal filtered - low confidence", extra={
+                        "symbol": symbol,
+                        "confidence": confidence,
+                        "min_required": self.min_confidence
+                    })
                 return False
             
             # FILTER 2: Minimum Profit Edge Check (optional field, defaults to 0 = accept all)
@@ -246,11 +328,12 @@ class LiveTradingEngine:
             expected_profit_bp = expected_profit_pct * 10000
             # Only skip if explicitly provided AND below threshold
             if "expected_profit" in signal and expected_profit_bp < self.min_profit_bp:
-                logger.debug("Signal filtered - insufficient profit edge", extra={
-                    "symbol": symbol,
-                    "expected_profit_bp": expected_profit_bp,
-                    "min_required_bp": self.min_profit_bp
-                })
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug("Signal filtered - insufficient profit edge", extra={
+                        "symbol": symbol,
+                        "expected_profit_bp": expected_profit_bp,
+                        "min_required_bp": self.min_profit_bp
+                    })
                 return False
             
             # FILTER 3: Trade Frequency Limit (prevent over-trading same symbol)
@@ -259,17 +342,19 @@ class LiveTradingEngine:
             if symbol in self.last_trade_time:
                 time_since_last = current_time - self.last_trade_time[symbol]
                 if time_since_last < min_time_between_trades:
-                    logger.debug("Signal filtered - too frequent", extra={
-                        "symbol": symbol,
-                        "time_since_last_minutes": time_since_last / 60.0,
-                        "min_required_minutes": min_time_between_trades / 60.0
-                    })
+                    if logger.is_enabled_for(logging.DEBUG):
+                        logger.debug("Signal filtered - too frequent", extra={
+                            "symbol": symbol,
+                            "time_since_last_minutes": time_since_last / 60.0,
+                            "min_required_minutes": min_time_between_trades / 60.0
+                        })
                     return False
             
             # FILTER 4: Dynamic Position Sizing (Risk-based)
-            portfolio_value = self.client.get_account().portfolio_value
-            risk_amount = portfolio_value * (self.risk_percent / 100.0)
-            max_loss_per_share = current_price * (self.min_profit_bp / 10000.0)
+            self.account = self.client.get_account()
+            portfolio_value = self.account.portfolio_value
+            risk_amount = portfolio_value * self._risk_frac
+            max_loss_per_share = current_price * self._min_profit_frac
             
             # Safety: Ensure max_loss_per_share is above minimum threshold
             min_loss_threshold = current_price * 0.0001  # Minimum 1 basis point
@@ -285,11 +370,12 @@ class LiveTradingEngine:
             qty = min(qty, max_shares)
             
             if qty <= 0:
-                logger.debug("Signal filtered - insufficient capital for risk", extra={
-                    "symbol": symbol,
-                    "portfolio_value": portfolio_value,
-                    "risk_percent": self.risk_percent
-                })
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug("Signal filtered - insufficient capital for risk", extra={
+                        "symbol": symbol,
+                        "portfolio_value": portfolio_value,
+                        "risk_percent": self.risk_percent
+                    })
                 return False
             
             # For BUY: check buying power
@@ -305,8 +391,7 @@ class LiveTradingEngine:
             
             # For SELL: check if we have the position
             elif action == "SELL":
-                positions = self.client.get_positions()
-                pos = next((p for p in positions if p.symbol == symbol), None)
+                pos = self._find_position(symbol)
                 if not pos or pos.qty < qty:
                     logger.warning("Insufficient position to sell", extra={
                         "symbol": symbol,
@@ -327,44 +412,31 @@ class LiveTradingEngine:
                 time_in_force="day"
             )
             
-            # Wait for fill (with retries for fill delay simulation)
-            max_attempts = 50  # 50 * 50ms = 2.5 seconds
-            attempt = 0
-            while attempt < max_attempts:
-                filled_order = self.client.get_order(order.id)
-                if filled_order.filled_qty > 0 or filled_order.status == "filled":
-                    self.trades_count += 1
-                    self.last_trade_time[symbol] = current_time
-                    self._record_trade(filled_order, signal)
-                    self._record_equity_update("TRADE")
-                    
-                    # Update position state after trade
-                    if action == "BUY":
-                        # BUY from FLAT = LONG, BUY from SHORT = FLAT (cover)
-                        new_state = "LONG" if current_state in ["FLAT", "SHORT"] else "LONG"
-                    else:  # SELL
-                        # SELL from FLAT = SHORT, SELL from LONG = FLAT (exit)
-                        new_state = "SHORT" if current_state == "FLAT" else "FLAT"
-                    
-                    self.position_state[symbol] = new_state
-                    
-                    logger.info("Trade executed", extra={
-                        "symbol": symbol,
-                        "action": action,
-                        "qty": filled_order.filled_qty,
-                        "price": filled_order.filled_avg_price,
-                        "confidence": confidence,
-                        "expected_profit_bp": expected_profit_bp,
-                        "position_transition": f"{current_state} -> {new_state}"
-                    })
-                    
-                    return True
+            filled_order = self._await_fill(order)
+            if filled_order is not None:
+                self.trades_count += 1
+                self.last_trade_time[symbol] = current_time
+                self.account = self.client.get_account()
+                self._record_trade(filled_order, signal)
+                self._record_equity_update("TRADE")
+                
+                # Update position state after trade (FLAT -> LONG, LONG -> FLAT, ...)
+                new_state = _position_state(self._find_position(symbol))
+                self.position_state[symbol] = new_state
                 
-                # Brief sleep before retry
-                time.sleep(0.05)
-                attempt += 1
+                logger.info("Trade executed", extra={
+                    "symbol": symbol,
+                    "action": action,
+                    "qty": filled_order.filled_qty,
+                    "price": filled_order.filled_avg_price,
+                    "confidence": confidence,
+                    "expected_profit_bp": expected_profit_bp,
+                    "position_transition": f"{current_state} -> {new_state}"
+                })
+                
+                return True
             
-            # Order not filled after timeout
+            # Order not filled (rejected, or still pending after the timeout)
             logger.warning("Order did not fill within timeout", extra={
                 "symbol": symbol,
                 "action": action,
@@ -380,6 +452,48 @@ class LiveTradingEngine:
         
         return False
     
+    def _await_fill(self, order):
+        """Return the filled order, or None if it was rejected or timed out.
+        
+        With sync_fills the client fills inside submit_order, so one lookup
+        suffices; otherwise poll while the simulated fill delay elapses.
+        """
+        if self.sync_fills:
+            filled_order = self.client.get_order(order.id)
+            if filled_order.filled_qty > 0 or filled_order.status == "filled":
+                return filled_order
+            return None
+        
+        # Wait for fill (with retries for fill delay simulation)
+        max_attempts = 50  # 50 * 50ms = 2.5 seconds
+        for _ in range(max_attempts):
+            filled_order = self.client.get_order(order.id)
+            if filled_order.filled_qty > 0 or filled_order.status == "filled":
+                return filled_order
+            if filled_order.status in ("rejected", "canceled"):
+                return None
+            # Brief sleep before retry
+            time.sleep(0.05)
+        return None
+    
+    def _find_position(self, symbol: str):
+        """Current broker position for `symbol`, or None if flat."""
+        return self._positions_by_symbol().get(symbol)
+    
+    def _reconcile_positions(self) -> None:
+        """Resync the cached position states with a fresh broker snapshot."""
+        self._positions_key = None
+        held = self._positions_by_symbol()
+        for symbol in set(self.position_state) | set(held):
+            self.position_state[symbol] = _position_state(held.get(symbol))
+    
+    def _positions_by_symbol(self) -> Dict[str, Any]:
+        """Broker positions by symbol, re-fetched only after this engine records a fill."""
+        if self._positions_key != self.trades_count:
+            self._pos_by_sym = {p.symbol: p for p in self.client.get_positions()}
+            self._positions_key = self.trades_count
+        return self._pos_by_sym
+    
     def update_market_prices(self, market_tick: MarketTick) -> None:
         """Update market prices and recalculate MTM equity.
         
@@ -389,23 +503,43 @@ class LiveTradingEngine:
         Args:
             market_tick: Current market data point
         """
-        # Update price
-        self.current_prices[market_tick.symbol] = market_tick.close
+        self.update_price(market_tick.symbol, market_tick.close)
+    
+    def update_price(self, symbol: str, price: float) -> None:
+        """Mark `symbol` at `price`; the primitive form of update_market_prices.
         
-        # Update account with current prices (MTM)
-        self.client._update_portfolio_value()
-        self.account = self.client.get_account()
+        Repeated prices skip the revaluation, and small moves are marked at
+        most once per second; every call still counts toward the throttled
+        TICK equity record.
+        """
+        now = time.time()
+        # Identical prints leave the portfolio value unchanged
+        if self.current_prices.get(symbol) != price:
+            self.current_prices[symbol] = price
+            
+            # Update account with current prices (MTM), skipping small moves
+            # until the interval elapses
+            marked = self._marked_prices.get(symbol)
+            moved = marked is None or marked == 0 or abs(price - marked) > abs(marked) * _MTM_MIN_MOVE
+            if moved or now - self._last_mtm_time > _MTM_INTERVAL_SEC:
+                self.account = self.client.get_account()  # revalues the portfolio
+                self._marked_prices.update(self.current_prices)
+                self._last_mtm_time = now
         
         # Record update (with throttling to avoid too many writes)
-        now = time.time()
         if now - self.last_update_time > 1.0:  # Max 1 update per second
             self._record_equity_update("TICK")
             self.last_update_time = now
     
+    def update_prices(self, prices: Dict[str, float]) -> None:
+        """Mark several symbols at once (see update_price)."""
+        for symbol, price in prices.items():
+            self.update_price(symbol, price)
+    
     def _record_trade(self, filled_order, signal) -> None:
         """Record a filled trade."""
         trade = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._iso_now(),
             "signal_timestamp": signal.get("timestamp", ""),
             "order_id": filled_order.id,
             "symbol": filled_order.symbol,
@@ -416,28 +550,40 @@ class LiveTradingEngine:
         }
         
         # Append to trades log
-        with self.trades_log.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(trade) + "\n")
+        self._trades_lines.append(_jsonl(trade))
+        self._maybe_flush()
     
     def _record_equity_update(self, update_type: str) -> None:
-        """Record equity snapshot (called on every significant event)."""
+        """Record equity snapshot (called on every significant event).
+        
+        Every update goes to the binary sidecar; TICK updates reach the JSONL
+        logs only every _FULL_SNAPSHOT_INTERVAL calls.
+        """
+        self._equity_records.append(_EQUITY_RECORD.pack(
+            time.time_ns(), self.account.portfolio_value, _UPDATE_CODES.get(update_type, 255)
+        ))
+        if update_type == "TICK":
+            self._tick_updates += 1
+            full = self._tick_updates % _FULL_SNAPSHOT_INTERVAL == 1
+        else:
+            full = True
+        
         snapshot = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._iso_now(),
             "update_type": update_type,
             "cash": round(self.account.cash, 2),
             "portfolio_value": round(self.account.portfolio_value, 2),
             "buying_power": round(self.account.buying_power, 2),
-            "positions": len(self.client.get_positions()),
+            "positions": len(self.client.positions),
             "trades_executed": self.trades_count,
         }
         
-        # Append to equity log
-        with self.equity_log.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(snapshot) + "\n")
-        
-        # Append to updates log (for streaming)
-        with self.updates_log.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(snapshot) + "\n")
+        # Append to equity log and updates log (for streaming)
+        if full:
+            line = _jsonl(snapshot)
+            self._equity_lines.append(line)
+            self._updates_lines.append(line)
+        self._maybe_flush()
         
         # Callback for streaming
         if self.update_callback:
@@ -445,11 +591,67 @@ class LiveTradingEngine:
         
         self.update_count += 1
     
+    def _iso_now(self) -> str:
+        """Current UTC time as ISO-8601 with a "Z" suffix.
+        
+        The date/time part is formatted once per wall-clock second and reused;
+        only the microseconds are filled in per call.
+        """
+        now_ns = time.time_ns()
+        sec, frac_ns = divmod(now_ns, 1_000_000_000)
+        if sec != self._iso_sec:
+            self._iso_sec = sec
+            self._iso_prefix = datetime.fromtimestamp(sec, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{self._iso_prefix}.{frac_ns // 1000:06d}Z"
+    
+    def _maybe_flush(self) -> None:
+        """Flush the JSONL logs once enough records or time have accumulated."""
+        self._pending_writes += 1
+        if (
+            self._pending_writes >= _FLUSH_EVERY
+            or time.monotonic() - self._last_flush >= _FLUSH_INTERVAL_SEC
+        ):
+            self.flush_logs()
+    
+    def _open_logs(self) -> None:
+        self._log_fds = [
+            os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            for path in self._log_paths
+        ]
+        _open_engines.add(self)
+    
+    def flush_logs(self) -> None:
+        """Write buffered JSONL records through to the log files.
+        
+        Records buffered after close_logs() reopen the files, so late
+        writes are never dropped.
+        """
+        if not self._log_fds and any(self._log_buffers):
+            self._open_logs()
+        for fd, lines in zip(self._log_fds, self._log_buffers):
+            if lines:
+                os.write(fd, b"".join(lines))
+                lines.clear()
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+    
+    def close_logs(self) -> None:
+        """Flush and close the JSONL log files (safe to call repeatedly)."""
+        self.flush_logs()
+        for fd in self._log_fds:
+            os.close(fd)
+        self._log_fds = []
+    
+    def __del__(self):
+        # Write out and release the logs of an engine dropped without close_logs()
+        if getattr(self, "_log_fds", None) or any(getattr(self, "_log_buffers", ())):
+            self.close_logs()
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current engine status."""
         positions = self.client.get_positions()
         return {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._iso_now(),
             "cash": round(self.account.cash, 2),
             "portfolio_value": round(self.account.portfolio_value, 2),
             "buying_power": round(self.account.buying_power, 2),
@@ -497,36 +699,90 @@ class LiveTradingEngine:
         })
 
 
-def load_market_data(path: Path) -> List[Dict[str, Any]]:
-    """Load market data from JSONL."""
-    data = []
-    if not path.exists():
-        return data
-    
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            try:
-                data.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    
-    return data
+if orjson is not None:
+    _loads = orjson.loads
+else:
+    _loads = json.loads
 
 
-def load_signals(path: Path) -> List[Dict[str, Any]]:
-    """Load signals from JSONL."""
-    signals = []
+def load_equity_records(path: Path) -> np.ndarray:
+    """Load the binary equity sidecar as a structured array (EQUITY_RECORD_DTYPE).
+    
+    Update codes: 0 = INIT, 1 = TICK, 2 = TRADE. A trailing partial record
+    (the engine is mid-write) is ignored.
+    """
     if not path.exists():
-        return signals
+        return np.empty(0, dtype=EQUITY_RECORD_DTYPE)
+    data = path.read_bytes()
+    usable = len(data) - len(data) % EQUITY_RECORD_DTYPE.itemsize
+    return np.frombuffer(data[:usable], dtype=EQUITY_RECORD_DTYPE)
+
+
+def _iter_jsonl(path: Path, needle: Optional[bytes] = None) -> Iterator[Dict[str, Any]]:
+    """Yield records from a JSONL file one line at a time, skipping bad lines.
     
-    with path.open("r", encoding="utf-8") as f:
+    Lines that do not contain `needle` are skipped without being parsed.
+    """
+    if not path.exists():
+        return
+    with path.open("rb") as f:
         for line in f:
+            if needle is not None and needle not in line:
+                continue
             try:
-                signals.append(json.loads(line))
-            except json.JSONDecodeError:
+                yield _loads(line)
+            except ValueError:  # json/orjson.JSONDecodeError
                 continue
+
+
+def _symbol_needle(symbol: Optional[str]) -> Optional[bytes]:
+    """Byte pattern every JSONL line for `symbol` must contain, if any."""
+    return json.dumps(symbol).encode("utf-8") if symbol else None
+
+
+def _for_symbol(records, symbol: Optional[str]):
+    """Keep only records whose symbol is exactly `symbol` (all if None)."""
+    if symbol is None:
+        return records
+    return (r for r in records if r.get("symbol", "") == symbol)
+
+
+def iter_market_data(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream market data from JSONL."""
+    return _iter_jsonl(path)
+
+
+def iter_signals(path: Path, symbol: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream signals from JSONL, optionally only those for `symbol`."""
+    return _for_symbol(_iter_jsonl(path, _symbol_needle(symbol)), symbol)
+
+
+def _load_jsonl(path: Path, needle: Optional[bytes] = None) -> List[Dict[str, Any]]:
+    """Read a whole JSONL file in one call and parse it, skipping bad lines.
     
-    return signals
+    Lines that do not contain `needle` are skipped without being parsed.
+    """
+    if not path.exists():
+        return []
+    records = []
+    for line in path.read_bytes().split(b"\n"):
+        if not line.strip() or (needle is not None and needle not in line):
+            continue
+        try:
+            records.append(_loads(line))
+        except ValueError:  # json/orjson.JSONDecodeError
+            continue
+    return records
+
+
+def load_market_data(path: Path) -> List[Dict[str, Any]]:
+    """Load market data from JSONL."""
+    return _load_jsonl(path)
+
+
+def load_signals(path: Path, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load signals from JSONL, optionally only those for `symbol`."""
+    return list(_for_symbol(_load_jsonl(path, _symbol_needle(symbol)), symbol))
 
 
 def run_live_trading(
@@ -543,8 +799,8 @@ def run_live_trading(
     """Run live trading simulation with profit optimization and account persistence.
     
     Args:
-        market_data_path: Path to market OHLCV data
-        signals_path: Path to trade signals
+        market_data_path: Path to market OHLCV data (JSONL in timestamp order)
+        signals_path: Path to trade signals (JSONL in timestamp order)
         initial_cash: Starting capital (only used if no saved state exists)
         output_dir: Output directory for logs
         min_confidence: Minimum signal confidence threshold (0-1)
@@ -568,19 +824,32 @@ def run_live_trading(
         starting_capital = initial_cash
         print(f"📊 Starting new account - Initial capital: ${initial_cash:,.2f}")
     
-    # Load data
-    market_data = load_market_data(market_data_path)
-    signals = load_signals(signals_path)
-    
-    if not market_data:
+    # Stream both inputs; each file must already be in timestamp order
+    market_data = iter_market_data(market_data_path)
+    first_tick = next(market_data, None)
+    if first_tick is None:
         print("ERROR: No market data found")
         return None
-    if not signals:
+    probe = iter_signals(signals_path)
+    has_signals = next(probe, None) is not None
+    probe.close()
+    if not has_signals:
         print("ERROR: No signals found")
         return None
     
-    print(f"Market data points: {len(market_data)}")
-    print(f"Signals: {len(signals)}")
+    # Get the primary symbol from market data (use first record's symbol)
+    primary_symbol = first_tick.get("symbol", "SPY")
+    
+    # Only signals matching the primary symbol are traded
+    # Paired with their timestamps so each signal's key is read once; when
+    # none match, next_signal is None and the replay still marks prices
+    signals = (
+        (s.get("timestamp", ""), s)
+        for s in iter_signals(signals_path, symbol=primary_symbol)
+    )
+    next_signal_ts, next_signal = next(signals, _NO_SIGNAL)
+    
+    print(f"Primary symbol: {primary_symbol}")
     print(f"Starting capital: ${starting_capital:,.2f}\n")
     print("Profit Optimization Settings:")
     print(f"  Min Confidence: {min_confidence*100:.1f}%")
@@ -596,82 +865,74 @@ def run_live_trading(
         risk_percent=risk_percent
     )
     
-    # Sort both data streams by timestamp for time-based matching
-    market_data = sorted(market_data, key=lambda x: x.get("timestamp", ""))
-    signals = sorted(signals, key=lambda x: x.get("timestamp", ""))
-    
-    # Get the primary symbol from market data (use first record's symbol)
-    primary_symbol = market_data[0].get("symbol", "SPY") if market_data else "SPY"
-    
-    # Filter signals to only those matching the primary symbol
-    signals = [s for s in signals if s.get("symbol", "") == primary_symbol]
-    
-    print(f"Filtered to {len(signals)} signals for {primary_symbol}")
-    
-    # Process market data tick by tick with signal execution
-    trades_executed = 0
-    signal_idx = 0
-    
-    for i, tick_data in enumerate(market_data):
-        ts = tick_data.get("timestamp", "")
-        symbol = tick_data.get("symbol", "SPY")
-        close = tick_data.get("close", 0.0)
-        
-        # Use current_price if provided (real-time), otherwise use historical bar close
-        execution_price = current_price if current_price is not None else close
-        
-        # Process all signals that occur at or before this timestamp
-        while signal_idx < len(signals):
-            signal = signals[signal_idx]
-            signal_ts = signal.get("timestamp", "")
-            
-            # Only process signals at or before current time
-            if signal_ts <= ts:
-                if engine.process_signal(signal, execution_price):
-                    trades_executed += 1
-                signal_idx += 1
-            else:
-                break
-        
-        # Update market prices (MTM)
-        tick = MarketTick(
-            timestamp=ts,
-            symbol=symbol,
-            open=tick_data.get("open", 0.0),
-            high=tick_data.get("high", 0.0),
-            low=tick_data.get("low", 0.0),
-            close=close,
-            volume=tick_data.get("volume", 0)
-        )
-        engine.update_market_prices(tick)
-    
-    # Final summary
-    status = engine.get_status()
-    
-    print(f"\n{'='*70}")
-    print("Live Trading Complete!")
-    print(f"{'='*70}")
-    print(f"Trades executed: {trades_executed}")
-    print(f"Equity updates: {status['updates_recorded']}")
-    print(f"\nFinal Portfolio:")
-    print(f"  Cash:           ${status['cash']:,.2f}")
-    print(f"  Portfolio Value: ${status['portfolio_value']:,.2f}")
-    print(f"  Buying Power:   ${status['buying_power']:,.2f}")
-    print(f"  Open Positions: {status['positions_count']}")
-    
-    initial_pv = starting_capital
-    final_pv = status['portfolio_value']
-    pnl = final_pv - initial_pv
-    return_pct = (pnl / initial_pv) * 100
-    print(f"\nSession Performance:")
-    print(f"  P&L:    ${pnl:,.2f}")
-    print(f"  Return: {return_pct:+.2f}%")
-    
-    # Save account state for next session
-    if use_persistence:
-        engine.save_account_state()
-        print(f"\n✅ Account state saved for next session")
-    
-    print(f"{'='*70}\n")
+    try:
+        # Process market data tick by tick with signal execution. Bars without a
+        # due signal only move prices, so they are collapsed to the latest close
+        # per symbol and marked when a signal is due, every
+        # _REPLAY_MARK_EVERY bars, and at the end.
+        trades_executed = 0
+        ticks_seen = 0
+        signals_seen = 0
+        pending_marks: Dict[str, float] = {}
+        
+        for tick_data in itertools.chain((first_tick,), market_data):
+            ticks_seen += 1
+            ts = tick_data.get("timestamp", "")
+            close = tick_data.get("close", 0.0)
+        
+            # Process all signals that occur at or before this timestamp
+            if next_signal_ts <= ts:
+                engine.update_prices(pending_marks)
+                pending_marks.clear()
+                # Use current_price if provided (real-time), otherwise use historical bar close
+                execution_price = current_price if current_price is not None else close
+                while next_signal_ts <= ts:
+                    signals_seen += 1
+                    if engine.process_signal(next_signal, execution_price):
+                        trades_executed += 1
+                    next_signal_ts, next_signal = next(signals, _NO_SIGNAL)
+        
+            # Update market prices (MTM), deferred
+            pending_marks[tick_data.get("symbol", "SPY")] = close
+            if ticks_seen % _REPLAY_MARK_EVERY == 0:
+                engine.update_prices(pending_marks)
+                pending_marks.clear()
+        
+        engine.update_prices(pending_marks)
+        
+        # Final summary
+        engine.flush_logs()
+        status = engine.get_status()
+        
+        print(f"\n{'='*70}")
+        print("Live Trading Complete!")
+        print(f"{'='*70}")
+        print(f"Market data points: {ticks_seen}")
+        print(f"Signals processed: {signals_seen}")
+        print(f"Trades executed: {trades_executed}")
+        print(f"Equity updates: {status['updates_recorded']}")
+        print(f"\nFinal Portfolio:")
+        print(f"  Cash:           ${status['cash']:,.2f}")
+        print(f"  Portfolio Value: ${status['portfolio_value']:,.2f}")
+        print(f"  Buying Power:   ${status['buying_power']:,.2f}")
+        print(f"  Open Positions: {status['positions_count']}")
+        
+        initial_pv = starting_capital
+        final_pv = status['portfolio_value']
+        pnl = final_pv - initial_pv
+        return_pct = (pnl / initial_pv) * 100
+        print(f"\nSession Performance:")
+        print(f"  P&L:    ${pnl:,.2f}")
+        print(f"  Return: {return_pct:+.2f}%")
+        
+        # Save account state for next session
+        if use_persistence:
+            engine.save_account_state()
+            print(f"\n✅ Account state saved for next session")
+        
+        print(f"{'='*70}\n")
+    finally:
+        # Later writes to the engine reopen its logs on demand
+        engine.close_logs()
     
     return engine
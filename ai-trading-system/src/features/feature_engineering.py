@@ -4,10 +4,135 @@ Provides a minimal `build_features` function that accepts a list of
 price records (dicts with `timestamp`, `symbol`, `close`) and returns
 a list of feature dicts. This is intentionally small and testable; it
 demonstrates how upstream code should call into feature builders.
+
+Records are grouped by symbol and time-ordered with a single pandas
+sort. Each symbol's closes are then a slice of one float64 array, so
+returns and the rolling mean are computed with whole-array operations,
+or in a single pass by a Numba kernel when numba is installed. Missing
+closes are carried as NaN and turned back into None only when the
+output dicts are assembled.
 """
 
 from typing import List, Dict
 
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+MA_WINDOW = 3
+
+
+def _close_array(recs: List[Dict]) -> np.ndarray:
+    return np.fromiter(
+        (np.nan if r.get("close") is None else float(r.get("close")) for r in recs),
+        dtype=np.float64,
+        count=len(recs),
+    )
+
+
+def _symbol_features(closes: np.ndarray, starts=None, window: int = MA_WINDOW):
+    """Return (returns, rolling_mean) arrays aligned with `closes`.
+
+    `starts` holds the sorted offsets where each symbol's run of closes
+    begins (default: one run). NaN marks undefined entries: the first
+    return of a run, returns across a missing or zero close, and windows
+    with no valid close.
+    """
+    n = len(closes)
+    if starts is None:
+        starts = np.zeros(1, dtype=np.int64)
+    ret = np.full(n, np.nan)
+    if n > 1:
+        prev, cur = closes[:-1], closes[1:]
+        ok = prev != 0.0
+        np.divide(cur - prev, prev, out=ret[1:], where=ok)
+    ret[starts] = np.nan
+
+    # Rolling mean over the valid closes in each trailing window, via the
+    # cumulative-sum trick; windows are clipped to their symbol's run, so
+    # leading windows are simply shorter.
+    idx = np.arange(n)
+    begin = starts[np.searchsorted(starts, idx, side="right") - 1]
+    valid = ~np.isnan(closes)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, closes, 0.0))))
+    ccnt = np.concatenate(([0], np.cumsum(valid)))
+    lo = np.maximum(idx + 1 - window, begin)
+    sums = csum[1:] - csum[lo]
+    counts = ccnt[1:] - ccnt[lo]
+    ma = np.full(n, np.nan)
+    np.divide(sums, counts, out=ma, where=counts > 0)
+    return ret, ma
+
+
+if njit is not None:
+    # fastmath is deliberately off: it lets LLVM assume no NaNs, and NaN is
+    # the missing-value sentinel here.
+    @njit(cache=True)
+    def _features_kernel(closes, starts, window, ret_out, ma_out):
+        nan = np.nan
+        running = 0.0
+        count = 0
+        begin = 0
+        seg = 0
+        for i in range(closes.shape[0]):
+            if seg < starts.shape[0] and i == starts[seg]:
+                # New symbol: restart the running window
+                begin = i
+                running = 0.0
+                count = 0
+                seg += 1
+            c = closes[i]
+            if c == c:
+                running += c
+                count += 1
+            if i - window >= begin:
+                old = closes[i - window]
+                if old == old:
+                    running -= old
+                    count -= 1
+            ma_out[i] = running / count if count > 0 else nan
+            if i == begin:
+                ret_out[i] = nan
+            else:
+                prev = closes[i - 1]
+                ret_out[i] = (c - prev) / prev if prev != 0.0 else nan
+
+    def _compute_features(closes: np.ndarray, starts=None, window: int = MA_WINDOW):
+        if starts is None:
+            starts = np.zeros(1, dtype=np.int64)
+        ret = np.empty_like(closes)
+        ma = np.empty_like(closes)
+        _features_kernel(closes, starts, window, ret, ma)
+        return ret, ma
+
+else:
+    _compute_features = _symbol_features
+
+
+def _group_order(records: List[Dict]):
+    """Return (order, starts) grouping `records` by symbol.
+
+    `order` lists record indices with symbols in first-seen order and each
+    symbol's rows sorted by timestamp (stable, so ties keep input order);
+    `starts` are the positions in `order` where each symbol begins.
+    """
+    codes, _ = pd.factorize(
+        pd.Series([r.get("symbol") for r in records], dtype=object),
+        use_na_sentinel=False,
+    )
+    frame = pd.DataFrame(
+        {"g": codes, "t": pd.Series([r.get("timestamp") for r in records], dtype=object)}
+    )
+    frame.sort_values(["g", "t"], kind="mergesort", inplace=True)
+    order = frame.index.to_numpy()
+    g = frame["g"].to_numpy()
+    starts = np.flatnonzero(np.concatenate(([True], g[1:] != g[:-1])))
+    return order, starts
+
 
 def build_features(records: List[Dict]) -> List[Dict]:
     """Build a tiny feature set: compute log-returns and a rolling mean.
@@ -15,35 +140,19 @@ def build_features(records: List[Dict]) -> List[Dict]:
     records: list of dicts with keys `timestamp`, `symbol`, `close`.
     Returns list of dicts with added keys `return` and `ma_3`.
     """
+    if not records:
+        return []
+    order, starts = _group_order(records)
+    recs = [records[i] for i in order.tolist()]
+    # One pass over all symbols; the running window resets at each start
+    ret, ma = _compute_features(_close_array(recs), starts)
+
     out = []
-    # group by symbol
-    groups = {}
-    for r in records:
-        sym = r.get("symbol")
-        groups.setdefault(sym, []).append(r)
-
-    for sym, recs in groups.items():
-        # sort by timestamp string (ISO assumed)
-        recs = sorted(recs, key=lambda x: x.get("timestamp"))
-        closes = [
-            float(r.get("close")) if r.get("close") is not None else None for r in recs
-        ]
-        ma_window = 3
-        for i, r in enumerate(recs):
-            features = dict(r)
-            prev = closes[i - 1] if i > 0 else None
-            if prev is None or closes[i] is None:
-                features["return"] = None
-            else:
-                try:
-                    features["return"] = (closes[i] - prev) / prev
-                except Exception:
-                    features["return"] = None
-            # moving average
-            start = max(0, i - ma_window + 1)
-            window = [c for c in closes[start : i + 1] if c is not None]
-            features["ma_3"] = sum(window) / len(window) if window else None
-            out.append(features)
+    for r, rv, mv in zip(recs, ret.tolist(), ma.tolist()):
+        features = dict(r)
+        features["return"] = None if rv != rv else rv
+        features["ma_3"] = None if mv != mv else mv
+        out.append(features)
     return out
 
 
@@ -1,21 +1,27 @@
 """Regime detection features such as volatility regime and momentum regime."""
 
 from typing import List, Dict
-import math
+
+import numpy as np
+
+from src.utils.math_utils import rolling_mean_std
+
+
+def _as_float_array(values: List[float]) -> np.ndarray:
+    """float64 copy of `values` with None mapped to NaN."""
+    return np.fromiter(
+        (np.nan if v is None else v for v in values), dtype=np.float64, count=len(values)
+    )
 
 
 def rolling_std(values: List[float], window: int) -> List[float]:
-    out = []
-    for i in range(len(values)):
-        start = max(0, i - window + 1)
-        window_vals = [v for v in values[start : i + 1] if v is not None]
-        if not window_vals:
-            out.append(None)
-        else:
-            mean = sum(window_vals) / len(window_vals)
-            var = sum((x - mean) ** 2 for x in window_vals) / len(window_vals)
-            out.append(math.sqrt(var))
-    return out
+    """Population std of the non-missing values in each trailing window.
+
+    Computed in one O(N) pass by `math_utils.rolling_mean_std`. Entries
+    whose window holds no value are None; NaN counts as missing, like None.
+    """
+    _, std, n = rolling_mean_std(_as_float_array(values), window)
+    return [s if c else None for s, c in zip(std.tolist(), n.tolist())]
 
 
 def volatility_regime(
@@ -25,22 +31,27 @@ def volatility_regime(
 
     If `threshold` is None, uses median rolling std as threshold.
     """
-    closes = [
-        float(r.get("close")) if r.get("close") is not None else None for r in records
-    ]
-    stds = rolling_std(closes, window)
-    vals = [s for s in stds if s is not None]
-    if not vals:
+    closes = np.fromiter(
+        (np.nan if (c := r.get("close")) is None else float(c) for r in records),
+        dtype=np.float64,
+        count=len(records),
+    )
+    _, stds, _ = rolling_mean_std(closes, window)
+    valid = stds[~np.isnan(stds)]
+    if not valid.size:
         thr = threshold or 0.0
+    elif threshold is not None:
+        thr = threshold
     else:
-        thr = threshold if threshold is not None else sorted(vals)[len(vals) // 2]
-    out = []
-    for r, s in zip(records, stds):
-        rec = dict(r)
-        rec["volatility"] = s
-        rec["vol_regime"] = "high" if s is not None and s >= thr else "low"
-        out.append(rec)
-    return out
+        # upper median in O(N), same element as sorted(valid)[size // 2]
+        k = valid.size // 2
+        thr = float(np.partition(valid, k)[k])
+    # NaN compares False, so windows without a value are labelled 'low'
+    high = (stds >= thr).tolist()
+    return [
+        {**r, "volatility": None if s != s else s, "vol_regime": "high" if h else "low"}
+        for r, s, h in zip(records, stds.tolist(), high)
+    ]
 
 
 __all__ = ["volatility_regime"]
@@ -4,73 +4,112 @@ Provides mutual information-based selection if scikit-learn is available,
 otherwise falls back to correlation-based ranking.
 """
 
-from typing import List, Dict, Tuple
-import math
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.utils.math_utils import to_matrix
 
 try:
     from sklearn.feature_selection import mutual_info_regression
 except Exception:
     mutual_info_regression = None
 
+# Older scikit-learn releases (< 1.5) have no `n_jobs` on the MI estimator.
+_MI_HAS_N_JOBS = False
+if mutual_info_regression is not None:
+    import inspect
+
+    _MI_HAS_N_JOBS = "n_jobs" in inspect.signature(mutual_info_regression).parameters
+
+# Below this many cells, worker start-up costs more than MI itself.
+_MI_PARALLEL_MIN_CELLS = 100_000
+
+# Memo of MI rankings keyed by a fingerprint of the (subsampled) inputs.
+_MI_CACHE_SIZE = 32
+_mi_cache: "OrderedDict[tuple, List[Tuple[str, float]]]" = OrderedDict()
+
 
 def _corr_importance(
     X: List[Dict], feature_names: List[str], target_name: str
 ) -> List[Tuple[str, float]]:
-    # compute Pearson correlation between each feature and target
-    xs = {f: [] for f in feature_names}
-    y = []
-    for row in X:
-        for f in feature_names:
-            xs[f].append(row.get(f))
-        y.append(row.get(target_name))
-    res = []
-    for f in feature_names:
-        xf = xs[f]
-        # simple correlation
-        try:
-            n = len(xf)
-            mean_x = sum(x for x in xf if x is not None) / n
-            mean_y = sum(yy for yy in y if yy is not None) / n
-            num = sum((a - mean_x) * (b - mean_y) for a, b in zip(xf, y))
-            den = math.sqrt(
-                sum((a - mean_x) ** 2 for a in xf) * sum((b - mean_y) ** 2 for b in y)
-            )
-            corr = num / den if den != 0 else 0.0
-        except Exception:
-            corr = 0.0
-        res.append((f, abs(corr)))
+    # compute |Pearson correlation| between each feature and target, all
+    # features at once; a feature column with any missing value scores 0.0,
+    # and so does every feature when the target has one
+    try:
+        M = np.array(
+            [[row.get(f) for f in feature_names] + [row.get(target_name)] for row in X],
+            dtype=np.float64,
+        ).reshape(len(X), len(feature_names) + 1)
+        complete = ~np.isnan(M).any(axis=0)
+        centered = M - M.mean(axis=0) if len(X) else M
+        xs, y = centered[:, :-1], centered[:, -1]
+        num = xs.T @ y
+        den = np.sqrt((xs * xs).sum(axis=0) * (y @ y))
+        ok = complete[:-1] & complete[-1] & (den != 0)
+        corr = np.divide(num, den, out=np.zeros_like(num), where=ok)
+        scores = np.abs(corr).tolist()
+    except (TypeError, ValueError):
+        scores = [0.0] * len(feature_names)
+    res = list(zip(feature_names, scores))
     res.sort(key=lambda x: x[1], reverse=True)
     return res
 
 
+def _fingerprint(arr: np.ndarray) -> str:
+    return hashlib.blake2b(arr.tobytes(), digest_size=8).hexdigest()
+
+
 def feature_importance(
-    X: List[Dict], feature_names: List[str], target_name: str
+    X: List[Dict],
+    feature_names: List[str],
+    target_name: str,
+    max_rows: Optional[int] = 200_000,
+    random_state: int = 0,
 ) -> List[Tuple[str, float]]:
-    """Return ranked list of (feature, importance)."""
+    """Return ranked list of (feature, importance).
+
+    MI is estimated on at most `max_rows` rows drawn without replacement
+    (seeded by `random_state`; None uses every row). The kNN estimator
+    scales as n log n per feature, and a uniform sample of a few hundred
+    thousand rows gives an unbiased estimate with the same ranking in
+    practice. Results are memoized on a hash of the sampled inputs.
+    """
     # try mutual information
     if mutual_info_regression is not None:
         try:
-            # build arrays
-            import numpy as _np
-
-            arrX = _np.array(
-                [
-                    [
-                        row.get(f) if row.get(f) is not None else 0.0
-                        for f in feature_names
-                    ]
-                    for row in X
-                ]
-            )
-            arrY = _np.array(
-                [
-                    (row.get(target_name) if row.get(target_name) is not None else 0.0)
-                    for row in X
-                ]
+            n = len(X)
+            # missing values become 0.0, as MI cannot take NaN
+            arrX = to_matrix(X, feature_names, missing=0.0)
+            arrY = to_matrix(X, [target_name], missing=0.0)[:, 0]
+            if max_rows is not None and n > max_rows:
+                idx = np.random.default_rng(random_state).choice(n, max_rows, replace=False)
+                arrX = arrX[idx]
+                arrY = arrY[idx]
+            key = (
+                n,
+                len(feature_names),
+                tuple(feature_names),
+                max_rows,
+                random_state,
+                _fingerprint(arrX),
+                _fingerprint(arrY),
             )
-            mi = mutual_info_regression(arrX, arrY)
+            hit = _mi_cache.get(key)
+            if hit is not None:
+                _mi_cache.move_to_end(key)
+                return list(hit)
+            kwargs = {"random_state": random_state}
+            if _MI_HAS_N_JOBS and arrX.size >= _MI_PARALLEL_MIN_CELLS:
+                kwargs["n_jobs"] = -1
+            mi = mutual_info_regression(arrX, arrY, **kwargs)
             res = list(zip(feature_names, [float(v) for v in mi]))
             res.sort(key=lambda x: x[1], reverse=True)
+            _mi_cache[key] = list(res)
+            if len(_mi_cache) > _MI_CACHE_SIZE:
+                _mi_cache.popitem(last=False)
             return res
         except Exception:
             pass
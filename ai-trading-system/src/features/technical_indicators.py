@@ -1,69 +1,93 @@
 """Common technical indicators implemented without pandas dependency.
 
 Functions accept lists of numeric closes and return lists aligned with input
-length (None for indices where the indicator is undefined).
+length (None for indices where the indicator is undefined). Internally the
+closes are a float64 array with NaN for missing values; the EMA/Wilder
+recurrence runs as a Numba kernel when numba is installed.
 """
 
 from typing import List, Optional
 
+import numpy as np
+
+from src.utils.math_utils import rolling_mean_std
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _as_float_array(values: List[float]) -> np.ndarray:
+    return np.fromiter(
+        (np.nan if v is None else v for v in values), dtype=np.float64, count=len(values)
+    )
+
+
+def _to_list(arr: np.ndarray) -> List[Optional[float]]:
+    return [None if v != v else v for v in arr.tolist()]
+
 
 def sma(values: List[float], window: int) -> List[Optional[float]]:
-    out = []
-    for i in range(len(values)):
-        if i + 1 < window:
-            out.append(None)
+    """Mean of the non-missing values in each full trailing window.
+
+    The first `window - 1` entries, and windows with no value, are None.
+    """
+    mean, _, _ = rolling_mean_std(_as_float_array(values), window)
+    mean[: window - 1] = np.nan
+    return _to_list(mean)
+
+
+def _ewm_py(arr, alpha, prev):
+    """Exponential smoothing prev = alpha*v + (1-alpha)*prev over `arr`.
+
+    A NaN `prev` seeds from the first value; NaN inputs give NaN outputs
+    and leave the state untouched.
+    """
+    out = np.empty_like(arr)
+    for i in range(arr.shape[0]):
+        v = arr[i]
+        if v != v:
+            out[i] = np.nan
             continue
-    window_vals = [v for v in values[i - window + 1 : i + 1] if v is not None]
-    out.append(sum(window_vals) / len(window_vals) if window_vals else None)
+        prev = v if prev != prev else alpha * v + (1 - alpha) * prev
+        out[i] = prev
     return out
 
 
+# fastmath stays off: NaN marks missing values.
+_ewm = njit(cache=True)(_ewm_py) if njit is not None else _ewm_py
+
+
 def ema(values: List[float], window: int) -> List[Optional[float]]:
     alpha = 2 / (window + 1)
-    out = []
-    prev = None
-    for v in values:
-        if v is None:
-            out.append(None)
-            continue
-        if prev is None:
-            prev = v
-        else:
-            prev = alpha * v + (1 - alpha) * prev
-        out.append(prev)
-    return out
+    arr = _as_float_array(values)
+    return _to_list(_ewm(arr, alpha, np.nan))
 
 
 def rsi(values: List[float], window: int = 14) -> List[Optional[float]]:
-    gains = [0]
-    losses = [0]
-    for i in range(1, len(values)):
-        if values[i] is None or values[i - 1] is None:
-            gains.append(0)
-            losses.append(0)
-            continue
-        diff = values[i] - values[i - 1]
-        gains.append(max(0, diff))
-        losses.append(max(0, -diff))
-    out = [None] * len(values)
-    avg_gain = None
-    avg_loss = None
-    for i in range(len(values)):
-        if i < window:
-            out[i] = None
-            continue
-        if i == window:
-            avg_gain = sum(gains[1 : window + 1]) / window
-            avg_loss = sum(losses[1 : window + 1]) / window
-        else:
-            avg_gain = (avg_gain * (window - 1) + gains[i]) / window
-            avg_loss = (avg_loss * (window - 1) + losses[i]) / window
-        if avg_loss == 0:
-            out[i] = 100.0
-        else:
-            rs = avg_gain / avg_loss if avg_loss else None
-            out[i] = 100 - (100 / (1 + rs)) if rs is not None else None
-    return out
+    arr = _as_float_array(values)
+    n = arr.size
+    out = np.full(n, np.nan)
+    if n > window:
+        # gains/losses[i] is the move into bar i; 0 across a missing close
+        diff = np.zeros(n)
+        diff[1:] = np.nan_to_num(arr[1:] - arr[:-1], nan=0.0)
+        gains = np.maximum(diff, 0.0)
+        losses = np.maximum(-diff, 0.0)
+        # Wilder smoothing (alpha = 1/window) seeded with the first window's mean
+        alpha = 1.0 / window
+        avg_gain = np.empty(n - window)
+        avg_loss = np.empty(n - window)
+        avg_gain[0] = gains[1 : window + 1].sum() / window
+        avg_loss[0] = losses[1 : window + 1].sum() / window
+        avg_gain[1:] = _ewm(gains[window + 1 :], alpha, avg_gain[0])
+        avg_loss[1:] = _ewm(losses[window + 1 :], alpha, avg_loss[0])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[window:] = np.where(
+                avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss)
+            )
+    return _to_list(out)
 
 
 __all__ = ["sma", "ema", "rsi"]
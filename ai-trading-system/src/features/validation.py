@@ -6,45 +6,48 @@ population drift checks (mean/std differences).
 """
 
 from typing import List, Dict, Tuple
-import math
+
+import numpy as np
 
 
 def required_features_present(
     features: List[Dict], required: List[str]
 ) -> Tuple[bool, List[str]]:
     """Return (all_ok, missing_features_list)"""
+    # one C-level set difference per row against its key view; the union
+    # of columns is not enough, a key must be present in every row
+    req = set(required)
     missing = set()
     for f in features:
-        for r in required:
-            if r not in f:
-                missing.add(r)
+        missing |= req - f.keys()
+        if missing == req:
+            break
     return (len(missing) == 0, sorted(list(missing)))
 
 
 def missing_value_counts(features: List[Dict]) -> Dict[str, int]:
     """Count None values per feature key."""
     counts = {}
+    get = counts.get
+    setdefault = counts.setdefault
     for f in features:
         for k, v in f.items():
             if v is None:
-                counts[k] = counts.get(k, 0) + 1
+                counts[k] = get(k, 0) + 1
             else:
-                counts.setdefault(k, 0)
+                setdefault(k, 0)
     return counts
 
 
 def mean_std(values: List[float]) -> Tuple[float, float]:
-    vals = [
-        v
-        for v in values
-        if v is not None and not (isinstance(v, float) and math.isnan(v))
-    ]
-    if not vals:
+    """Return (mean, population std) of the non-missing values."""
+    arr = np.fromiter(
+        (np.nan if v is None else float(v) for v in values), dtype=np.float64
+    )
+    arr = arr[~np.isnan(arr)]
+    if arr.size == 0:
         return (0.0, 0.0)
-    n = len(vals)
-    mean = sum(vals) / n
-    var = sum((x - mean) ** 2 for x in vals) / n
-    return (mean, math.sqrt(var))
+    return (float(arr.mean()), float(arr.std()))
 
 
 def population_drift(
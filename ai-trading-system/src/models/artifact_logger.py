@@ -1,20 +1,68 @@
 """Lightweight reproducible artifact logger for models.
 
 Provides utilities to save model artifacts and metadata (hyperparams,
-metrics, git info, timestamp). Artifacts are saved under `models/artifacts/`.
+metrics, git info, timestamp). Artifacts are saved under `models/artifacts/`
+as indented JSON, streamed to disk and optionally zstd-compressed.
 """
 
+import functools
 import json
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_ZSTD_LEVEL = 3
+
+# Encoded chunks are gathered into blocks of about this many characters
+# per write
+_WRITE_BLOCK = 1 << 16
+
+
+def _json_default(obj: Any) -> Any:
+    # NumPy arrays and scalars, e.g. metrics or weights in an artifact
+    tolist = getattr(obj, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# One encoder for every file: the same object always serializes the same way
+_ENCODER = json.JSONEncoder(indent=2, default=_json_default)
+
+
+def _iter_json_bytes(obj: Any) -> Iterator[bytes]:
+    """Yield the encoding of `obj` as UTF-8 blocks, without building it whole."""
+    parts = []
+    size = 0
+    for chunk in _ENCODER.iterencode(obj):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= _WRITE_BLOCK:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+            size = 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def _write_json(fh, obj: Any) -> None:
+    for block in _iter_json_bytes(obj):
+        fh.write(block)
 
 
 def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def _git_info() -> Dict[str, Any]:
+@functools.lru_cache(maxsize=1)
+def _git_info() -> Tuple[Tuple[str, str], ...]:
+    # HEAD does not move during a run, so git is queried once per process;
+    # the cached value is an immutable tuple of (key, value) pairs
     try:
         # lightweight git info capture
         import subprocess
@@ -25,9 +73,9 @@ def _git_info() -> Dict[str, Any]:
             .decode()
             .strip()
         )
-        return {"sha": sha, "branch": branch}
+        return (("sha", sha), ("branch", branch))
     except Exception:
-        return {}
+        return ()
 
 
 def save_artifact(
@@ -35,10 +83,13 @@ def save_artifact(
     name: str,
     metadata: Optional[Dict[str, Any]] = None,
     out_dir: str = "models/artifacts",
+    compress: bool = False,
 ) -> Dict[str, Any]:
     """Save `artifact_obj` (JSON-serializable) and metadata. Returns manifest.
 
-    `name` should be a short identifier (used as filename prefix).
+    `name` should be a short identifier (used as filename prefix). With
+    `compress=True` and `zstandard` installed the artifact is written as
+    `<name>_<ts>.json.zst`; the manifest file is always plain JSON.
     """
     _ensure_dir(out_dir)
     ts = datetime.now(timezone.utc).isoformat()
@@ -46,15 +97,21 @@ def save_artifact(
         "name": name,
         "timestamp": ts,
         "metadata": metadata or {},
-        "git": _git_info(),
+        "git": dict(_git_info()),
     }
     # artifact filename
     base = f"{name}_{ts.replace(':', '-')}.json"
     art_path = os.path.join(out_dir, base)
     try:
         payload = {"artifact": artifact_obj, "manifest": manifest}
-        with open(art_path, "w", encoding="utf-8") as fh:
-            json.dump(payload, fh, indent=2)
+        if compress and zstandard is not None:
+            art_path += ".zst"
+            cctx = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+            with open(art_path, "wb") as fh, cctx.stream_writer(fh) as w:
+                _write_json(w, payload)
+        else:
+            with open(art_path, "wb") as fh:
+                _write_json(fh, payload)
     except Exception:
         # best-effort: still return manifest
         pass
@@ -62,8 +119,8 @@ def save_artifact(
     # also write a manifest file for quick lookup
     try:
         man_path = os.path.join(out_dir, f"{name}_manifest.json")
-        with open(man_path, "w", encoding="utf-8") as fh:
-            json.dump(manifest, fh, indent=2)
+        with open(man_path, "wb") as fh:
+            _write_json(fh, manifest)
     except Exception:
         pass
 
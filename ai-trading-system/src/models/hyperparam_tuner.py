@@ -4,6 +4,7 @@ Provides a lightweight grid-search tuner that uses scikit-learn when
 available. Results are written to a JSON file for later inspection.
 """
 
+import itertools
 import json
 import os
 from typing import Dict, Any, List, Optional
@@ -11,23 +12,22 @@ from src.models.artifact_logger import save_artifact
 
 
 def _iter_param_grid(grid: Dict[str, List[Any]]):
-    # simple cartesian product without external deps
+    # cartesian product in key order; an empty grid yields one empty combo
     keys = list(grid.keys())
-    if not keys:
-        yield {}
-        return
+    for combo in itertools.product(*(grid[k] for k in keys)):
+        yield dict(zip(keys, combo))
 
-    lists = [grid[k] for k in keys]
 
-    def rec(idx, cur):
-        if idx == len(keys):
-            yield dict(cur)
-            return
-        for v in lists[idx]:
-            cur[keys[idx]] = v
-            yield from rec(idx + 1, cur)
+def _score(params: Dict[str, Any], tr_idx, te_idx, arrX, arrY) -> float:
+    # one (params, fold) fit; the forest itself stays single-threaded so
+    # parallel folds do not oversubscribe the cores
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_squared_error
 
-    yield from rec(0, {})
+    model = RandomForestRegressor(**params, random_state=1, n_jobs=1)
+    model.fit(arrX[tr_idx], arrY[tr_idx])
+    pred = model.predict(arrX[te_idx])
+    return float(mean_squared_error(arrY[te_idx], pred))
 
 
 def run_grid_search(
@@ -37,34 +37,43 @@ def run_grid_search(
     cv: int = 3,
     scoring: str = "neg_mean_squared_error",
     out_path: Optional[str] = None,
+    n_jobs: int = -1,
 ):
     """Run a simple grid search using sklearn when available.
 
     X and y should be array-like (lists of lists / lists).
+    Every (params, fold) fit is an independent joblib task, spread over
+    `n_jobs` workers (-1: all cores, 1: run in-process).
     Returns a dict with all evaluated results and the best params.
     """
     results = []
     try:
-        from sklearn.ensemble import RandomForestRegressor
+        from joblib import Parallel, delayed
         from sklearn.model_selection import KFold
-        from sklearn.metrics import mean_squared_error
         import numpy as _np
 
         arrX = _np.array(X)
         arrY = _np.array(y)
 
-        for params in _iter_param_grid(param_grid):
-            # build model with params
-            model = RandomForestRegressor(**params, random_state=1)
-            # cross-val
-            kf = KFold(n_splits=max(2, int(cv)), shuffle=True, random_state=1)
-            scores = []
-            for tr_idx, te_idx in kf.split(arrX):
-                model.fit(arrX[tr_idx], arrY[tr_idx])
-                pred = model.predict(arrX[te_idx])
-                mse = float(mean_squared_error(arrY[te_idx], pred))
-                scores.append(mse)
-            avg_score = float(sum(scores) / len(scores))
+        combos = list(_iter_param_grid(param_grid))
+        # the folds are fixed by the seed, so split once and share the
+        # index arrays across every params combination
+        splits = list(KFold(n_splits=max(2, int(cv)), shuffle=True, random_state=1).split(arrX))
+        tasks = [
+            (i, params, tr_idx, te_idx)
+            for i, params in enumerate(combos)
+            for tr_idx, te_idx in splits
+        ]
+        mses = Parallel(n_jobs=n_jobs, backend="loky")(
+            delayed(_score)(params, tr_idx, te_idx, arrX, arrY)
+            for _, params, tr_idx, te_idx in tasks
+        )
+        # average the fold scores back onto their params, in grid order
+        scores = [[] for _ in combos]
+        for (i, _, _, _), mse in zip(tasks, mses):
+            scores[i].append(mse)
+        for params, fold_scores in zip(combos, scores):
+            avg_score = float(sum(fold_scores) / len(fold_scores))
             results.append({"params": params, "mse": avg_score})
 
         # pick best (lowest mse)
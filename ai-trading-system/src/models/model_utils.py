@@ -11,15 +11,18 @@ def save_model(model_obj, path: str):
 def compute_feature_importance(X, y, feature_names):
     """
     Compute simple feature importance using sklearn RandomForest if
-    available, otherwise return zeros. Returns list of
+    available, otherwise return zeros. `X` may be an array, a list of
+    rows or a list of dicts keyed by `feature_names`. Returns list of
     (feature, importance).
     """
     try:
         from sklearn.ensemble import RandomForestRegressor
         import numpy as _np
 
-        arrX = _np.array(X)
-        arrY = _np.array(y)
+        from src.utils.math_utils import to_matrix
+
+        arrX = to_matrix(X, feature_names)
+        arrY = _np.asarray(y, dtype=_np.float64)
         model = RandomForestRegressor(n_estimators=10, random_state=1)
         model.fit(arrX, arrY)
         importances = model.feature_importances_
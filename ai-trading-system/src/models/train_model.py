@@ -11,6 +11,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 import numpy as np
+import xgboost as xgb
 
 from src.models import model_utils
 from src.models.xgboost_model import train_xgboost
@@ -182,14 +183,20 @@ def save_model(
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         model_name = f"model_{timestamp}"
     
-    # Save model pickle
-    model_path = os.path.join(model_dir, f"{model_name}.pkl")
-    with open(model_path, "wb") as f:
-        pickle.dump(model_result["model"], f)
+    # XGBoost boosters use the native UBJSON format; anything else is pickled
+    model = model_result["model"]
+    if isinstance(model, xgb.Booster):
+        model_path = os.path.join(model_dir, f"{model_name}.ubj")
+        model.save_model(model_path)
+    else:
+        model_path = os.path.join(model_dir, f"{model_name}.pkl")
+        with open(model_path, "wb") as f:
+            pickle.dump(model, f)
     
     # Save metadata and metrics
     metadata_path = os.path.join(model_dir, f"{model_name}_metadata.json")
     metadata = {
+        "model_path": os.path.basename(model_path),
         "metrics": model_result["metrics"],
         "feature_importance": model_result["feature_importance"],
         "metadata": model_result["metadata"],
@@ -212,6 +219,21 @@ def save_model(
     return model_path
 
 
+def load_model(model_path: str) -> Any:
+    """
+    Load a model written by `save_model`.
+    
+    :param model_path: Path to a `.ubj`/`.json` XGBoost model or a `.pkl` file
+    :return: The Booster or unpickled model object
+    """
+    if model_path.endswith((".ubj", ".json")):
+        booster = xgb.Booster()
+        booster.load_model(model_path)
+        return booster
+    with open(model_path, "rb") as f:
+        return pickle.load(f)
+
+
 def train(
     X: List[List[float]],
     y: List[float],
@@ -239,7 +261,7 @@ def train(
         result = train_with_walk_forward(X_arr, y_arr, feature_names, n_splits=n_splits, params=params)
     else:
         # Simple training without walk-forward
-        model = train_xgboost(X_arr, y_arr, params=params)
+        model, metrics = train_xgboost(X_arr, y_arr, params=params)
         try:
             importances = model_utils.compute_feature_importance(X_arr, y_arr, feature_names)
         except Exception:
@@ -247,7 +269,7 @@ def train(
         
         result = {
             "model": model,
-            "metrics": {},
+            "metrics": metrics,
             "feature_importance": importances,
             "metadata": {
                 "n_samples": len(X_arr),
@@ -264,4 +286,4 @@ def train(
     return result
 
 
-__all__ = ["train", "train_with_walk_forward", "save_model", "walk_forward_split"]
+__all__ = ["train", "train_with_walk_forward", "save_model", "load_model", "walk_forward_split"]
@@ -1,9 +1,27 @@
-"""XGBoost model wrapper."""
+"""XGBoost model wrapper.
+
+Models are trained with the histogram tree method, on the device named by
+the `XGB_DEVICE` environment variable (`cpu` by default, e.g. `cuda`).
+"""
+
+import os
 
 import xgboost as xgb
 import numpy as np
 from typing import Dict, Any, Tuple
 
+_DEFAULT_PARAMS = {
+    'objective': 'reg:squarederror',
+    'tree_method': 'hist',
+    'eval_metric': 'rmse',
+    'max_depth': 6,
+    'learning_rate': 0.1,
+    'n_estimators': 100,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'random_state': 42
+}
+
 
 def build_xgb_model(params: dict = None):
     """Legacy stub for compatibility."""
@@ -24,29 +42,33 @@ def train_xgboost(
         y_train: Training targets
         X_val: Validation features (optional)
         y_val: Validation targets (optional)
-        params: XGBoost parameters (optional)
+        params: XGBoost parameters (optional), merged over the defaults
         
     Returns:
         Tuple of (trained model, training metrics dict)
     """
-    if params is None:
-        params = {
-            'objective': 'reg:squarederror',
-            'max_depth': 6,
-            'learning_rate': 0.1,
-            'n_estimators': 100,
-            'subsample': 0.8,
-            'colsample_bytree': 0.8,
-            'random_state': 42
-        }
-    
-    # Create DMatrix
-    dtrain = xgb.DMatrix(X_train, label=y_train)
+    # Caller params override the defaults; the caller's dict is not mutated
+    params = {
+        **_DEFAULT_PARAMS,
+        'device': os.environ.get('XGB_DEVICE', 'cpu'),
+        **(params or {}),
+    }
+
+    # With `hist`, QuantileDMatrix bins the features once up front instead
+    # of keeping a full copy; the validation matrix reuses the train bins.
+    hist = params.get('tree_method') == 'hist'
+    if hist:
+        dtrain = xgb.QuantileDMatrix(X_train, label=y_train)
+    else:
+        dtrain = xgb.DMatrix(X_train, label=y_train)
     
     # Setup validation if provided
     evals = [(dtrain, 'train')]
     if X_val is not None and y_val is not None:
-        dval = xgb.DMatrix(X_val, label=y_val)
+        if hist:
+            dval = xgb.QuantileDMatrix(X_val, label=y_val, ref=dtrain)
+        else:
+            dval = xgb.DMatrix(X_val, label=y_val)
         evals.append((dval, 'val'))
     
     # Train
@@ -62,15 +84,18 @@ def train_xgboost(
         verbose_eval=False
     )
     
-    # Calculate metrics
-    train_preds = model.predict(dtrain)
-    train_mse = float(np.mean((y_train - train_preds) ** 2))
-    
-    metrics = {'train_mse': train_mse}
+    # The final round's RMSE on each eval set is the full model's error,
+    # so MSE comes from evals_result without another prediction pass
+    def _mse(name, dmat, y):
+        history = evals_result[name]
+        if 'rmse' in history:
+            return float(history['rmse'][-1] ** 2)
+        preds = model.predict(dmat)  # caller chose a metric without rmse
+        return float(np.mean((y - preds) ** 2))
+
+    metrics = {'train_mse': _mse('train', dtrain, y_train)}
     
     if X_val is not None and y_val is not None:
-        val_preds = model.predict(dval)
-        val_mse = float(np.mean((y_val - val_preds) ** 2))
-        metrics['val_mse'] = val_mse
+        metrics['val_mse'] = _mse('val', dval, y_val)
     
     return model, metrics
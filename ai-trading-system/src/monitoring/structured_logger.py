@@ -20,22 +20,38 @@ class StructuredLogger:
         self.logger.setLevel(logging.INFO)
 
     def info(self, msg: str, **fields: Any) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         payload: Dict[str, Any] = {"message": msg}
         payload.update(fields)
         # Emit compact JSON on a single line
         self.logger.info(json.dumps(payload, default=str))
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Return True if records at `level` would be emitted.
+
+        Lets callers skip building expensive log fields when disabled.
+        """
+        return self.logger.isEnabledFor(level)
+
     def debug(self, msg: str, **fields: Any) -> None:
+        # Debug is off by default; don't pay for JSON encoding in that case.
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         payload: Dict[str, Any] = {"message": msg}
         payload.update(fields)
         self.logger.debug(json.dumps(payload, default=str))
 
     def warning(self, msg: str, **fields: Any) -> None:
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         payload: Dict[str, Any] = {"message": msg}
         payload.update(fields)
         self.logger.warning(json.dumps(payload, default=str))
 
     def error(self, msg: str, **fields: Any) -> None:
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         payload: Dict[str, Any] = {"message": msg}
         payload.update(fields)
         self.logger.error(json.dumps(payload, default=str))
@@ -1,8 +1,115 @@
 """Math helpers."""
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def safe_div(a, b, default=0.0):
     try:
         return a / b
     except Exception:
         return default
+
+
+def to_matrix(X, feature_names=None, missing: float = np.nan) -> np.ndarray:
+    """Return `X` as a C-contiguous float64 (rows x features) matrix.
+
+    `X` may be an ndarray, a list of row lists, or a list of dicts; dict
+    rows are read column by column in `feature_names` order, with absent
+    or None values set to `missing`.
+    """
+    if isinstance(X, np.ndarray):
+        return np.ascontiguousarray(X, dtype=np.float64)
+    if len(X) and isinstance(X[0], dict):
+        n = len(X)
+        out = np.empty((n, len(feature_names)), dtype=np.float64)
+        for j, f in enumerate(feature_names):
+            out[:, j] = np.fromiter(
+                (missing if (v := row.get(f)) is None else v for row in X),
+                dtype=np.float64,
+                count=n,
+            )
+        return out
+    return np.ascontiguousarray(np.asarray(X, dtype=np.float64))
+
+
+def _rolling_mean_std_np(arr: np.ndarray, window: int):
+    # Prefix sums of x, x**2 and the valid count; var = E[x^2] - E[x]^2,
+    # clamped at 0 against cancellation.
+    valid = ~np.isnan(arr)
+    a0 = np.where(valid, arr, 0.0)
+    cs = np.concatenate(([0.0], np.cumsum(a0)))
+    cs2 = np.concatenate(([0.0], np.cumsum(a0 * a0)))
+    cm = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, arr.size + 1)
+    start = np.maximum(end - window, 0)
+    n = cm[end] - cm[start]
+    safe_n = np.maximum(n, 1)
+    mean = (cs[end] - cs[start]) / safe_n
+    std = np.sqrt(np.maximum((cs2[end] - cs2[start]) / safe_n - mean * mean, 0.0))
+    empty = n == 0
+    mean[empty] = np.nan
+    std[empty] = np.nan
+    return mean, std, n
+
+
+if njit is not None:
+    # fastmath stays off: NaN marks missing values.
+    @njit(cache=True)
+    def _rolling_mean_std_nb(arr, window, mean_out, std_out, n_out):
+        # Welford's update with removal, so mixed-magnitude series keep
+        # their precision where sum-of-squares would cancel.
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for i in range(arr.shape[0]):
+            x = arr[i]
+            if x == x:
+                n += 1
+                d = x - mean
+                mean += d / n
+                m2 += d * (x - mean)
+            if i >= window:
+                y = arr[i - window]
+                if y == y:
+                    n -= 1
+                    if n == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        d = y - mean
+                        mean -= d / n
+                        m2 -= d * (y - mean)
+            n_out[i] = n
+            if n == 0:
+                mean_out[i] = np.nan
+                std_out[i] = np.nan
+            else:
+                mean_out[i] = mean
+                std_out[i] = np.sqrt(max(m2 / n, 0.0))
+
+    def rolling_mean_std(arr: np.ndarray, window: int):
+        """Return (mean, std, count) arrays over each trailing `window`.
+
+        NaN entries are skipped; windows with no value give NaN mean/std
+        and count 0. std is the population (ddof=0) value.
+        """
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        mean = np.empty_like(arr)
+        std = np.empty_like(arr)
+        n = np.empty(arr.size, dtype=np.int64)
+        _rolling_mean_std_nb(arr, window, mean, std, n)
+        return mean, std, n
+
+else:
+    def rolling_mean_std(arr: np.ndarray, window: int):
+        """Return (mean, std, count) arrays over each trailing `window`.
+
+        NaN entries are skipped; windows with no value give NaN mean/std
+        and count 0. std is the population (ddof=0) value.
+        """
+        return _rolling_mean_std_np(np.asarray(arr, dtype=np.float64), window)
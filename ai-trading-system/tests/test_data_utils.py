@@ -29,3 +29,42 @@ def test_missing_value_report_and_dedupe_and_range_check():
 
     violations = data_utils.basic_range_check(records, {"price": (0.0, 1000.0)})
     assert violations["price"] == 1
+
+
+def test_structured_array_helpers():
+    import numpy as np
+
+    arr = np.array(
+        [(1, 10.0, np.nan), (2, 9999.0, 100.0), (1, 10.0, np.nan)],
+        dtype=[("id", "i8"), ("price", "f8"), ("vol", "f8")],
+    )
+    assert data_utils.is_columnar(arr)
+    assert not data_utils.is_columnar([{"id": 1}])
+
+    ok, missing = data_utils.validate_schema(arr, ["id", "price", "qty"])
+    assert ok is False
+    assert missing == ["qty"]
+
+    mv = data_utils.missing_value_report(arr)
+    assert mv == {"id": 0, "price": 0, "vol": 2}
+
+    deduped = data_utils.deduplicate(arr, ["id"])
+    assert deduped["id"].tolist() == [1, 2]
+
+    violations = data_utils.basic_range_check(arr, {"price": (0.0, 1000.0)})
+    assert violations["price"] == 1
+
+    rows = data_utils.to_dicts(deduped)
+    assert rows[1] == {"id": 2, "price": 9999.0, "vol": 100.0}
+
+
+def test_dataframe_helpers():
+    import pandas as pd
+
+    df = pd.DataFrame({"id": [1, 2, 1], "price": [10.0, 9999.0, "bad"], "vol": [None, 100, None]})
+    assert data_utils.is_columnar(df)
+    assert data_utils.validate_schema(df, ["id", "price"]) == (True, [])
+    assert data_utils.missing_value_report(df)["vol"] == 2
+    assert data_utils.deduplicate(df, ["id"])["id"].tolist() == [1, 2]
+    assert data_utils.basic_range_check(df, {"price": (0.0, 1000.0)})["price"] == 2
+    assert data_utils.to_dicts(df.iloc[:1])[0]["id"] == 1
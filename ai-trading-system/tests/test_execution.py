@@ -1,2 +1,310 @@
+import json
+
+from src.execution.account_persistence import AccountStateManager
+
+
 def test_execution_smoke():
     assert True
+
+
+def test_account_state_debounced_saves_coalesce(tmp_path):
+    state_file = tmp_path / "account_state.json"
+    mgr = AccountStateManager(state_file, flush_interval=60.0)
+
+    mgr.save_state(cash=1.0, portfolio_value=1.0, positions={}, trades_count=1)
+    mgr.save_state(cash=2.0, portfolio_value=2.0, positions={}, trades_count=2)
+    assert not state_file.exists()  # still buffered
+    assert mgr.load_state()["trades_count"] == 2  # pending state is visible
+
+    mgr.flush()
+    assert json.loads(state_file.read_text())["cash"] == 2.0
+
+
+def test_account_state_immediate_by_default(tmp_path):
+    state_file = tmp_path / "account_state.json"
+    mgr = AccountStateManager(state_file)
+    mgr.save_state(cash=5.0, portfolio_value=6.0, positions={}, trades_count=0)
+    assert json.loads(state_file.read_text())["portfolio_value"] == 6.0
+
+
+def test_account_state_load_is_cached_until_file_changes(tmp_path):
+    state_file = tmp_path / "account_state.json"
+    mgr = AccountStateManager(state_file)
+    assert mgr.load_state() is None
+
+    mgr.save_state(cash=1.0, portfolio_value=1.0, positions={}, trades_count=3)
+    first = mgr.load_state()
+    assert mgr.load_state() is first
+
+    # Another writer replaces the file; the new contents are picked up
+    other = AccountStateManager(state_file)
+    other.save_state(cash=9.0, portfolio_value=9.0, positions={"SPY": {"qty": 1}}, trades_count=4)
+    assert mgr.get_lifetime_trades() == 4
+
+
+def test_account_state_write_is_atomic(tmp_path):
+    state_file = tmp_path / "account_state.json"
+    mgr = AccountStateManager(state_file, durable=True)
+    mgr.save_state(cash=1.0, portfolio_value=2.0, positions={}, trades_count=0)
+    assert [p.name for p in tmp_path.iterdir()] == ["account_state.json"]
+    assert json.loads(state_file.read_text())["portfolio_value"] == 2.0
+
+
+def test_mock_client_formats_timestamps_on_read():
+    from src.execution.mock_alpaca import MockAlpacaClient, _iso_from_ns
+
+    assert _iso_from_ns(1_700_000_000_123_456_789) == "2023-11-14T22:13:20.123456Z"
+
+    client = MockAlpacaClient(fill_delay_sec=0.0)
+    order = client.submit_order(symbol="AAPL", qty=1, side="buy")
+    assert order.created_at.endswith("+00:00")
+    assert order.filled_at is None
+
+    snapshot = client.get_equity_history()[0]
+    assert snapshot["timestamp"].endswith("Z")
+    assert "timestamp_ns" not in snapshot
+
+
+def test_mock_client_history_is_bounded_and_spilled(tmp_path, monkeypatch):
+    from src.execution import mock_alpaca
+
+    monkeypatch.setattr(mock_alpaca, "_TRADE_SPILL_BATCH", 2)
+    log_path = tmp_path / "trades.jsonl"
+    client = mock_alpaca.MockAlpacaClient(fill_delay_sec=0.0, max_history=3, trade_log_path=log_path)
+    monkeypatch.setattr(client, "_next_rand", lambda: 0.0)  # never reject
+
+    for _ in range(5):
+        order = client.submit_order(symbol="AAPL", qty=1, side="buy")
+        client.get_order(order.id)
+
+    assert len(client.get_trades()) == 3
+    assert len(client.get_equity_history()) == 3
+    assert len(log_path.read_text().splitlines()) == 4  # two full batches
+    client.flush_trade_log()
+    assert len(log_path.read_text().splitlines()) == 5
+
+
+def test_mock_client_position_arrays_track_positions(monkeypatch):
+    from src.execution import mock_alpaca
+
+    client = mock_alpaca.MockAlpacaClient(fill_delay_sec=0.0)
+    monkeypatch.setattr(client, "_next_rand", lambda: 0.0)  # never reject
+    symbols = [f"S{i}" for i in range(12)]  # forces the qty array to grow
+    client.set_market_prices({s: 10.0 for s in symbols})
+    for s in symbols:
+        client.get_order(client.submit_order(symbol=s, qty=3, side="buy").id)
+    client.get_order(client.submit_order(symbol="S0", qty=3, side="sell").id)
+
+    held = {p.symbol: p.qty for p in client.get_positions()}
+    assert "S0" not in held
+    for s, slot in client._slots.items():
+        assert client._qty[slot] == held.get(s, 0.0)
+    client._update_portfolio_value()
+    assert client.portfolio_value == client.cash + 10.0 * sum(held.values())
+
+
+def test_mock_client_snapshots_are_deterministic_without_trades(monkeypatch):
+    from src.execution import mock_alpaca
+
+    client = mock_alpaca.MockAlpacaClient(initial_cash=1000.0, fill_delay_sec=0.0)
+    monkeypatch.setattr(client, "_next_rand", lambda: 0.0)  # never reject
+    client.set_market_prices({"AAPL": 50.0})
+    client.get_order(client.submit_order(symbol="AAPL", qty=2, side="buy").id)
+
+    values = set()
+    for _ in range(5):
+        client._record_equity_snapshot()
+        values.add(client.get_equity_history()[-1]["portfolio_value"])
+    assert len(values) == 1
+    assert values.pop() == round(client.cash + 100.0, 2)
+
+
+def test_mock_client_random_buffer_refills():
+    from src.execution import mock_alpaca
+
+    client = mock_alpaca.MockAlpacaClient(fill_delay_sec=0.0)
+    draws = [client._next_rand() for _ in range(mock_alpaca._RAND_BUFFER_SIZE + 10)]
+    assert client._rand_idx == 10
+    assert all(0.0 <= d < 1.0 for d in draws)
+
+
+def test_mock_client_account_is_frozen_snapshot():
+    import dataclasses
+
+    import pytest
+    from src.execution.mock_alpaca import MockAlpacaClient
+
+    account = MockAlpacaClient(initial_cash=500.0).get_account()
+    assert account.account_number == account.id
+    assert not hasattr(account, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        account.cash = 0.0
+
+
+def test_mock_client_fills_orders_by_deadline():
+    import time
+
+    from src.execution.mock_alpaca import MockAlpacaClient
+
+    client = MockAlpacaClient(fill_delay_sec=10.0)
+    client._next_rand = lambda: 0.0  # never reject
+    first = client.submit_order(symbol="AAPL", qty=1, side="buy")
+    canceled = client.submit_order(symbol="MSFT", qty=1, side="buy")
+    client.cancel_order(canceled.id)
+
+    assert client.get_order(first.id).status == "pending_new"
+    assert client.process_ready_fills() == 0
+    assert client.process_ready_fills(now=time.time() + 11.0) == 1
+    assert first.status == "filled"
+    assert canceled.status == "canceled"
+    assert client._pending_heap == []
+
+
+def test_mock_client_instant_fill_skips_pending_state():
+    from src.execution.mock_alpaca import MockAlpacaClient
+
+    client = MockAlpacaClient(fill_delay_sec=60.0, instant_fill=True)
+    client._next_rand = lambda: 0.0  # never reject
+    order = client.submit_order(symbol="AAPL", qty=2, side="buy")
+
+    assert order.status == "filled"
+    assert order.filled_qty == 2
+    assert client._pending_heap == []
+    assert [p.symbol for p in client.get_positions()] == ["AAPL"]
+
+
+def test_execute_order_logs_trade_record(tmp_path):
+    from src.backtesting.trade_log import read_trades
+    from src.execution.order_executor import execute_order, trade_log_writer
+
+    path = tmp_path / "trades.jsonl"
+    result = execute_order({"symbol": "AAPL", "qty": 3, "price": 10.0}, log_path=str(path))
+    assert result["status"] == "submitted"
+    trade_log_writer.flush()
+
+    (record,) = read_trades(str(path))
+    assert record["timestamp"].endswith("+00:00")
+    assert record["side"] == "buy"
+    assert record["executed_price"] == 10.0
+    assert record["status"] == "submitted"
+    assert list(record) == ["timestamp", "symbol", "side", "qty", "limit_price", "filled_qty",
+                            "executed_price", "status", "order_id", "notional", "commission",
+                            "slippage"]
+
+
+def test_async_trade_logger_batches_in_order(tmp_path):
+    from src.backtesting.trade_log import read_trades
+    from src.execution._trade_log_writer import AsyncTradeLogger
+
+    writer = AsyncTradeLogger()
+    a, b = tmp_path / "a.jsonl", tmp_path / "sub" / "b.jsonl"
+    for i in range(250):
+        writer.enqueue({"i": i}, path=str(a if i % 2 else b))
+    writer.flush()
+
+    assert [t["i"] for t in read_trades(str(a))] == list(range(1, 250, 2))
+    assert [t["i"] for t in read_trades(str(b))] == list(range(0, 250, 2))
+
+
+def test_exposure_check_is_memoized_per_snapshot(monkeypatch):
+    from src.execution import order_executor
+
+    calls = []
+    real = order_executor.check_exposure
+
+    def counting(portfolio):
+        calls.append(portfolio)
+        return real(portfolio)
+
+    monkeypatch.setattr(order_executor, "check_exposure", counting)
+    monkeypatch.setattr(order_executor, "_exposure_cache", order_executor.OrderedDict())
+    portfolio = {"cash": 1000.0, "positions": {"AAPL": 90000.0}}
+
+    for _ in range(3):
+        ok, violations = order_executor._cached_check_exposure(portfolio)
+        assert not ok and violations
+    assert len(calls) == 1
+
+    portfolio["positions"]["AAPL"] = 100.0  # a fill changes the key
+    assert order_executor._cached_check_exposure(portfolio) == (True, [])
+    assert len(calls) == 2
+
+
+def test_mock_client_fill_revalues_once(monkeypatch):
+    from src.execution.mock_alpaca import MockAlpacaClient
+
+    client = MockAlpacaClient(fill_delay_sec=0.0, instant_fill=True)
+    client._next_rand = lambda: 0.0  # never reject
+    calls = []
+    real = client._update_portfolio_value
+    monkeypatch.setattr(client, "_update_portfolio_value", lambda: (calls.append(1), real()))
+
+    client.submit_order(symbol="AAPL", qty=1, side="buy")
+    assert len(calls) == 1
+    trade = client.get_trades()[-1]
+    snapshot = client.get_equity_history()[-1]
+    assert trade["timestamp"] == snapshot["timestamp"]
+    assert snapshot["portfolio_value"] == round(client.portfolio_value, 2)
+
+
+def test_account_state_manager_is_slotted(tmp_path):
+    mgr = AccountStateManager(str(tmp_path / "state.json"))
+    assert not hasattr(mgr, "__dict__")
+    assert mgr.state_file == tmp_path / "state.json"
+    mgr.save_state(cash=1.0, portfolio_value=1.0, positions={}, trades_count=0)
+    assert not (tmp_path / "state.json.tmp").exists()
+    assert mgr.load_state()["cash"] == 1.0
+
+
+def test_mock_client_order_ids():
+    from uuid import UUID
+
+    from src.execution.mock_alpaca import MockAlpacaClient
+
+    client = MockAlpacaClient()
+    ids = [client.submit_order(symbol="AAPL", qty=1, side="buy").id for _ in range(3)]
+    assert ids == [f"{client.account_id}-{n}" for n in (1, 2, 3)]
+
+    legacy = MockAlpacaClient(stable_ids=False)
+    UUID(legacy.submit_order(symbol="AAPL", qty=1, side="buy").id)
+
+
+def test_mock_client_partial_trade_batch_flushed_at_exit(tmp_path, monkeypatch):
+    from src.execution import mock_alpaca
+
+    log_path = tmp_path / "trades.jsonl"
+    client = mock_alpaca.MockAlpacaClient(fill_delay_sec=0.0, instant_fill=True, trade_log_path=log_path)
+    monkeypatch.setattr(client, "_next_rand", lambda: 0.0)  # never reject
+    for _ in range(3):
+        client.submit_order(symbol="AAPL", qty=1, side="buy")
+    assert not log_path.exists()  # still under one batch
+
+    assert client in mock_alpaca._trade_log_clients
+    mock_alpaca._flush_trade_logs()  # the registered exit hook
+    assert len(log_path.read_text().splitlines()) == 3
+
+
+def test_account_state_exit_hook_flushes_without_pinning(tmp_path):
+    import gc
+    import weakref
+
+    from src.execution import account_persistence
+
+    state_file = tmp_path / "account_state.json"
+    mgr = AccountStateManager(state_file, flush_interval=60.0)
+    mgr.save_state(cash=3.0, portfolio_value=3.0, positions={"AAPL": {"qty": 1}}, trades_count=1)
+
+    pending = mgr.load_state()
+    pending["positions"]["AAPL"]["qty"] = 99  # callers get a copy
+    assert mgr.load_state()["positions"]["AAPL"]["qty"] == 1
+
+    account_persistence._flush_pending_states()  # the registered exit hook
+    assert json.loads(state_file.read_text())["cash"] == 3.0
+
+    other = AccountStateManager(tmp_path / "other.json", flush_interval=60.0)
+    other.close()
+    assert other not in account_persistence._debounced_managers
+    ref = weakref.ref(mgr)
+    del mgr, pending
+    gc.collect()
+    assert ref() is None
@@ -32,3 +32,78 @@ def test_missing_value_counts_and_drift():
     new = returns[1:]
     drift = validation.population_drift(old, new, mean_threshold=0.01)
     assert isinstance(drift, bool)
+
+
+def test_build_features_handles_gaps_and_order():
+    recs = [
+        {"timestamp": "2025-01-01T00:03:00Z", "symbol": "A", "close": 12.0},
+        {"timestamp": "2025-01-01T00:00:00Z", "symbol": "A", "close": 0.0},
+        {"timestamp": "2025-01-01T00:01:00Z", "symbol": "A", "close": 10.0},
+        {"timestamp": "2025-01-01T00:02:00Z", "symbol": "A", "close": None},
+    ]
+    feats = feature_engineering.build_features(recs)
+    assert [f["close"] for f in feats] == [0.0, 10.0, None, 12.0]
+    assert [f["return"] for f in feats] == [None, None, None, None]
+    assert [f["ma_3"] for f in feats] == [0.0, 5.0, 5.0, 11.0]
+
+
+def test_features_kernel_matches_numpy_path():
+    import numpy as np
+    import pytest
+
+    pytest.importorskip("numba")
+    closes = np.array([10.0, np.nan, 0.0, 11.0, 12.5, np.nan, np.nan, np.nan, 9.0])
+    ret, ma = feature_engineering._symbol_features(closes)
+    ret_k, ma_k = feature_engineering._compute_features(closes)
+    np.testing.assert_allclose(ret_k, ret)
+    np.testing.assert_allclose(ma_k, ma)
+
+
+def test_build_features_groups_in_first_seen_order():
+    recs = [
+        {"timestamp": "2025-01-01T00:01:00Z", "symbol": "B", "close": 2.0},
+        {"timestamp": "2025-01-01T00:00:00Z", "symbol": "A", "close": 1.0, "extra": 1},
+        {"timestamp": "2025-01-01T00:00:00Z", "symbol": "B", "close": 1.0},
+        {"timestamp": "2025-01-01T00:01:00Z", "symbol": "A", "close": 3.0},
+    ]
+    feats = feature_engineering.build_features(recs)
+    assert [(f["symbol"], f["close"]) for f in feats] == [("B", 1.0), ("B", 2.0), ("A", 1.0), ("A", 3.0)]
+    assert [f["return"] for f in feats] == [None, 1.0, None, 2.0]
+    assert "extra" not in feats[3] and feats[2]["extra"] == 1
+    assert feature_engineering.build_features([]) == []
+
+
+def test_features_reset_at_symbol_starts():
+    import numpy as np
+
+    closes = np.array([1.0, 2.0, 3.0, 10.0, np.nan, 20.0, 5.0])
+    starts = np.array([0, 3, 6])
+    for fn in (feature_engineering._symbol_features, feature_engineering._compute_features):
+        ret, ma = fn(closes, starts)
+        np.testing.assert_allclose(ma, [1.0, 1.5, 2.0, 10.0, 10.0, 15.0, 5.0])
+        assert np.isnan(ret[[0, 3, 4, 5, 6]]).all()
+        np.testing.assert_allclose(ret[1:3], [1.0, 0.5])
+
+
+def test_missing_value_counts_and_required_match_record_semantics():
+    feats = [
+        {"a": 1.0, "b": None},
+        {"a": None, "c": float("nan")},  # "b" absent, not missing
+        {"a": None, "b": 2.0, "c": 3.0},
+    ]
+    expected = {"a": 2, "b": 1, "c": 0}
+    assert validation.missing_value_counts(feats) == expected
+    assert list(validation.missing_value_counts(feats)) == ["a", "b", "c"]
+    assert validation.missing_value_counts([]) == {}
+    assert validation.required_features_present(feats, ["a", "b", "d"]) == (False, ["b", "d"])
+    assert validation.required_features_present(feats, ["a"]) == (True, [])
+
+
+def test_mean_std_skips_missing_and_is_biased():
+    import math
+
+    mean, std = validation.mean_std([1, None, 2.0, float("nan"), 3, 4.0])
+    assert mean == 2.5
+    assert math.isclose(std, math.sqrt(1.25))
+    assert validation.mean_std([None, float("nan")]) == (0.0, 0.0)
+    assert validation.mean_std([]) == (0.0, 0.0)
@@ -1,4 +1,5 @@
 import json
+import logging
 
 from src.monitoring.structured_logger import StructuredLogger
 
@@ -16,3 +17,26 @@ def test_structured_logger_emits_json(capsys):
     assert obj["message"] == "hello"
     assert obj["foo"] == "bar"
     assert obj["x"] == 1
+
+
+def test_structured_logger_debug_skipped_when_disabled(capsys):
+    logger = StructuredLogger("test_logger")
+    assert not logger.is_enabled_for(logging.DEBUG)
+
+    # Default level is INFO, so debug records are dropped before encoding
+    logger.debug("noisy", payload=object())
+
+    captured = capsys.readouterr()
+    assert captured.err == "" and captured.out == ""
+
+
+def test_structured_logger_info_skipped_above_level(capsys):
+    logger = StructuredLogger("test_logger_quiet")
+    logger.logger.setLevel(logging.WARNING)
+    try:
+        logger.info("order_executed", payload=object())
+        captured = capsys.readouterr()
+        assert captured.err == "" and captured.out == ""
+        assert logger.is_enabled_for(logging.ERROR)
+    finally:
+        logger.logger.setLevel(logging.INFO)
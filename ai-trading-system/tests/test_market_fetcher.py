@@ -130,3 +130,25 @@ def test_market_fetcher_backward_compatibility():
         base_url="https://example.com"
     )
     assert fetcher.base_url == "Yahoo Finance (free API)"
+
+
+def test_isoformat_index_matches_timestamp_isoformat():
+    """
+    Vectorized index formatting must match Timestamp.isoformat() across DST.
+    """
+    import pandas as pd
+    from src.data_pipeline.market_fetcher import _isoformat_index
+
+    index = pd.date_range("2025-03-09 00:00", periods=4, freq="h", tz="America/New_York")
+    assert list(_isoformat_index(index)) == [ts.isoformat() for ts in index]
+
+
+def test_option_symbols_are_stored_whole(fetcher, mock_yfinance):
+    occ = "SPY240119C00470000"
+    data = fetcher.fetch_intraday(occ, start="2025-01-01", end="2025-01-02", interval="1m", as_array=True)
+    assert data["symbol"].tolist() == [occ]
+
+    too_long = "X" * 30
+    assert fetcher.fetch_intraday(too_long, start="2025-01-01", end="2025-01-02", interval="1m") is None
+    with pytest.raises(ValueError):
+        fetcher._normalize_data(mock_yfinance.history.return_value, too_long)
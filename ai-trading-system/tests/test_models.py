@@ -1,2 +1,182 @@
 def test_models_smoke():
     assert True
+
+
+def test_iter_param_grid_is_cartesian_in_key_order():
+    from src.models.hyperparam_tuner import _iter_param_grid
+
+    grid = {"a": [1, 2], "b": ["x", "y", "z"]}
+    combos = list(_iter_param_grid(grid))
+    assert len(combos) == 6
+    assert combos[0] == {"a": 1, "b": "x"} and combos[-1] == {"a": 2, "b": "z"}
+    assert list(_iter_param_grid({})) == [{}]
+    assert list(_iter_param_grid({"a": []})) == []
+
+
+def test_run_grid_search_parallel_matches_serial(tmp_path, monkeypatch):
+    import random
+
+    from src.models.hyperparam_tuner import run_grid_search
+
+    monkeypatch.chdir(tmp_path)  # the tuner saves an artifact under ./models
+    rng = random.Random(0)
+    X = [[rng.random() for _ in range(3)] for _ in range(40)]
+    y = [sum(row) for row in X]
+    grid = {"n_estimators": [5, 10], "max_depth": [2, None]}
+
+    serial = run_grid_search(X, y, grid, cv=3, n_jobs=1)
+    parallel = run_grid_search(X, y, grid, cv=3, n_jobs=2)
+    assert [r["params"] for r in serial["results"]] == list(
+        {"n_estimators": n, "max_depth": d} for n in (5, 10) for d in (2, None)
+    )
+    assert serial == parallel
+    assert serial["best"] == min(serial["results"], key=lambda r: r["mse"])
+
+
+def test_save_artifact_round_trips(tmp_path):
+    import json
+
+    import numpy as np
+
+    from src.models import artifact_logger
+
+    manifest = artifact_logger.save_artifact(
+        {"scores": [1.5, 2.5], "n": 3}, name="unit", metadata={"cv": 3}, out_dir=str(tmp_path)
+    )
+    payload = json.loads(open(manifest["path"], "rb").read())
+    assert payload["artifact"] == {"scores": [1.5, 2.5], "n": 3}
+    assert payload["manifest"]["metadata"] == {"cv": 3}
+    assert json.loads((tmp_path / "unit_manifest.json").read_bytes())["name"] == "unit"
+
+    manifest = artifact_logger.save_artifact(
+        {"w": np.arange(3.0), "n": np.int64(4)}, name="np", out_dir=str(tmp_path)
+    )
+    assert json.loads(open(manifest["path"], "rb").read())["artifact"] == {"w": [0.0, 1.0, 2.0], "n": 4}
+
+
+def test_save_artifact_streams_indented_json(tmp_path, monkeypatch):
+    import json
+
+    from src.models import artifact_logger
+
+    monkeypatch.setattr(artifact_logger, "_WRITE_BLOCK", 16)  # force several blocks
+    artifact = {"rows": [{"i": i, "x": i / 3} for i in range(50)]}
+    manifest = artifact_logger.save_artifact(artifact, name="big", out_dir=str(tmp_path))
+    text = open(manifest["path"], encoding="utf-8").read()
+    assert json.loads(text)["artifact"] == artifact
+    assert text == json.dumps(json.loads(text), indent=2)
+
+
+def test_save_artifact_compressed(tmp_path):
+    import json
+
+    import pytest
+
+    zstandard = pytest.importorskip("zstandard")
+    from src.models.artifact_logger import save_artifact
+
+    manifest = save_artifact({"a": 1}, name="z", out_dir=str(tmp_path), compress=True)
+    assert manifest["path"].endswith(".json.zst")
+    with open(manifest["path"], "rb") as fh:
+        raw = zstandard.ZstdDecompressor().stream_reader(fh).read()
+    assert json.loads(raw)["artifact"] == {"a": 1}
+
+
+def test_git_info_is_queried_once(tmp_path, monkeypatch):
+    import subprocess
+
+    from src.models import artifact_logger
+
+    calls = []
+    monkeypatch.setattr(
+        subprocess, "check_output", lambda args: calls.append(args) or b"abc123\n"
+    )
+    artifact_logger._git_info.cache_clear()
+    try:
+        for i in range(3):
+            manifest = artifact_logger.save_artifact({}, name=f"g{i}", out_dir=str(tmp_path))
+        assert manifest["git"] == {"sha": "abc123", "branch": "abc123"}
+        assert len(calls) == 2
+    finally:
+        artifact_logger._git_info.cache_clear()
+
+
+def test_compute_feature_importance_accepts_dict_rows():
+    from src.models.model_utils import compute_feature_importance
+
+    X = [{"a": float(i), "b": 1.0} for i in range(20)]
+    y = [2.0 * i for i in range(20)]
+    imps = dict(compute_feature_importance(X, y, ["a", "b"]))
+    assert imps["a"] > 0.9 and imps["b"] == 0.0
+
+
+def _toy_regression(n=120, seed=0):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    X = rng.random((n, 3))
+    return X, 2.0 * X[:, 0] - X[:, 2] + 0.01 * rng.standard_normal(n)
+
+
+def test_train_xgboost_defaults_to_hist(monkeypatch):
+    import json
+
+    import pytest
+
+    pytest.importorskip("xgboost")
+    from src.models.xgboost_model import train_xgboost
+
+    monkeypatch.delenv("XGB_DEVICE", raising=False)
+    X, y = _toy_regression()
+    params = {"n_estimators": 20, "max_depth": 3}
+    model, metrics = train_xgboost(X[:90], y[:90], X[90:], y[90:], params=params)
+    assert params == {"n_estimators": 20, "max_depth": 3}  # not mutated
+    config = json.loads(model.save_config())
+    booster = config["learner"]["gradient_booster"]
+    assert booster["gbtree_train_param"]["tree_method"] == "hist"
+    assert booster["gbtree_model_param"]["num_trees"] == "20"
+    assert config["learner"]["generic_param"]["device"] == "cpu"
+    assert metrics["train_mse"] < metrics["val_mse"] < 0.1
+
+    _, exact = train_xgboost(X[:90], y[:90], params={"n_estimators": 5, "tree_method": "exact"})
+    assert exact["train_mse"] >= 0.0
+
+
+def test_save_model_round_trips_native_booster(tmp_path):
+    import json
+
+    import numpy as np
+    import pytest
+
+    pytest.importorskip("xgboost")
+    from src.models.train_model import load_model, save_model, train_with_walk_forward
+
+    X, y = _toy_regression()
+    result = train_with_walk_forward(X, y, ["a", "b", "c"], n_splits=2, params={"n_estimators": 10})
+    path = save_model(result, model_dir=str(tmp_path), model_name="m")
+    assert path.endswith("m.ubj")
+    meta = json.loads((tmp_path / "m_metadata.json").read_text())
+    assert meta["model_path"] == "m.ubj"
+    np.testing.assert_allclose(load_model(path).inplace_predict(X), result["model"].inplace_predict(X))
+
+    other = save_model(dict(result, model={"stub": 1}), model_dir=str(tmp_path), model_name="p")
+    assert other.endswith("p.pkl") and load_model(other) == {"stub": 1}
+
+
+def test_train_xgboost_mse_matches_predictions():
+    import numpy as np
+    import pytest
+
+    pytest.importorskip("xgboost")
+    import xgboost as xgb
+
+    from src.models.xgboost_model import train_xgboost
+
+    X, y = _toy_regression()
+    model, metrics = train_xgboost(X[:90], y[:90], X[90:], y[90:], params={"n_estimators": 15})
+    for key, Xs, ys in (("train_mse", X[:90], y[:90]), ("val_mse", X[90:], y[90:])):
+        expected = float(np.mean((ys - model.predict(xgb.DMatrix(Xs))) ** 2))
+        assert metrics[key] == pytest.approx(expected, rel=1e-4)
+
+    _, mae = train_xgboost(X[:90], y[:90], params={"n_estimators": 5, "eval_metric": "mae"})
+    assert mae["train_mse"] > 0.0
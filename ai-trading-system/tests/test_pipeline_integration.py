@@ -1,4 +1,5 @@
 import os
+import pytest
 import pandas as pd
 from src.data_pipeline import store_data
 
@@ -139,4 +140,113 @@ def test_validate_and_store_missing_schema(tmp_path):
     ]
     out_path = tmp_path / "out.jsonl"
     ok = store_data.validate_and_store(records, schema_path="invalid_schema.yaml", out_path=str(out_path))
-    assert not ok  # Should return False due to missing schema
\ No newline at end of file
+    assert not ok  # Should return False due to missing schema
+
+def test_fetch_data_from_vendors_falls_back_on_shared_session(mocker):
+    ok = mocker.Mock()
+    ok.json.return_value = [{"symbol": "ABC"}]
+    get = mocker.patch.object(
+        store_data._VENDOR_SESSION,
+        "get",
+        side_effect=[Exception("vendor down"), ok],
+    )
+    data = store_data.fetch_data_from_vendors(["http://a.invalid", "http://b.invalid"])
+    assert data == [{"symbol": "ABC"}]
+    assert [c.args[0] for c in get.call_args_list] == ["http://a.invalid", "http://b.invalid"]
+
+
+def test_validate_and_store_drops_duplicates_during_coercion(tmp_path):
+    row = {"timestamp": "2025-01-01T00:00:00Z", "symbol": "ABC", "open": "10.0",
+           "high": "11.0", "low": "9.5", "close": "10.5", "volume": "100"}
+    records = [dict(row), dict(row, close="10.7"), dict(row, timestamp="2025-01-01T00:01:00Z")]
+    out_path = tmp_path / "out.jsonl"
+    ok = store_data.validate_and_store(records, schema_path=os.path.join("config", "data_schema.yaml"), out_path=str(out_path))
+    assert ok
+    lines = out_path.read_text(encoding="utf-8").strip().splitlines()
+    assert len(lines) == 2
+    assert '"close": 10.5' in lines[0]  # first occurrence wins
+
+
+def test_validate_and_store_accepts_dataframe(tmp_path):
+    df = pd.DataFrame([
+        {"timestamp": "2025-01-01T00:00:00Z", "symbol": "ABC", "open": "10.0",
+         "high": 11.0, "low": 9.5, "close": 10.5, "volume": "100"},
+        {"timestamp": "2025-01-01T00:00:00Z", "symbol": "ABC", "open": "10.0",
+         "high": 11.0, "low": 9.5, "close": 10.5, "volume": "100"},
+        {"timestamp": "2025-01-01T00:01:00Z", "symbol": "ABC", "open": "10.5",
+         "high": 11.2, "low": 10.3, "close": 11.0, "volume": "150"},
+    ])
+    out_path = tmp_path / "out.jsonl"
+    ok = store_data.validate_and_store(df, schema_path=os.path.join("config", "data_schema.yaml"), out_path=str(out_path))
+    assert ok
+    lines = out_path.read_text(encoding="utf-8").strip().splitlines()
+    assert len(lines) == 2
+    assert '"timestamp": "2025-01-01T00:00:00Z"' in lines[0]
+    assert '"open": 10.0' in lines[0] and '"volume": 100' in lines[0]
+    # caller's frame is not coerced in place
+    assert df["open"].iloc[0] == "10.0"
+
+    bad = df.assign(open=["x", "10.0", "10.5"])
+    assert not store_data.validate_and_store(bad, schema_path=os.path.join("config", "data_schema.yaml"), out_path=str(out_path))
+
+
+def test_validate_time_series_mixed_offsets():
+    # A DST change mid-batch yields mixed UTC offsets in the ISO strings
+    data = pd.DataFrame({"timestamp": [
+        "2025-03-09T01:00:00-05:00",
+        "2025-03-09T03:00:00-04:00",
+        "2025-03-09T04:00:00-04:00",
+    ]})
+    assert store_data.validate_time_series(data, timestamp_col="timestamp")
+    assert data["timestamp"].iloc[0] == "2025-03-09T01:00:00-05:00"  # input left unparsed
+
+
+def test_schema_cache_invalidated_by_update(tmp_path):
+    schema_path = tmp_path / "schema.yaml"
+    schema_path.write_text("required_fields: [a]\nfields:\n  a: {type: str}\n", encoding="utf-8")
+
+    first = store_data._load_schema(str(schema_path))
+    assert store_data._load_schema(str(schema_path)) is first  # served from cache
+
+    store_data.update_schema(str(schema_path), {"b": {"type": "float"}})
+    updated = store_data._load_schema(str(schema_path))
+    assert set(updated["fields"]) == {"a", "b"}
+
+
+def test_numba_outlier_kernel_matches_numpy_path(monkeypatch):
+    pytest.importorskip("numba")
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(rng.normal(100, 1, (1000, 3)), columns=["a", "b", "c"])
+    data.loc[5, "b"] = 200.0
+    data.loc[7, "c"] = np.nan
+
+    monkeypatch.setattr(store_data, "_NUMBA_OUTLIER_MIN_ROWS", 10**12)
+    expected = store_data.validate_outliers(data, threshold=1.5)
+    monkeypatch.setattr(store_data, "_NUMBA_OUTLIER_MIN_ROWS", 0)
+    assert store_data.validate_outliers(data, threshold=1.5) == expected
+
+
+def test_fetch_many_from_vendors_isolates_failures(mocker, monkeypatch):
+    from tenacity import RetryError, wait_none
+
+    monkeypatch.setattr(store_data, "_ASYNC_VENDOR_WAIT", wait_none())
+
+    def fake_get(url, timeout):
+        if "down" in url:
+            raise Exception("vendor down")
+        response = mocker.Mock()
+        response.json.return_value = [{"url": url}]
+        return response
+
+    get = mocker.patch.object(store_data._VENDOR_SESSION, "get", side_effect=fake_get)
+    results = store_data.fetch_many_from_vendors(
+        [["http://a.invalid"], ["http://down.invalid"], ["http://down.invalid", "http://c.invalid"]],
+        max_concurrency=2,
+    )
+    assert results[0] == [{"url": "http://a.invalid"}]
+    assert isinstance(results[1], RetryError)
+    assert results[2] == [{"url": "http://c.invalid"}]
+    # the failing group was retried three times
+    assert [c.args[0] for c in get.call_args_list].count("http://down.invalid") == 4
@@ -0,0 +1,233 @@
+import json
+
+from src.execution.profit_optimizer import ProfitOptimizer
+
+
+def test_recent_trades_keep_lookback_window(tmp_path):
+    opt = ProfitOptimizer(lookback_trades=3)
+    for i in range(5):
+        opt.record_trade("AAPL", "BUY", 1, 100.0 + i, pnl=float(i))
+
+    assert [t.pnl for t in opt.recent_trades] == [2.0, 3.0, 4.0]
+    assert opt.get_win_rate() == 1.0
+
+    out = tmp_path / "perf.json"
+    opt.save_performance_log(out)
+    saved = json.loads(out.read_text())
+    assert saved["total_trades"] == 3
+    assert [t["price"] for t in saved["trades"]] == [102.0, 103.0, 104.0]
+    assert "T" in saved["trades"][0]["timestamp"]
+
+
+def test_thresholds_and_summary_cached_until_next_trade():
+    opt = ProfitOptimizer(lookback_trades=10)
+    for _ in range(4):
+        opt.record_trade("AAPL", "BUY", 1, 100.0, pnl=-1.0)
+
+    first = opt.calculate_adaptive_thresholds()
+    first["confidence_threshold"] = 0.0  # callers get a copy
+    assert opt.calculate_adaptive_thresholds()["confidence_threshold"] == 0.75
+    assert opt.should_take_trade("AAPL", 0.70, 10.0)[0] is False
+    assert opt.get_performance_summary()["total_trades"] == 4
+
+    for _ in range(8):
+        opt.record_trade("AAPL", "BUY", 1, 100.0, pnl=2.0)
+    assert opt.calculate_adaptive_thresholds()["confidence_threshold"] == 0.60
+    assert opt.should_take_trade("AAPL", 0.70, 10.0) == (True, None)
+    assert opt.get_performance_summary()["total_trades"] == 10
+
+
+def test_running_aggregates_match_window_recomputation():
+    import random
+    import statistics
+
+    import pytest
+
+    rng = random.Random(7)
+    opt = ProfitOptimizer(lookback_trades=25)
+    for _ in range(200):
+        opt.record_trade("AAPL", "BUY", 1, 100.0, pnl=rng.uniform(-5.0, 5.0))
+        pnls = [t.pnl for t in opt.recent_trades]
+        assert opt.get_win_rate() == sum(p > 0 for p in pnls) / len(pnls)
+        assert opt.get_average_pnl_per_trade() == pytest.approx(statistics.mean(pnls))
+
+    summary = opt.get_performance_summary()
+    assert summary["total_pnl"] == pytest.approx(sum(pnls))
+    assert summary["std_dev_pnl"] == pytest.approx(statistics.stdev(pnls))
+    assert summary["best_trade"] == max(pnls)
+
+
+def _position(symbol, side, entry, sl=None, tp=None, qty=10):
+    from src.execution.profit_optimizer import Position
+
+    return Position(symbol=symbol, side=side, qty=qty, entry_price=entry, entry_time=0.0,
+                    entry_timestamp="", stop_loss_price=sl, take_profit_price=tp)
+
+
+def test_position_book_vectorized_exits_match_should_exit():
+    import numpy as np
+
+    from src.execution.profit_optimizer import PositionBook
+
+    book = PositionBook(capacity=2)
+    positions = [
+        _position("A", "BUY", 100.0, sl=98.0, tp=102.0),
+        _position("B", "SELL", 50.0, sl=51.0, tp=49.0),
+        _position("C", "BUY", 10.0),  # no targets: never exits
+        _position("D", "SELL", 20.0, sl=21.0, tp=19.0),
+    ]
+    for p in positions:
+        book[p.symbol] = p
+    book.remove("B")
+    assert book.keys() == ["A", "D", "C"]
+
+    prices = {"A": 97.5, "C": 1.0, "D": 18.0}
+    mask = book.check_exits(prices)
+    expected = [book[s].should_exit(prices[s])[0] for s in book.symbols]
+    assert mask.tolist() == expected == [True, True, False]
+    assert np.allclose(book.calculate_pnl(prices), [-25.0, 20.0, -90.0])
+
+    book.set_targets("A", stop_loss_price=90.0, take_profit_price=None)
+    assert book.check_exits(np.array([97.5, 20.5, 10.0])).tolist() == [False, False, False]
+    assert "B" not in book and len(book) == 3
+
+
+def test_import_does_not_load_numba():
+    import subprocess
+    import sys
+
+    code = "import sys, src.execution.profit_optimizer; print('numba' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_compiled_exit_code_matches_python():
+    import random
+
+    import pytest
+
+    pytest.importorskip("numba")
+    from src.execution import profit_optimizer as po
+
+    nan = float("nan")
+    rng = random.Random(3)
+    for _ in range(500):
+        args = (
+            rng.choice((1, -1)),
+            100.0,
+            rng.uniform(95.0, 105.0),
+            rng.choice((nan, rng.uniform(96.0, 104.0))),
+            rng.choice((nan, rng.uniform(96.0, 104.0))),
+            rng.choice((nan, 0.25)),
+            rng.choice((0.0, rng.uniform(0.0, 100.0))),
+            float(rng.randint(1, 50)),
+        )
+        assert po._exit_kernel()(*args) == po._exit_code_py(*args)
+
+    pos = _position("A", "SELL", 100.0, sl=101.0, tp=99.0)
+    assert pos.should_exit(101.5) == (True, "stop_loss")
+    assert pos.should_exit(98.0) == (True, "take_profit")
+    assert pos.should_exit(100.0) == (False, None)
+
+
+def test_position_side_sign_drives_pnl():
+    long = _position("A", "BUY", 100.0, qty=3)
+    short = _position("B", "SELL", 100.0, qty=3)
+    assert (long.side_sign, short.side_sign) == (1, -1)
+    assert long.calculate_pnl(102.0) == 6.0
+    assert short.calculate_pnl(102.0) == -6.0
+
+
+def test_trailing_stop_gives_back_fraction_of_peak_profit():
+    pos = _position("A", "BUY", 100.0, qty=10)
+    pos.set_trailing_stop(50.0)
+
+    assert pos.should_exit(99.0) == (False, None)  # never in profit: not armed
+    assert pos.should_exit(104.0) == (False, None)  # new peak: +40
+    assert pos.max_profit == 40.0 and pos.max_loss == -10.0
+    assert pos.should_exit(102.5) == (False, None)  # +25 > 20
+    assert pos.should_exit(102.0) == (True, "trailing_stop")  # gave back half
+
+
+def test_position_is_slotted_and_serializable():
+    from dataclasses import asdict
+
+    pos = _position("A", "BUY", 100.0, sl=98.0)
+    assert not hasattr(pos, "__dict__")
+    data = asdict(pos)
+    assert data["stop_loss_price"] == 98.0 and data["side_sign"] == 1
+
+
+def test_trade_window_ring_buffer_order_and_columns():
+    opt = ProfitOptimizer(lookback_trades=4)
+    for i in range(10):
+        opt.record_trade(f"S{i}", "BUY" if i % 2 else "SELL", i, 10.0 + i, pnl=float(i - 5))
+
+    trades = opt.recent_trades
+    assert [t.symbol for t in trades] == ["S6", "S7", "S8", "S9"]
+    assert [t.side for t in trades] == ["SELL", "BUY", "SELL", "BUY"]
+    assert [t.qty for t in trades] == [6, 7, 8, 9]
+    summary = opt.get_performance_summary()
+    assert (summary["best_trade"], summary["worst_trade"]) == (4.0, 1.0)
+    assert opt.get_win_rate() == 1.0
+
+    empty = ProfitOptimizer(lookback_trades=0)
+    empty.record_trade("A", "BUY", 1, 1.0, pnl=1.0)
+    assert empty.recent_trades == [] and empty.get_win_rate() == 0.5
+
+
+def test_should_take_trade_prefilters_before_thresholds(monkeypatch):
+    opt = ProfitOptimizer()
+
+    def fail():
+        raise AssertionError("thresholds should not be computed")
+
+    monkeypatch.setattr(opt, "_thresholds", fail)
+    assert opt.should_take_trade("AAPL", 0.9, 0.0) == (False, "non_positive_profit")
+    assert opt.should_take_trade("AAPL", 0.4, 10.0) == (False, "below_floor_confidence")
+
+
+def test_adaptive_threshold_bands():
+    import pytest
+
+    def thresholds(wins, losses):
+        opt = ProfitOptimizer(lookback_trades=100)
+        for i in range(wins + losses):
+            opt.record_trade("A", "BUY", 1, 1.0, pnl=1.0 if i < wins else -1.0)
+        t = opt.calculate_adaptive_thresholds()
+        return t["confidence_threshold"], t["profit_bp_threshold"]
+
+    assert thresholds(44, 56) == (pytest.approx(0.75), 6.0)
+    assert thresholds(45, 55) == (pytest.approx(0.70), 5.0)  # edge goes up a band
+    assert thresholds(50, 50) == (pytest.approx(0.65), 4.0)
+    assert thresholds(55, 45) == (pytest.approx(0.60), 3.0)
+
+
+def test_trade_records_match_trade_views():
+    opt = ProfitOptimizer(lookback_trades=3)
+    for i in range(5):
+        opt.record_trade("AAPL", "BUY", i, 10.0 + i, confidence=0.7, pnl=float(i))
+
+    records = opt._trade_records()
+    assert records == [t.to_dict() for t in opt.recent_trades]
+    assert records[0]["timestamp"].endswith("+00:00")
+    assert type(records[0]["qty"]) is int
+
+
+def test_position_stops_accept_prenormalized_fractions():
+    opt = ProfitOptimizer()
+    expected = opt.calculate_position_stops("A", "SELL", 200.0, 1, risk_percent=1.0, profit_target_bp=4.0)
+    assert opt.calculate_position_stops("A", "SELL", 200.0, 1, risk_frac=0.01, profit_frac=0.0004) == expected
+    assert expected == (202.0, 199.92)
+
+
+def test_position_stops_batch_matches_scalar():
+    import numpy as np
+
+    opt = ProfitOptimizer()
+    entries = np.array([100.0, 55.5, 12.25])
+    sides = ["BUY", "SELL", "BUY"]
+    sl, tp = opt.calculate_position_stops_batch(entries, np.array([1, -1, 1]), 1.5, 7.0)
+    for i, side in enumerate(sides):
+        exp_sl, exp_tp = opt.calculate_position_stops("X", side, entries[i], 1, 1.5, 7.0)
+        assert np.isclose(sl[i], exp_sl) and np.isclose(tp[i], exp_tp)
@@ -10,3 +10,37 @@ def test_volatility_regime():
     ]
     out = regime_features.volatility_regime(records, window=2)
     assert all("vol_regime" in r for r in out)
+
+
+def test_rolling_std_matches_window_definition():
+    import math
+
+    vals = [1.0, None, 4.0, 2.0, None, None, 7.5]
+    out = regime_features.rolling_std(vals, 3)
+    for i, got in enumerate(out):
+        window = [v for v in vals[max(0, i - 2) : i + 1] if v is not None]
+        if not window:
+            assert got is None
+            continue
+        mean = sum(window) / len(window)
+        expected = math.sqrt(sum((x - mean) ** 2 for x in window) / len(window))
+        assert math.isclose(got, expected, abs_tol=1e-12)
+    assert out[5] == 0.0  # single value in the window
+    assert regime_features.rolling_std([], 3) == []
+
+
+def test_volatility_regime_uses_upper_median_threshold():
+    closes = [1.0, 3.0, None, None, 2.0, 8.0, 8.5, 1.0, "4"]
+    records = [{"close": c} for c in closes]
+    out = regime_features.volatility_regime(records, window=2)
+    stds = regime_features.rolling_std([None if c is None else float(c) for c in closes], 2)
+    vals = sorted(s for s in stds if s is not None)
+    thr = vals[len(vals) // 2]
+    assert [r["volatility"] for r in out] == stds
+    assert [r["vol_regime"] for r in out] == [
+        "high" if s is not None and s >= thr else "low" for s in stds
+    ]
+    assert out[3]["volatility"] is None and out[3]["vol_regime"] == "low"
+    fixed = regime_features.volatility_regime(records, window=2, threshold=100.0)
+    assert {r["vol_regime"] for r in fixed} == {"low"}
+    assert regime_features.volatility_regime([], window=2) == []
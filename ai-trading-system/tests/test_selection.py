@@ -11,3 +11,76 @@ def test_feature_importance_and_selection():
     assert len(imps) == 2
     top = selection.select_top_features(imps, 1)
     assert isinstance(top, list) and len(top) == 1
+
+
+def test_corr_importance_ranks_by_abs_correlation():
+    X = [
+        {"up": 1.0, "down": 3.0, "flat": 5.0, "target": 1.0},
+        {"up": 2.0, "down": 2.0, "flat": 5.0, "target": 2.0},
+        {"up": 3.5, "down": 1.0, "flat": 5.0, "target": 3.0},
+        {"up": 4.0, "down": 0.5, "flat": 5.0, "target": 4.0},
+    ]
+    res = selection._corr_importance(X, ["flat", "up", "down"], "target")
+    assert [f for f, _ in res] == ["down", "up", "flat"]
+    scores = dict(res)
+    assert scores["flat"] == 0.0
+    assert 0.9 < scores["up"] < scores["down"] <= 1.0
+    assert selection._corr_importance([], ["a"], "target") == [("a", 0.0)]
+    assert selection._corr_importance([{"a": "x", "target": 1.0}], ["a"], "target") == [("a", 0.0)]
+
+
+def test_corr_importance_scores_columns_with_missing_values_as_zero():
+    X = [
+        {"gap": 1.0, "full": 1.0, "target": 1.0},
+        {"gap": None, "full": 2.0, "target": 2.0},
+        {"gap": 3.0, "full": 3.0, "target": 3.0},
+    ]
+    assert selection._corr_importance(X, ["gap", "full"], "target") == [
+        ("full", 1.0),
+        ("gap", 0.0),
+    ]
+    X[0]["target"] = None  # a gap in the target zeroes every feature
+    assert dict(selection._corr_importance(X, ["gap", "full"], "target")) == {
+        "gap": 0.0,
+        "full": 0.0,
+    }
+
+
+def test_feature_importance_builds_float_matrix(monkeypatch):
+    seen = {}
+
+    def fake_mi(arrX, arrY, **kwargs):
+        seen.update(X=arrX, y=arrY, kwargs=kwargs)
+        return [0.1, 0.9]
+
+    monkeypatch.setattr(selection, "mutual_info_regression", fake_mi)
+    monkeypatch.setattr(selection, "_mi_cache", selection.OrderedDict())
+    X = [{"a": 1, "b": None, "t": 2.0}, {"a": None, "b": 4, "t": None}]
+    assert selection.feature_importance(X, ["a", "b"], "t") == [("b", 0.9), ("a", 0.1)]
+    assert seen["X"].dtype == float and seen["X"].tolist() == [[1.0, 0.0], [0.0, 4.0]]
+    assert seen["y"].tolist() == [2.0, 0.0]
+    assert "n_jobs" not in seen["kwargs"]  # too small to parallelize
+
+
+def test_feature_importance_subsamples_and_memoizes(monkeypatch):
+    calls = []
+
+    def fake_mi(arrX, arrY, **kwargs):
+        calls.append((arrX.shape, kwargs["random_state"]))
+        return [float(arrX[:, 0].sum())]
+
+    monkeypatch.setattr(selection, "mutual_info_regression", fake_mi)
+    monkeypatch.setattr(selection, "_mi_cache", selection.OrderedDict())
+    X = [{"a": float(i), "t": float(i % 7)} for i in range(50)]
+
+    first = selection.feature_importance(X, ["a"], "t", max_rows=10)
+    assert selection.feature_importance(X, ["a"], "t", max_rows=10) == first
+    assert calls == [((10, 1), 0)]
+
+    selection.feature_importance(X, ["a"], "t", max_rows=10, random_state=1)
+    selection.feature_importance(X, ["a"], "t", max_rows=None)
+    assert calls[1:] == [((10, 1), 1), ((50, 1), 0)]
+
+    X[0]["a"] = 99.0  # new feature values are not served from the memo
+    selection.feature_importance(X, ["a"], "t", max_rows=None)
+    assert len(calls) == 4
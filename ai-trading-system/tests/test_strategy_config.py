@@ -0,0 +1,54 @@
+from src.execution import strategy_config
+
+
+def _write_config(path, interval):
+    path.write_text(
+        "default_strategy: intraday\n"
+        "strategies:\n"
+        "  intraday:\n"
+        "    name: Intraday\n"
+        "    timeframe:\n"
+        f"      data_interval: {interval}\n"
+    )
+
+
+def test_load_strategy_reuses_parsed_config(tmp_path):
+    config = tmp_path / "strategies.yaml"
+    _write_config(config, "5m")
+
+    first = strategy_config.load_strategy(config_path=str(config))
+    _write_config(config, "15m")
+    assert strategy_config.get_intraday_strategy(str(config)) is first
+
+    strategy_config._get_manager(str(config.resolve())).reload()
+    assert strategy_config.load_strategy(config_path=str(config)).data_interval == "15m"
+
+
+def test_strategy_config_is_shared_and_read_only(tmp_path):
+    import pytest
+
+    config = tmp_path / "strategies.yaml"
+    _write_config(config, "5m")
+    manager = strategy_config.StrategyManager(str(config))
+    strategy = manager.get_strategy()
+
+    assert manager.get_strategy("intraday") is strategy
+    assert strategy.min_cooldown_seconds == 300.0
+    assert strategy.max_holding_seconds == 6 * 3600.0
+    with pytest.raises(AttributeError):
+        strategy.min_confidence = 0.1
+    assert strategy.min_confidence == 0.60
+
+
+def test_strategy_to_dict_returns_independent_copies(tmp_path):
+    config = tmp_path / "strategies.yaml"
+    _write_config(config, "1h")
+    strategy = strategy_config.StrategyManager(str(config)).get_strategy()
+
+    first = strategy.to_dict()
+    assert first["timeframe"]["data_interval"] == "1h"
+    first["timeframe"]["data_interval"] = "changed"
+    first["risk"].clear()
+    second = strategy.to_dict()
+    assert second["timeframe"]["data_interval"] == "1h"
+    assert second["risk"]["min_confidence"] == 0.60
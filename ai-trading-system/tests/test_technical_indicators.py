@@ -9,3 +9,46 @@ def test_sma_ema_rsi():
     assert e[-1] is not None
     r = technical_indicators.rsi(vals, window=3)
     assert isinstance(r, list)
+
+
+def _reference_rsi(values, window):
+    gains, losses = [0], [0]
+    for i in range(1, len(values)):
+        if values[i] is None or values[i - 1] is None:
+            gains.append(0)
+            losses.append(0)
+            continue
+        diff = values[i] - values[i - 1]
+        gains.append(max(0, diff))
+        losses.append(max(0, -diff))
+    out = [None] * len(values)
+    for i in range(window, len(values)):
+        if i == window:
+            avg_gain = sum(gains[1 : window + 1]) / window
+            avg_loss = sum(losses[1 : window + 1]) / window
+        else:
+            avg_gain = (avg_gain * (window - 1) + gains[i]) / window
+            avg_loss = (avg_loss * (window - 1) + losses[i]) / window
+        out[i] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+    return out
+
+
+def test_ema_and_rsi_match_reference_loops():
+    import pytest
+
+    vals = [10.0, 11.0, None, 10.5, 12.0, 11.0, 11.5, 13.0, 12.0, 12.5, 14.0]
+    assert technical_indicators.ema(vals, 3) == pytest.approx(
+        [10.0, 10.5, None, 10.5, 11.25, 11.125, 11.3125, 12.15625, 12.078125, 12.2890625, 13.14453125]
+    )
+    assert technical_indicators.ema([None, 2.0], 3) == [None, 2.0]
+    got = technical_indicators.rsi(vals, window=3)
+    assert got == pytest.approx(_reference_rsi(vals, 3))
+    assert technical_indicators.rsi([1.0, 2.0, 3.0, 4.0], window=3)[-1] == 100.0
+    assert technical_indicators.rsi([1.0, 2.0], window=3) == [None, None]
+
+
+def test_sma_is_aligned_with_input():
+    vals = [1.0, 2.0, None, 4.0, None, None, 6.0]
+    assert technical_indicators.sma(vals, 3) == [None, None, 1.5, 3.0, 4.0, 4.0, 6.0]
+    assert technical_indicators.sma(vals, 2) == [None, 1.5, 2.0, 4.0, 4.0, None, 6.0]
+    assert technical_indicators.sma([1, 2, 3, 4, 5, 6], 3) == [None, None, 2.0, 3.0, 4.0, 5.0]
@@ -10,3 +10,12 @@ def test_log_and_read_trade(tmp_path):
     assert os.path.exists(written)
     trades = list(trade_log.read_trades(str(path)))
     assert trades[0]["symbol"] == "ABC"
+
+
+def test_log_trade_formats_timestamp_ns(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    trade = {"timestamp_ns": 1_700_000_000_123_456_789, "symbol": "ABC"}
+    trade_log.log_trade(trade, run_id="ns", path=str(path))
+    (record,) = trade_log.read_trades(str(path))
+    assert record == {"timestamp": "2023-11-14T22:13:20.123456+00:00", "symbol": "ABC"}
+    assert "timestamp_ns" in trade  # caller's record is untouched
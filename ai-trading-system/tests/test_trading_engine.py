@@ -0,0 +1,306 @@
+import json
+
+from src.execution.trading_engine import LiveTradingEngine
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_engine_buffers_jsonl_until_flush(tmp_path):
+    engine = LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path)
+    engine._record_equity_update("TICK")
+    assert engine.equity_log.read_text() == ""  # still buffered
+
+    engine.flush_logs()
+    records = _read_jsonl(engine.equity_log)
+    assert [r["update_type"] for r in records] == ["INIT", "TICK"]
+    assert _read_jsonl(engine.updates_log) == records
+
+    engine._record_equity_update("TRADE")
+    engine.close_logs()
+    engine.close_logs()
+    assert len(_read_jsonl(engine.equity_log)) == 3
+
+    engine._record_equity_update("TRADE")  # late write after close
+    engine.close_logs()
+    assert len(_read_jsonl(engine.equity_log)) == 4
+    assert engine.equity_bin.stat().st_size == 4 * 17  # packed <qdB records
+
+
+def test_engine_skips_mtm_for_unchanged_and_small_moves(tmp_path, monkeypatch):
+    from src.execution.trading_engine import MarketTick
+
+    engine = LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path)
+    calls = []
+    monkeypatch.setattr(engine.client, "_update_portfolio_value", lambda: calls.append(1))
+
+    def tick(close):
+        engine.update_market_prices(MarketTick("t", "SPY", close, close, close, close, 0))
+
+    tick(100.0)
+    tick(100.0)  # identical print
+    tick(100.01)  # 1bp move within the interval
+    assert len(calls) == 1
+    tick(100.2)  # 20bp move
+    assert len(calls) == 2
+    assert engine.current_prices["SPY"] == 100.2
+
+
+def test_engine_reuses_position_snapshot_until_fill(tmp_path, monkeypatch):
+    engine = LiveTradingEngine(initial_cash=100000.0, output_dir=tmp_path)
+    engine.client._next_rand = lambda: 0.0  # never reject
+    calls = []
+    real = engine.client.get_positions
+    monkeypatch.setattr(engine.client, "get_positions", lambda: (calls.append(1), real())[1])
+
+    signal = {"symbol": "SPY", "action": "BUY", "qty": 5}
+    assert engine.process_signal(signal, 100.0) is True
+    assert engine.account.cash < 100000.0  # refreshed after the fill
+    fetched = len(calls)
+
+    engine.min_cooldown_seconds = 0.0
+    for _ in range(3):
+        assert engine.process_signal(signal, 100.0) is False  # already LONG
+    assert len(calls) == fetched
+
+
+def test_engine_sync_fills_do_not_poll(tmp_path, monkeypatch):
+    import time
+
+    engine = LiveTradingEngine(initial_cash=100000.0, output_dir=tmp_path)
+    engine.client._next_rand = lambda: 0.0  # never reject
+    monkeypatch.setattr(time, "sleep", lambda _: (_ for _ in ()).throw(AssertionError("polled")))
+    assert engine.process_signal({"symbol": "SPY", "action": "BUY", "qty": 5}, 100.0) is True
+
+    engine.client._next_rand = lambda: 0.99  # always reject
+    engine.min_cooldown_seconds = 0.0
+    assert engine.process_signal({"symbol": "QQQ", "action": "BUY", "qty": 5}, 100.0) is False
+    assert engine.trades_count == 1
+
+
+def test_run_live_trading_streams_ordered_inputs(tmp_path):
+    from src.execution.trading_engine import iter_signals, run_live_trading
+
+    market = tmp_path / "market.jsonl"
+    signals = tmp_path / "signals.jsonl"
+    market.write_text("\n".join(
+        json.dumps({"timestamp": f"2025-01-01T00:0{i}:00Z", "symbol": "SPY", "close": 100.0 + i})
+        for i in range(5)
+    ) + "\n")
+    signals.write_text(
+        json.dumps({"timestamp": "2025-01-01T00:00:30Z", "symbol": "QQQ", "action": "BUY"}) + "\n"
+        + "not json\n"
+        + json.dumps({"timestamp": "2025-01-01T00:01:00Z", "symbol": "SPY", "action": "BUY", "qty": 5}) + "\n"
+    )
+    assert [s["symbol"] for s in iter_signals(signals)] == ["QQQ", "SPY"]
+
+    engine = run_live_trading(market, signals, output_dir=tmp_path, use_persistence=False)
+    assert [o.symbol for o in engine.client.orders.values()] == ["SPY"]
+    assert engine.current_prices["SPY"] == 104.0
+    assert engine._log_fds == []  # closed when the session ends
+    assert run_live_trading(tmp_path / "missing.jsonl", signals, output_dir=tmp_path) is None
+
+
+def test_engine_position_state_follows_fills_and_reconciles(tmp_path):
+    from src.execution import trading_engine
+
+    engine = LiveTradingEngine(initial_cash=100000.0, output_dir=tmp_path)
+    engine.client._next_rand = lambda: 0.0  # never reject
+    engine.min_cooldown_seconds = 0.0
+    buy = {"symbol": "SPY", "action": "BUY", "qty": 5}
+    sell = {"symbol": "SPY", "action": "SELL", "qty": 5}
+
+    assert engine.process_signal(buy, 100.0) is True
+    assert engine.position_state["SPY"] == "LONG"
+    assert engine.process_signal(sell, 100.0) is True
+    assert engine.position_state["SPY"] == "FLAT"
+
+    # A position opened outside the engine is picked up on reconcile
+    engine.client.get_order(engine.client.submit_order(symbol="QQQ", qty=1, side="buy").id)
+    assert "QQQ" not in engine.position_state
+    for _ in range(trading_engine._RECONCILE_EVERY - 3):
+        assert engine.process_signal(sell, 100.0) is False  # nothing to sell
+    assert "QQQ" not in engine.position_state
+    assert engine.process_signal(sell, 100.0) is False
+    assert engine.position_state == {"SPY": "FLAT", "QQQ": "LONG"}
+
+
+def test_market_tick_is_slotted_and_frozen():
+    import dataclasses
+
+    import pytest
+    from src.execution.trading_engine import MarketTick
+
+    tick = MarketTick("t", "SPY", 1.0, 1.0, 1.0, 1.0, 0)
+    assert not hasattr(tick, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        tick.close = 2.0
+
+
+def test_engine_timestamps_reuse_second_prefix(tmp_path, monkeypatch):
+    import time
+    from datetime import datetime, timezone
+
+    engine = LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path)
+    stamps = iter([1_700_000_000_123_456_789, 1_700_000_000_900_000_000, 1_700_000_001_000_001_000, 1_700_000_002_000_000_000])
+    monkeypatch.setattr(time, "time_ns", lambda: next(stamps))
+
+    assert engine._iso_now() == "2023-11-14T22:13:20.123456Z"
+    prefix = engine._iso_prefix
+    assert engine._iso_now() == "2023-11-14T22:13:20.900000Z"
+    assert engine._iso_prefix is prefix
+    assert engine._iso_now() == "2023-11-14T22:13:21.000001Z"
+    parsed = datetime.fromisoformat(engine.get_status()["timestamp"].replace("Z", "+00:00"))
+    assert parsed.tzinfo == timezone.utc
+
+
+def test_engine_takes_parameters_from_partial_strategy(tmp_path):
+    from types import SimpleNamespace
+
+    strategy = SimpleNamespace(min_confidence=0.8, risk_percent=0.5)  # older config shape
+    engine = LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path, min_profit_bp=7.0, strategy=strategy)
+    assert (engine.min_confidence, engine.min_profit_bp, engine.risk_percent) == (0.8, 7.0, 0.5)
+    assert engine.min_cooldown_seconds == 300.0
+
+
+def test_load_signals_reads_whole_file(tmp_path):
+    from src.execution.trading_engine import iter_signals, load_signals
+
+    path = tmp_path / "signals.jsonl"
+    path.write_bytes(b'{"symbol": "SPY"}\r\n\n{broken\n{"symbol": "QQQ"}')
+    assert load_signals(path) == [{"symbol": "SPY"}, {"symbol": "QQQ"}]
+    assert list(iter_signals(path)) == load_signals(path)
+    assert load_signals(tmp_path / "missing.jsonl") == []
+
+
+def test_signals_filtered_by_symbol_while_parsing(tmp_path):
+    from src.execution.trading_engine import iter_signals, load_signals
+
+    path = tmp_path / "signals.jsonl"
+    path.write_text(
+        '{"symbol": "SPY", "i": 0}\n{"symbol":"QQQ","note":"SPY"}\n{"symbol": "SPYX"}\n{"symbol":"SPY","i":1}\n'
+    )
+    assert [s["i"] for s in load_signals(path, symbol="SPY")] == [0, 1]
+    assert [s["i"] for s in iter_signals(path, symbol="SPY")] == [0, 1]
+    assert len(load_signals(path)) == 4
+
+
+def test_filtered_signals_skip_debug_logging_when_disabled(tmp_path, monkeypatch):
+    from src.execution import trading_engine
+
+    engine = LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path)
+    monkeypatch.setattr(trading_engine.logger, "is_enabled_for", lambda level: False)
+    calls = []
+    monkeypatch.setattr(trading_engine.logger, "debug", lambda *a, **k: calls.append(a))
+    signal = {"symbol": "SPY", "action": "BUY", "confidence": 0.1}
+    assert engine.process_signal(signal, 100.0) is False
+    assert calls == []
+
+
+def test_engine_thins_tick_snapshots_and_keeps_binary_sidecar(tmp_path):
+    from src.execution import trading_engine
+
+    engine = LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path)
+    for _ in range(2 * trading_engine._FULL_SNAPSHOT_INTERVAL):
+        engine._record_equity_update("TICK")
+    engine._record_equity_update("TRADE")
+    engine.close_logs()
+
+    types = [r["update_type"] for r in _read_jsonl(engine.equity_log)]
+    assert types == ["INIT", "TICK", "TICK", "TRADE"]
+    records = trading_engine.load_equity_records(engine.equity_bin)
+    assert len(records) == 2 * trading_engine._FULL_SNAPSHOT_INTERVAL + 2
+    assert records["code"][[0, 1, -1]].tolist() == [0, 1, 2]
+    assert (records["pv"] == 1000.0).all()
+    assert (records["ts_ns"][1:] >= records["ts_ns"][:-1]).all()
+
+    with open(engine.equity_bin, "ab") as f:
+        f.write(b"\x00" * 5)  # a record still being written
+    assert len(trading_engine.load_equity_records(engine.equity_bin)) == len(records)
+
+
+def test_replay_marks_collapsed_bar_runs(tmp_path, monkeypatch):
+    from src.execution import trading_engine
+
+    market = tmp_path / "market.jsonl"
+    signals = tmp_path / "signals.jsonl"
+    market.write_text("".join(
+        json.dumps({"timestamp": f"2025-01-01T00:{i:02d}:00Z", "symbol": "SPY", "close": 100.0 + i}) + "\n"
+        for i in range(10)
+    ))
+    signals.write_text(json.dumps({"timestamp": "2025-01-01T00:05:00Z", "symbol": "SPY", "action": "BUY"}) + "\n")
+
+    marks, seen = [], []
+    monkeypatch.setattr(trading_engine.LiveTradingEngine, "update_price",
+                        lambda self, symbol, price: marks.append(price))
+    monkeypatch.setattr(trading_engine.LiveTradingEngine, "process_signal",
+                        lambda self, signal, price: seen.append((list(marks), price)))
+    trading_engine.run_live_trading(market, signals, output_dir=tmp_path, use_persistence=False)
+
+    assert seen == [([104.0], 105.0)]  # bars 0-4 collapsed to the last close
+    assert marks == [104.0, 109.0]
+
+
+def test_run_live_trading_replays_without_matching_signals(tmp_path):
+    from src.execution.trading_engine import run_live_trading
+
+    market = tmp_path / "market.jsonl"
+    signals = tmp_path / "signals.jsonl"
+    market.write_text("".join(
+        json.dumps({"timestamp": f"2025-01-01T00:0{i}:00Z", "symbol": "SPY", "close": 100.0 + i}) + "\n"
+        for i in range(3)
+    ))
+    signals.write_text(json.dumps({"timestamp": "2025-01-01T00:01:00Z", "symbol": "QQQ", "action": "BUY"}) + "\n")
+
+    engine = run_live_trading(market, signals, output_dir=tmp_path)
+    assert engine is not None and not engine.client.orders
+    assert engine.current_prices["SPY"] == 102.0
+    assert (tmp_path / "account_state.json").exists()
+
+    signals.write_text("")
+    assert run_live_trading(market, signals, output_dir=tmp_path, use_persistence=False) is None
+
+
+def test_engine_records_ticks_for_flat_prices(tmp_path, monkeypatch):
+    from src.execution import trading_engine
+
+    engine = LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path)
+    clock = iter([10.0, 12.0, 14.0])
+    monkeypatch.setattr(trading_engine.time, "time", lambda: next(clock))
+    revalues = []
+    monkeypatch.setattr(engine.client, "get_account", lambda: revalues.append(1) or engine.account)
+    recorded = []
+    monkeypatch.setattr(engine, "_record_equity_update", lambda kind: recorded.append(kind))
+
+    for _ in range(3):
+        engine.update_price("SPY", 100.0)  # flat after the first print
+    assert len(revalues) == 1
+    assert recorded == ["TICK", "TICK", "TICK"]
+
+
+def test_engines_release_log_fds_when_collected(tmp_path):
+    import gc
+    import os
+
+    from src.execution import trading_engine
+
+    def open_fds():
+        return len(os.listdir("/proc/self/fd"))
+
+    gc.collect()
+    before = open_fds()
+    engines = [LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path) for _ in range(5)]
+    assert open_fds() == before + 4 * len(engines)
+    assert set(engines) <= set(trading_engine._open_engines)
+
+    engines[0].close_logs()
+    engines[0]._record_equity_update("TRADE")  # reopens on the next flush
+    trading_engine._close_engine_logs()  # the registered exit hook
+    assert open_fds() == before
+    assert len(_read_jsonl(engines[0].equity_log)) == 5 + 1  # 5 INITs + late TRADE
+
+    more = [LiveTradingEngine(initial_cash=1000.0, output_dir=tmp_path) for _ in range(5)]
+    del engines, more
+    gc.collect()
+    assert open_fds() == before
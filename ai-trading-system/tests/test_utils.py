@@ -1,2 +1,42 @@
 def test_utils_smoke():
     assert True
+
+
+def test_rolling_mean_std_paths_agree():
+    import numpy as np
+    import pytest
+
+    from src.utils import math_utils
+
+    arr = np.array([1.0, np.nan, 4.0, 2.0, np.nan, np.nan, np.nan, 7.5, 3.0])
+    mean, std, n = math_utils._rolling_mean_std_np(arr, 3)
+    assert n.tolist() == [1, 1, 2, 2, 2, 1, 0, 1, 2]
+    np.testing.assert_allclose(mean[:3], [1.0, 1.0, 2.5])
+    assert np.isnan(std[6])
+
+    pytest.importorskip("numba")
+    mean_k, std_k, n_k = math_utils.rolling_mean_std(arr, 3)
+    np.testing.assert_allclose(mean_k, mean)
+    np.testing.assert_allclose(std_k, std, atol=1e-12)
+    assert n_k.tolist() == n.tolist()
+
+    # Large offset: the Welford path keeps the small spread
+    big = 1e9 + np.array([0.0, 1.0, 2.0, 1.0, 0.0])
+    expected = [np.std([0.0, 1.0, 2.0]), np.std([1.0, 2.0, 1.0]), np.std([2.0, 1.0, 0.0])]
+    np.testing.assert_allclose(math_utils.rolling_mean_std(big, 3)[1][2:], expected, rtol=1e-6)
+
+
+def test_to_matrix_accepts_dicts_rows_and_arrays():
+    import numpy as np
+
+    from src.utils.math_utils import to_matrix
+
+    rows = [{"a": 1, "b": None}, {"b": 2.5}]
+    got = to_matrix(rows, ["b", "a"])
+    assert got.dtype == np.float64 and got.flags.c_contiguous
+    assert np.array_equal(got, [[np.nan, 1.0], [2.5, np.nan]], equal_nan=True)
+    assert to_matrix(rows, ["a"], missing=0.0).tolist() == [[1.0], [0.0]]
+    assert to_matrix([[1, 2], [3, 4]]).tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    arr = np.arange(6.0).reshape(2, 3)
+    assert to_matrix(arr) is arr
+    assert to_matrix(arr.T).flags.c_contiguous
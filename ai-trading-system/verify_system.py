@@ -46,7 +46,7 @@ def main():
     
     # Models
     print("MODEL CHECKPOINTS:")
-    model_files = list(Path("models").glob("model_*.pkl"))
+    model_files = [*Path("models").glob("model_*.pkl"), *Path("models").glob("model_*.ubj")]
     if model_files:
         for model_file in sorted(model_files)[-3:]:
             meta_file = model_file.with_suffix(".pkl_metadata.json")